@@ -0,0 +1,61 @@
+"""信封扫描与完整解析的 CPU 耗时对比
+
+构造不同大小的工具调用结果，分别用 scan_envelope 扫描首尾和 json.loads 解析整条消息，
+统计单条消息的 CPU 耗时：
+    python benchmarks/envelope.py
+    python benchmarks/envelope.py --sizes 100 300 800 --repeat 50
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handle.envelope import scan_envelope
+
+def make_response(size_kb: int, seed: int = 1) -> bytes:
+    """生成约 size_kb KB 的工具调用结果，内容为中英文混合的条目列表，与网页、RSS 类工具的输出接近"""
+    rng = random.Random(seed)
+    items = []
+    length = 0
+    while length < size_kb * 1024:
+        title = ''.join(chr(0x4e00 + rng.randrange(3000)) for _ in range(rng.randint(10, 30)))
+        item = {'id': len(items), 'title': title, 'link': f'https://example.com/{rng.getrandbits(32):x}', 'summary': title * 5}
+        items.append(item)
+        length += len(json.dumps(item, ensure_ascii=False).encode('utf-8'))
+    text = json.dumps({'success': True, 'result': items}, ensure_ascii=False)
+    message = {'jsonrpc': '2.0', 'id': 42, 'result': {'content': [{'type': 'text', 'text': text}], 'isError': False}}
+    return (json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8')
+
+def measure(function, data: bytes, repeat: int) -> list:
+    """重复调用 repeat 次，返回每次的 CPU 耗时（微秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.process_time_ns()
+        function(data)
+        times.append((time.process_time_ns() - start) / 1000)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description='信封扫描与完整解析的 CPU 耗时对比')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 300, 800], help='消息大小（KB）')
+    parser.add_argument('--repeat', type=int, default=200, help='每种大小重复的次数')
+    args = parser.parse_args()
+
+    for size_kb in args.sizes:
+        data = make_response(size_kb)
+        # 两种方式取到的 id 应当一致
+        assert scan_envelope(data)['id'] == json.loads(data)['id']
+        scan = statistics.median(measure(scan_envelope, data, max(args.repeat, 1)))
+        parse = statistics.median(measure(json.loads, data, max(args.repeat, 1)))
+        print(
+            f"{len(data) / 1024:8.0f}KB  scan_envelope 中位数 {scan:9.1f}µs  "
+            f"json.loads 中位数 {parse:9.1f}µs  相差 {parse / scan:7.1f} 倍"
+        )
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""共用 HTTP 会话的长连接基准测试
+
+在本地启动一个支持长连接的 HTTP 服务器代替外部接口，分别通过共用会话（utils.http_client）
+和每次请求新建会话（与改用共用会话之前每次调用 requests.get 相同）发送请求，
+统计服务器收到的连接数（即握手次数）和总耗时：
+    python benchmarks/http_session.py
+    python benchmarks/http_session.py --requests 500 --concurrency 20
+    python benchmarks/http_session.py --tls
+
+--tls 时用 openssl 生成自签名证书并改用 HTTPS，每个新连接额外包含一次 TLS 握手。
+"""
+import os
+import ssl
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+from aiohttp import web
+from utils import http_client
+
+def make_ssl_context(directory: str) -> ssl.SSLContext:
+    """用 openssl 生成自签名证书，返回服务器使用的 SSL 上下文"""
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=127.0.0.1', '-keyout', key, '-out', cert],
+        check=True, capture_output=True
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+async def start_server(ssl_context) -> tuple:
+    """启动本地服务器，返回 (runner, 地址, 连接集合)，连接集合按客户端地址和端口记录收到请求的连接"""
+    connections = set()
+
+    async def handle(request):
+        connections.add(request.transport.get_extra_info('peername'))
+        return web.json_response({'success': True, 'result': 'x' * 512})
+
+    app = web.Application()
+    app.router.add_get('/', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0, ssl_context=ssl_context)
+    await site.start()
+    port = runner.addresses[0][1]
+    scheme = 'https' if ssl_context else 'http'
+    return runner, f'{scheme}://127.0.0.1:{port}/', connections
+
+async def shared_session(url: str):
+    """通过共用会话发送请求"""
+    response = await http_client.http_get(url, verify=False)
+    response.raise_for_status()
+
+async def new_session(url: str):
+    """每次请求新建会话，请求结束后关闭连接"""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, ssl=False) as response:
+            response.raise_for_status()
+            await response.read()
+
+async def run(request, url: str, total: int, concurrency: int) -> float:
+    """以 concurrency 个并发发送 total 个请求，返回耗时（秒）"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await request(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+async def main():
+    parser = argparse.ArgumentParser(description='共用 HTTP 会话的长连接基准测试')
+    parser.add_argument('--requests', type=int, default=200, help='每种方式发送的请求数量')
+    parser.add_argument('--concurrency', type=int, default=10, help='同时进行的请求数量')
+    parser.add_argument('--tls', action='store_true', help='使用 HTTPS，新连接包含 TLS 握手')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        ssl_context = make_ssl_context(directory) if args.tls else None
+        runner, url, connections = await start_server(ssl_context)
+        try:
+            for name, request in (('共用会话', shared_session), ('每次新建会话', new_session)):
+                connections.clear()
+                elapsed = await run(request, url, args.requests, args.concurrency)
+                print(
+                    f"{name}：{args.requests} 个请求，并发 {args.concurrency}，"
+                    f"新建连接 {len(connections)} 个，耗时 {elapsed * 1000:.1f}ms，"
+                    f"平均 {elapsed * 1000 / args.requests:.2f}ms/请求"
+                )
+        finally:
+            await http_client.close_session()
+            await runner.cleanup()
+
+if __name__ == '__main__':
+    asyncio.run(main())
\ No newline at end of file
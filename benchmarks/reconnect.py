@@ -0,0 +1,100 @@
+"""重连到首次 tools/list 响应的耗时基准测试
+
+在本地启动一个模拟小智端点的 WebSocket 服务器，用 connect_to_server 反复连接，
+分别在同进程（inprocess）和管道（pipe）两种方式下统计从连接建立到收到第一个 tools/list 响应的耗时：
+    python benchmarks/reconnect.py
+    python benchmarks/reconnect.py --runs 20 --modes inprocess
+    python benchmarks/reconnect.py --modes pipe --pool-size 0
+
+每次连接时端点依次发送 initialize、notifications/initialized 和 tools/list，收到响应后断开，
+与端点断线重连后的流程一致。管道方式和服务启动时一样预先准备待命工具进程，两次连接之间留出补充待命进程的时间；
+--pool-size 0 时不准备待命进程，每次连接时才启动工具进程。
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import websockets
+from handle import connect, pool
+from handle.host import get_mcp
+from handle.pool import fill_pool, close_pool
+
+INITIALIZE = {
+    'jsonrpc': '2.0', 'id': 0, 'method': 'initialize',
+    'params': {'protocolVersion': '2024-11-05', 'capabilities': {}, 'clientInfo': {'name': 'benchmark', 'version': '1.0'}}
+}
+INITIALIZED = {'jsonrpc': '2.0', 'method': 'notifications/initialized'}
+TOOLS_LIST = {'jsonrpc': '2.0', 'id': 1, 'method': 'tools/list'}
+
+async def wait_response(websocket, request_id: int) -> dict:
+    """等待指定 id 的响应，忽略通知"""
+    while True:
+        message = json.loads(await websocket.recv())
+        if message.get('id') == request_id:
+            return message
+
+async def run_mode(mode: str, runs: int, interval: float) -> list:
+    """在指定运行方式下连接 runs 次，返回每次从连接建立到收到 tools/list 响应的耗时（毫秒）和工具数量"""
+    connect.TRANSPORT_MODE = mode
+    results = []
+    done = asyncio.Event()
+
+    async def endpoint(websocket):
+        start = time.perf_counter()
+        await websocket.send(json.dumps(INITIALIZE))
+        await wait_response(websocket, 0)
+        await websocket.send(json.dumps(INITIALIZED))
+        await websocket.send(json.dumps(TOOLS_LIST))
+        response = await wait_response(websocket, 1)
+        results.append(((time.perf_counter() - start) * 1000, len(response['result']['tools'])))
+        done.set()
+        await websocket.close()
+
+    # 和服务启动时一样预先准备工具宿主
+    if mode == 'pipe':
+        fill_pool()
+    else:
+        get_mcp()
+    async with websockets.serve(endpoint, '127.0.0.1', 0) as server:
+        uri = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        # 等待首个待命工具进程就绪，之后的连接都是重连
+        await asyncio.sleep(interval)
+        for _ in range(runs):
+            done.clear()
+            try:
+                await connect.connect_to_server(uri, mode)
+            except websockets.exceptions.ConnectionClosed:
+                pass
+            await done.wait()
+            await asyncio.sleep(interval)
+    close_pool()
+    return results
+
+async def main():
+    parser = argparse.ArgumentParser(description='重连到首次 tools/list 响应的耗时基准测试')
+    parser.add_argument('--runs', type=int, default=10, help='每种运行方式的连接次数')
+    parser.add_argument('--interval', type=float, default=2, help='两次连接之间的间隔（秒），管道方式在此期间补充待命进程')
+    parser.add_argument('--modes', nargs='+', default=['inprocess', 'pipe'], choices=['inprocess', 'pipe'])
+    parser.add_argument('--pool-size', type=int, default=pool.POOL_SIZE, help='管道方式的待命工具进程数量，默认使用配置')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    pool.POOL_SIZE = max(args.pool_size, 0)
+
+    for mode in args.modes:
+        results = await run_mode(mode, max(args.runs, 1), args.interval)
+        times = [elapsed for elapsed, _ in results]
+        label = f"pipe pool={pool.POOL_SIZE}" if mode == 'pipe' else mode
+        print(
+            f"{label:<14} 工具 {results[0][1]} 个  中位数 {statistics.median(times):8.1f}ms  "
+            f"最小 {min(times):8.1f}ms  最大 {max(times):8.1f}ms"
+        )
+
+if __name__ == '__main__':
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""管道中转吞吐量基准测试
+
+用回显子进程代替工具进程、内存中的连接代替 WebSocket，让请求持续经过
+handle/write.py、handle/read.py 和 handle/print.py 的中转，统计每秒中转的消息数：
+    python benchmarks/relay.py
+    python benchmarks/relay.py --rev 813078e
+    python benchmarks/relay.py --messages 50000 --window 200 --size 4096
+
+--rev 指定 git 版本时从该版本读取中转模块进行对比，例如改用 asyncio 子进程流之前的版本；
+两种版本的函数签名不同，按签名分别用 subprocess.Popen 或 asyncio 子进程启动回显进程，与各自的 connect.py 一致。
+"""
+import os
+import io
+import sys
+import json
+import time
+import types
+import asyncio
+import inspect
+import logging
+import argparse
+import subprocess
+import contextlib
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# 回显进程：每收到一行请求输出一个同 id、指定大小的响应，并在标准错误输出写一行日志
+ECHO_WORKER = r"""
+import sys, json
+padding = 'x' * int(sys.argv[1])
+for line in sys.stdin:
+    request = json.loads(line)
+    sys.stdout.write(json.dumps({'jsonrpc': '2.0', 'id': request['id'], 'result': {'content': [{'type': 'text', 'text': padding}]}}) + '\n')
+    sys.stdout.flush()
+    sys.stderr.write('2025-01-01 00:00:00 - 工具进程 - INFO - 处理请求\n')
+    sys.stderr.flush()
+"""
+
+class MemoryWebSocket:
+    """内存中的 WebSocket：recv 依次返回请求，同时在途的请求不超过 window，send 收集响应"""
+
+    def __init__(self, total: int, window: int):
+        self.total = total
+        self.sent = 0
+        self.received = 0
+        self.window = asyncio.Semaphore(window)
+        self.done = asyncio.Event()
+
+    async def recv(self) -> str:
+        if self.sent >= self.total:
+            # 请求发完后保持连接，等待剩余的响应
+            await asyncio.Event().wait()
+        await self.window.acquire()
+        self.sent += 1
+        return json.dumps({'jsonrpc': '2.0', 'id': self.sent + 1, 'method': 'tools/call', 'params': {'name': 'echo', 'arguments': {}}})
+
+    async def send(self, data):
+        self.received += 1
+        self.window.release()
+        if self.received >= self.total:
+            self.done.set()
+
+def load_relay(rev: str) -> tuple:
+    """读取中转模块，rev 为空时使用当前代码，否则从 git 版本中读取"""
+    if not rev:
+        from handle.read import read_data
+        from handle.write import write_data
+        from handle.print import print_stderr
+        return read_data, write_data, print_stderr
+    functions = []
+    for name, function in (('read', 'read_data'), ('write', 'write_data'), ('print', 'print_stderr')):
+        source = subprocess.run(
+            ['git', 'show', f'{rev}:handle/{name}.py'], cwd=BASE_DIR, capture_output=True, text=True, encoding='utf-8', check=True
+        ).stdout
+        module = types.ModuleType(f'relay_{name}_{rev}')
+        exec(compile(source, f'{rev}:handle/{name}.py', 'exec'), module.__dict__)
+        functions.append(getattr(module, function))
+    return tuple(functions)
+
+async def run_relay(relay: tuple, total: int, window: int, size: int) -> float:
+    """中转 total 条消息，返回耗时（秒）"""
+    read_data, write_data, print_stderr = relay
+    websocket = MemoryWebSocket(total, window)
+    command = [sys.executable, '-c', ECHO_WORKER, str(size)]
+    if 'pending' in inspect.signature(read_data).parameters:
+        # asyncio 子进程流版本
+        from handle.pool import STREAM_LIMIT
+        process = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT
+        )
+        pending = {}
+        coroutines = [write_data(websocket, process, pending), read_data(process, websocket, pending), print_stderr(process)]
+    else:
+        # 线程池逐行读取的版本
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8', text=True
+        )
+        coroutines = [write_data(websocket, process), read_data(process, websocket), print_stderr(process)]
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+    await websocket.done.wait()
+    elapsed = time.perf_counter() - start
+    # 结束子进程，阻塞在读取上的线程随之返回
+    process.kill()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if isinstance(process, subprocess.Popen):
+        process.wait()
+    else:
+        await process.wait()
+    return elapsed
+
+async def main():
+    parser = argparse.ArgumentParser(description='管道中转吞吐量基准测试')
+    parser.add_argument('--rev', default='', help='从指定的 git 版本读取中转模块，默认使用当前代码')
+    parser.add_argument('--messages', type=int, default=20000, help='每轮中转的消息数量')
+    parser.add_argument('--window', type=int, default=100, help='同时在途的请求数量')
+    parser.add_argument('--size', type=int, default=256, help='每个响应的文本字节数')
+    parser.add_argument('--runs', type=int, default=3, help='重复的轮数')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    relay = load_relay(args.rev)
+    rates = []
+    # 旧版本把工具进程的日志直接写到标准错误输出，测试期间丢弃
+    with contextlib.redirect_stderr(io.StringIO()):
+        for _ in range(max(args.runs, 1)):
+            elapsed = await run_relay(relay, args.messages, args.window, args.size)
+            rates.append(args.messages / elapsed)
+    print(
+        f"{args.rev or '当前代码'}：{args.messages} 条消息，在途 {args.window}，响应 {args.size} 字节，"
+        f"最好 {max(rates):,.0f} 条/秒，最差 {min(rates):,.0f} 条/秒"
+    )
+
+if __name__ == '__main__':
+    asyncio.run(main())
\ No newline at end of file
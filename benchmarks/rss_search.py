@@ -0,0 +1,103 @@
+"""RSS 文章全文搜索基准测试
+
+在临时文章库中写入合成文章，统计写入、增量更新和各类查询的耗时：
+    python benchmarks/rss_search.py
+    python benchmarks/rss_search.py --articles 10000
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rss import store
+
+# 合成文章使用的常用汉字数量，按 Zipf 分布取字，接近真实文本中少数字高频出现的情况
+CHARS = 3000
+WORDS = ('python', 'rust', 'ai', 'gpu', 'linux', 'apple', 'openai', 'web', 'api', 'cloud')
+
+def make_corpus(count: int, seed: int = 1) -> list:
+    """生成合成文章：标题 10-30 字、摘要 50-300 字，约三成文章夹带英文词"""
+    rng = random.Random(seed)
+    chars = [chr(0x4e00 + i * 7) for i in range(CHARS)]
+    weights = [1 / (i + 1) for i in range(CHARS)]
+
+    def text(length: int) -> str:
+        body = ''.join(rng.choices(chars, weights, k=length))
+        if rng.random() < 0.3:
+            middle = length // 2
+            body = f"{body[:middle]} {rng.choice(WORDS)} {body[middle:]}"
+        return body
+
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            'link': f'https://example.com/{index}',
+            'source': f'订阅源{index % 20}',
+            'title': text(rng.randint(10, 30)),
+            'summary': text(rng.randint(50, 300)),
+            'published': start + timedelta(minutes=index)
+        }
+        for index in range(count)
+    ]
+
+def measure(queries: list, **kwargs) -> str:
+    """依次执行查询，返回耗时的中位数、P95 和最大值"""
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        store.search_articles(query, **kwargs)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return f"中位数 {times[len(times) // 2]:.2f}ms  P95 {times[int(len(times) * 0.95)]:.2f}ms  最大 {times[-1]:.2f}ms"
+
+def main():
+    parser = argparse.ArgumentParser(description='RSS 文章全文搜索基准测试')
+    parser.add_argument('--articles', type=int, default=100000, help='合成文章数量')
+    parser.add_argument('--queries', type=int, default=100, help='每类查询的数量')
+    parser.add_argument('--batch', type=int, default=1000, help='每次写入的文章数量')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store.DB_FILE = os.path.join(temp_dir, 'rss_articles.db')
+        corpus = make_corpus(args.articles)
+        start = time.perf_counter()
+        for index in range(0, len(corpus), args.batch):
+            store.save_articles(corpus[index:index + args.batch])
+        print(f"写入 {len(corpus)} 篇文章：{time.perf_counter() - start:.1f}s，文章库 {os.path.getsize(store.DB_FILE) / 1e6:.0f}MB")
+
+        rng = random.Random(2)
+        titles = [rng.choice(corpus)['title'] for _ in range(args.queries)]
+        print(f"四字查询    {measure([title[3:7] for title in titles])}")
+        print(f"两字查询    {measure([title[5:7] for title in titles])}")
+        print(f"单字查询    {measure([title[rng.randrange(len(title))] for title in titles])}")
+        print(f"英文查询    {measure(list(WORDS))}")
+        print(f"按订阅源    {measure([title[3:7] for title in titles], source='订阅源3')}")
+
+        # 最常见的字组成的查询，匹配的文章最多，是最慢的情况
+        common = chr(0x4e00) + chr(0x4e07)
+        print(f"高频二元词  {measure([common])}")
+        print(f"高频单字    {measure([chr(0x4e00)])}")
+
+        # 一轮刷新：一半新文章，一半已保存的文章
+        fresh = [{**item, 'link': f"{item['link']}/new"} for item in corpus[:50]]
+        start = time.perf_counter()
+        store.save_articles(fresh + corpus[-50:])
+        print(f"增量写入 50 篇新文章和 50 篇已有文章：{(time.perf_counter() - start) * 1000:.1f}ms")
+
+        # 对照：逐篇扫描标题和摘要做子串匹配
+        query = titles[0][3:7]
+        start = time.perf_counter()
+        [item for item in corpus if query in item['title'] or query in item['summary']]
+        print(f"对照：逐篇子串扫描 {(time.perf_counter() - start) * 1000:.1f}ms")
+        store._conn.close()
+        store._conn = None
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
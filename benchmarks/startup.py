@@ -0,0 +1,138 @@
+"""冷启动基准测试
+
+每个阶段在新的解释器中执行，统计导入服务模块、创建工具宿主等冷启动耗时：
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10 --importtime 30
+
+用于对比按清单延迟导入工具前后的冷启动耗时（有无清单两种情况），其余阶段作为启动各部分的参考。
+--importtime 使用 python -X importtime 统计创建工具宿主时的导入耗时，按顶层包汇总后列出耗时最多的包。
+"""
+import os
+import sys
+import argparse
+import statistics
+import unicodedata
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 子进程输出耗时的标记
+MARK = 'BENCH'
+
+# 阶段名称 -> 在新解释器中执行的代码，start 之后的部分计时，setup 中的导入不计时
+STAGES = {
+    '导入 services.server': (
+        '',
+        'import services.server'
+    ),
+    '创建工具宿主（按清单）': (
+        'from handle.start import create_mcp',
+        'create_mcp()'
+    ),
+    '创建工具宿主（无清单）': (
+        'import tempfile\n'
+        'from services import lazy\n'
+        'from handle.start import create_mcp\n'
+        "lazy.MANIFEST_FILE = os.path.join(tempfile.mkdtemp(), 'tool_manifest.json')",
+        'create_mcp()'
+    ),
+    '导入到创建工具宿主': (
+        '',
+        'from handle.start import create_mcp\n'
+        'create_mcp()'
+    ),
+    '管道模式工具进程就绪': (
+        'import asyncio\n'
+        'from handle.pool import spawn_worker\n'
+        'async def spawn():\n'
+        '    process = await spawn_worker()\n'
+        '    process.kill()\n'
+        '    await process.wait()',
+        'asyncio.run(spawn())'
+    ),
+    '创建共享 HTTP 会话': (
+        'import asyncio\n'
+        'from utils.http_client import get_session, close_session\n'
+        'async def create():\n'
+        '    get_session()\n'
+        '    await close_session()',
+        'asyncio.run(create())'
+    ),
+    '加载车站数据': (
+        'from utils.railway import station_index\n'
+        'if not os.path.exists(station_index.DATA_FILE):\n'
+        f'    print("{MARK} -")\n'
+        '    sys.exit()',
+        'station_index.read_dataset()'
+    ),
+}
+
+def run_stage(setup: str, body: str) -> float:
+    """在新的解释器中执行一个阶段，返回耗时（毫秒），阶段不可用时返回 None"""
+    code = '\n'.join([
+        'import os, sys, time, logging',
+        'logging.disable(logging.CRITICAL)',
+        setup,
+        'start = time.perf_counter()',
+        body,
+        f'print("{MARK}", (time.perf_counter() - start) * 1000)'
+    ])
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=BASE_DIR, capture_output=True, text=True, encoding='utf-8'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode)
+    value = [line for line in result.stdout.splitlines() if line.startswith(MARK)][-1].split()[1]
+    return None if value == '-' else float(value)
+
+def import_time(top: int) -> list:
+    """用 -X importtime 统计创建工具宿主时的导入耗时，按顶层包汇总各模块自身的耗时，返回 (毫秒, 包, 模块数) 列表"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'from handle.start import create_mcp; create_mcp()'],
+        cwd=BASE_DIR, capture_output=True, text=True, encoding='utf-8'
+    )
+    packages = {}
+    for line in result.stderr.splitlines():
+        # 格式：import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, _, name = line.removeprefix('import time:').split('|')
+        package = name.strip().split('.')[0]
+        total, count = packages.get(package, (0, 0))
+        packages[package] = (total + int(own) / 1000, count + 1)
+    return sorted(((total, package, count) for package, (total, count) in packages.items()), reverse=True)[:top]
+
+def display_width(text: str) -> int:
+    """终端中的显示宽度，中文占两个字符宽度"""
+    return sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+
+def pad(text: str, width: int) -> str:
+    """按显示宽度补齐空格"""
+    return text + ' ' * (width - display_width(text))
+
+def main():
+    parser = argparse.ArgumentParser(description='冷启动基准测试')
+    parser.add_argument('--runs', type=int, default=5, help='每个阶段重复的次数')
+    parser.add_argument('--importtime', type=int, default=15, help='列出导入耗时最多的包数量，0 表示不统计')
+    args = parser.parse_args()
+
+    # 先生成工具清单，之后按清单创建工具宿主
+    run_stage('from handle.start import create_mcp', 'create_mcp()')
+    width = max(display_width(name) for name in STAGES) + 2
+    for name, (setup, body) in STAGES.items():
+        try:
+            times = [run_stage(setup, body) for _ in range(max(args.runs, 1))]
+        except RuntimeError as e:
+            print(f"{pad(name, width)}失败: {e}")
+            continue
+        if None in times:
+            print(f"{pad(name, width)}跳过（没有本地数据）")
+            continue
+        print(f"{pad(name, width)}中位数 {statistics.median(times):8.1f}ms  最小 {min(times):8.1f}ms  最大 {max(times):8.1f}ms")
+
+    if args.importtime:
+        print(f"\n创建工具宿主时导入耗时最多的 {args.importtime} 个包（各模块自身耗时之和）：")
+        for total, package, count in import_time(args.importtime):
+            print(f"{total:10.1f}ms  {package}（{count} 个模块）")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
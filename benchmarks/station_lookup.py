@@ -0,0 +1,116 @@
+"""车站电报码反查基准测试
+
+用 200 趟列车的余票查询结果，对比逐条遍历车站字典（改用双向索引之前的做法）
+和双向索引把起止站电报码换回站名的耗时，并对比两种车站数据文件的加载耗时：
+    python benchmarks/station_lookup.py
+    python benchmarks/station_lookup.py --trains 500 --stations 3300
+
+本地已有车站数据（tmp/station_data.bin）时使用真实车站，否则生成合成车站。
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.railway import station_index
+from utils.railway.get_china_city import FIELDS
+
+def make_stations(count: int, seed: int = 1) -> list:
+    """生成合成车站记录，字段与 get_china_city.FIELDS 一致"""
+    rng = random.Random(seed)
+    stations, names, codes = [], set(), set()
+    while len(stations) < count:
+        name = ''.join(chr(0x4e00 + rng.randrange(3000)) for _ in range(rng.randint(2, 4)))
+        code = ''.join(rng.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=3))
+        if name in names or code in codes:
+            continue
+        names.add(name)
+        codes.add(code)
+        stations.append((code.lower(), name, code, 'pinyin', code.lower(), str(len(stations)), '0000', name[:2]))
+    return stations
+
+def load_stations(count: int) -> tuple:
+    """优先读取本地车站数据，返回 (车站记录, 来源说明)"""
+    if station_index.read_dataset():
+        return station_index.get_stations(), '本地车站数据'
+    return make_stations(count), '合成车站'
+
+def make_trains(stations: list, count: int, seed: int = 2) -> list:
+    """生成 count 趟列车的起止站电报码，与余票查询结果中每行的第 4、5 个字段对应"""
+    rng = random.Random(seed)
+    return [(rng.choice(stations)[2], rng.choice(stations)[2]) for _ in range(count)]
+
+def linear_scan(city_json: dict, trains: list) -> list:
+    """改用双向索引之前：每趟列车遍历站名字典两次"""
+    return [
+        (
+            next((k for k, v in city_json.items() if v == from_code), from_code),
+            next((k for k, v in city_json.items() if v == to_code), to_code)
+        )
+        for from_code, to_code in trains
+    ]
+
+def index_lookup(codes: dict, trains: list) -> list:
+    """双向索引：每趟列车两次字典查找"""
+    return [(codes.get(from_code, from_code), codes.get(to_code, to_code)) for from_code, to_code in trains]
+
+def measure(function, runs: int) -> list:
+    """重复执行 runs 次，返回每次的耗时（毫秒）"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def report(name: str, times: list):
+    print(f"{name}：中位数 {statistics.median(times):9.3f}ms  最小 {min(times):9.3f}ms  最大 {max(times):9.3f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='车站电报码反查基准测试')
+    parser.add_argument('--trains', type=int, default=200, help='一次查询结果中的列车数量')
+    parser.add_argument('--stations', type=int, default=3000, help='没有本地车站数据时生成的车站数量')
+    parser.add_argument('--runs', type=int, default=50, help='重复的次数')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    runs = max(args.runs, 1)
+
+    stations, source = load_stations(args.stations)
+    trains = make_trains(stations, args.trains)
+    # 旧版本 city_data.json 的内容：站名 -> 电报码
+    city_json = {station[1]: station[2] for station in stations}
+    names, codes = station_index.build_index(stations)
+    assert linear_scan(city_json, trains) == index_lookup(codes, trains)
+    print(f"{source} {len(stations)} 个，列车 {len(trains)} 趟")
+    report('遍历车站字典', measure(lambda: linear_scan(city_json, trains), runs))
+    report('双向索引', measure(lambda: index_lookup(codes, trains), runs))
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = os.path.join(directory, 'city_data.json')
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(city_json, f, ensure_ascii=False)
+
+        def load_json():
+            with open(json_file, encoding='utf-8') as f:
+                data = json.load(f)
+            # 旧版本只有站名 -> 电报码，反查时才遍历，这里不计反向索引
+            return data
+
+        station_index.DATA_FILE = os.path.join(directory, 'station_data.bin')
+        station_index.save_dataset(stations, {})
+        print(
+            f"\n加载车站数据：city_data.json {os.path.getsize(json_file) / 1024:.0f}KB（仅站名和电报码），"
+            f"station_data.bin {os.path.getsize(station_index.DATA_FILE) / 1024:.0f}KB（全部 {len(FIELDS)} 个字段）"
+        )
+        report('city_data.json', measure(load_json, runs))
+        report('station_data.bin', measure(station_index.read_dataset, runs))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
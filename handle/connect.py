@@ -1,48 +1,57 @@
-import sys
 import asyncio
 import logging
 import websockets
-import subprocess
 from typing import Callable
+from config.loader import load_config
 from handle.write import write_data
 from handle.read import read_data
 from handle.print import print_stderr
+from handle.host import serve_in_process
+from handle.pool import acquire_worker
+from handle.tasks import gather_or_cancel
 
 logger = logging.getLogger('管道服务')
 
-async def connect_to_server(uri: str):
+# 工具宿主运行方式
+TRANSPORT_MODE = load_config().get('transport', {}).get('mode', 'inprocess')
+
+async def connect_to_server(uri: str, name: str = '端点'):
     """连接到服务器并与管道服务建立双向通信管道"""
     try:
-        logger.info(f"正在连接服务器...")
+        logger.info(f"{name} 正在连接服务器...")
         async with websockets.connect(uri) as websocket:
-            logger.info("成功连接到服务器")
-            process = subprocess.Popen(
-                [sys.executable, '-c', 'from handle.start import start; start()'],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                encoding='utf-8',
-                text=True
-            )
-            logger.info(f"已启动注册进程")
+            logger.info(f"{name} 成功连接到服务器")
+            if TRANSPORT_MODE != 'pipe':
+                # 同进程工具宿主，无需启动子进程
+                await serve_in_process(websocket)
+                return
+            # 接入已完成注册的待命工具进程
+            process = await acquire_worker()
+            logger.info(f"已接入注册进程")
+            # 等待响应的请求，用于匹配响应并统计耗时
+            pending = {}
             # 创建管道任务
-            await asyncio.gather(
-                write_data(websocket, process),
-                read_data(process, websocket),
+            await gather_or_cancel(
+                write_data(websocket, process, pending),
+                read_data(process, websocket, pending),
                 print_stderr(process)
             )
     except websockets.exceptions.ConnectionClosed as e:
-        logger.error(f"服务器连接关闭: {e}")
+        logger.error(f"{name} 服务器连接关闭: {e}")
         raise
     except Exception as e:
-        logger.error(f"连接错误: {e}")
+        logger.error(f"{name} 连接错误: {e}")
         raise
     finally:
         if 'process' in locals():
             logger.info("正在终止管道服务")
-            try:
-                process.terminate()
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
+            if process.returncode is None:
+                try:
+                    process.terminate()
+                    await asyncio.wait_for(process.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                except ProcessLookupError:
+                    pass
             logger.info("管道服务已终止")
\ No newline at end of file
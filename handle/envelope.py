@@ -0,0 +1,66 @@
+import re
+
+# 只扫描消息开头的字节数，JSON-RPC 的 id 和 method 总在最前面
+HEAD_SIZE = 256
+# 只扫描消息结尾的字节数，工具调用结果的 isError 总在最后
+TAIL_SIZE = 64
+
+# 字符串（键名带冒号）或括号，用于跟踪嵌套层级，字符串中的括号不影响层级；
+# 在开头部分末尾被截断的字符串一直匹配到结尾，避免从其中的每个引号重新尝试匹配
+_TOKEN_PATTERN = re.compile(rb'"([^"\\]*(?:\\.[^"\\]*)*)(?:"(\s*:)?|\\?\Z)|[{}\[\]]')
+# 顶层对象开头的一个键及其值，值为字符串、数字等标量时一并匹配，为对象或数组时只匹配到冒号
+_LEADING_FIELD_PATTERN = re.compile(rb'\s*[{,]?\s*"([^"\\]*)"\s*:\s*("(?:[^"\\]|\\.)*"|[-\w.+]+)?')
+_ID_VALUE_PATTERN = re.compile(rb'\s*("(?:[^"\\]|\\.)*"|-?\d+)')
+_METHOD_VALUE_PATTERN = re.compile(rb'\s*"([^"\\]*)"')
+_ERROR_VALUE_PATTERN = re.compile(rb'\s*\{')
+_IS_ERROR_PATTERN = re.compile(rb'"isError"\s*:\s*true')
+
+def _leading_fields(head: bytes) -> dict:
+    """依次取出顶层对象开头的标量键，遇到对象或数组的值时停止，JSON-RPC 消息的 id、method 通常都在其中"""
+    fields = {}
+    position = 0
+    while True:
+        match = _LEADING_FIELD_PATTERN.match(head, position)
+        if not match:
+            return fields
+        fields.setdefault(match.group(1), match.start(2) if match.group(2) else match.end())
+        if not match.group(2):
+            return fields
+        position = match.end()
+
+def _top_level_fields(head: bytes) -> dict:
+    """取出开头部分中顶层对象的键及其值的起始位置，params、result 中嵌套的同名键不计入"""
+    fields = _leading_fields(head)
+    if b'id' in fields:
+        # 响应和请求的 id 排在开头，之后至多还有 result、error 或 params 一个嵌套值
+        return fields
+    # 通知或字段顺序不同的消息，逐个跟踪括号层级查找顶层的键
+    fields = {}
+    depth = 0
+    for match in _TOKEN_PATTERN.finditer(head):
+        token = match.group()
+        if token in (b'{', b'['):
+            depth += 1
+        elif token in (b'}', b']'):
+            depth -= 1
+        elif depth == 1 and match.group(2):
+            fields.setdefault(match.group(1), match.end())
+    return fields
+
+def scan_envelope(data: bytes) -> dict:
+    """扫描消息首尾获取 id、method、是否出错和消息大小，不解析整条消息"""
+    head = data[:HEAD_SIZE]
+    fields = _top_level_fields(head)
+    message_id = None
+    match = _ID_VALUE_PATTERN.match(head, fields[b'id']) if b'id' in fields else None
+    if match:
+        raw = match.group(1)
+        message_id = raw[1:-1].decode('utf-8', errors='replace') if raw.startswith(b'"') else int(raw)
+    method = _METHOD_VALUE_PATTERN.match(head, fields[b'method']) if b'method' in fields else None
+    error = b'error' in fields and _ERROR_VALUE_PATTERN.match(head, fields[b'error'])
+    return {
+        'id': message_id,
+        'method': method.group(1).decode('utf-8', errors='replace') if method else None,
+        'error': bool(error or _IS_ERROR_PATTERN.search(data[-TAIL_SIZE:])),
+        'size': len(data)
+    }
\ No newline at end of file
@@ -0,0 +1,82 @@
+import anyio
+import logging
+import mcp.types as types
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.message import SessionMessage
+from handle.start import create_mcp
+from handle.tasks import gather_or_cancel
+from handle.stats import track_request, track_response
+
+logger = logging.getLogger('管道服务')
+
+# 同进程工具宿主，所有连接共用
+_mcp = None
+
+def get_mcp() -> FastMCP:
+    """获取同进程工具宿主，首次调用时注册所有工具"""
+    global _mcp
+    if _mcp is None:
+        logger.info("正在启动同进程工具宿主...")
+        _mcp = create_mcp()
+        logger.info('已注册工具数量：%d' % len(_mcp._tool_manager.list_tools()))
+    return _mcp
+
+async def receive_data(websocket, read_stream, pending: dict):
+    """从WebSocket读取数据并交给工具宿主"""
+    try:
+        async with read_stream:
+            while True:
+                message = await websocket.recv()
+                try:
+                    session_message = SessionMessage(types.JSONRPCMessage.model_validate_json(message))
+                except Exception as e:
+                    logger.info("收到响应...")
+                    await read_stream.send(e)
+                    continue
+                request = session_message.message.root
+                message_id = getattr(request, 'id', None)
+                method = getattr(request, 'method', None)
+                params = getattr(request, 'params', None) or {}
+                tool = params.get('name') if method == 'tools/call' else None
+                track_request(pending, message_id, method, len(message), tool)
+                logger.info(f"收到响应(id: {message_id}, 方法: {method})...")
+                await read_stream.send(session_message)
+    except Exception as e:
+        logger.error(f"WebSocket到工具宿主错误: {e}")
+        raise
+
+async def send_data(write_stream, websocket, pending: dict):
+    """从工具宿主读取响应并发送到WebSocket"""
+    try:
+        async with write_stream:
+            async for session_message in write_stream:
+                data = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                response = session_message.message.root
+                message_id = getattr(response, 'id', None)
+                error = isinstance(response, types.JSONRPCError) or bool((getattr(response, 'result', None) or {}).get('isError'))
+                method, latency = track_response(pending, message_id, len(data), error)
+                if latency is None:
+                    logger.info(f"发送响应(大小: {len(data)} 字节)...")
+                else:
+                    logger.info(f"发送响应(id: {message_id}, 方法: {method}, 大小: {len(data)} 字节, 耗时: {latency * 1000:.1f} ms)...")
+                await websocket.send(data)
+    except Exception as e:
+        logger.error(f"工具宿主到WebSocket错误: {e}")
+        raise
+
+async def serve_in_process(websocket):
+    """在当前事件循环中运行工具宿主并与WebSocket双向通信"""
+    mcp = get_mcp()
+    read_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_reader = anyio.create_memory_object_stream(0)
+    # 等待响应的请求，用于匹配响应并统计耗时
+    pending = {}
+    await gather_or_cancel(
+        receive_data(websocket, read_writer, pending),
+        send_data(write_reader, websocket, pending),
+        mcp._mcp_server.run(
+            read_stream,
+            write_stream,
+            mcp._mcp_server.create_initialization_options()
+        )
+    )
\ No newline at end of file
@@ -1,27 +1,116 @@
 import os
+import sys
+import queue
+import atexit
+import random
 import logging
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from config.loader import load_config
 
-def setup_logging():
-    """日志配置"""
+LOG_FORMAT = '%(asctime)s - %(name)s：%(levelname)s，%(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 从配置获取日志设置
+LOGGING_CONFIG = load_config().get('logging', {}) or {}
+LOG_LEVEL = LOGGING_CONFIG.get('level', 'INFO')
+MAX_LENGTH = LOGGING_CONFIG.get('max_length', 2000)
+SAMPLE_RATE = LOGGING_CONFIG.get('sample_rate', 1.0)
+MAX_BYTES = LOGGING_CONFIG.get('max_bytes', 10 * 1024 * 1024)
+BACKUP_COUNT = LOGGING_CONFIG.get('backup_count', 5)
+
+# 后台写日志的线程，每个进程只启动一次
+_listener = None
+
+class PayloadFilter(logging.Filter):
+    """超长日志按比例采样并截断，警告及以上级别和转发的工具进程日志始终保留"""
+
+    def filter(self, record):
+        if getattr(record, 'raw', False) or not MAX_LENGTH:
+            return True
+        message = record.getMessage()
+        if len(message) <= MAX_LENGTH:
+            # 保存格式化后的内容，QueueHandler 准备记录时不再重复格式化参数
+            record.msg = message
+            record.args = None
+            return True
+        if record.levelno <= logging.INFO and random.random() >= SAMPLE_RATE:
+            return False
+        record.msg = f"{message[:MAX_LENGTH]}...(已截断，共 {len(message)} 字符)"
+        record.args = None
+        return True
+
+class RawFormatter(logging.Formatter):
+    """工具进程转发的日志已经格式化过，原样输出"""
+
+    def format(self, record):
+        if getattr(record, 'raw', False):
+            return record.getMessage()
+        return super().format(record)
+
+class DailyRotatingFileHandler(RotatingFileHandler):
+    """按日期写入 log/YYYY-MM-DD.log，跨天时切换文件，单个文件超过大小时切分"""
+
+    def __init__(self, log_dir, max_bytes, backup_count):
+        self.log_dir = log_dir
+        self.day = datetime.today().strftime('%Y-%m-%d')
+        super().__init__(self._file_for(self.day), maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+
+    def _file_for(self, day):
+        return os.path.join(self.log_dir, f'{day}.log')
+
+    def shouldRollover(self, record):
+        if datetime.today().strftime('%Y-%m-%d') != self.day:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        day = datetime.today().strftime('%Y-%m-%d')
+        if day == self.day:
+            super().doRollover()
+            return
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.day = day
+        self.baseFilename = os.path.abspath(self._file_for(day))
+
+def setup_logging(to_file=True):
+    """日志配置，日志先放入队列，由后台线程写入终端和文件"""
+    global _listener
     logger = logging.getLogger('管道服务')
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s：%(levelname)s，%(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
     logging.addLevelName(logging.INFO, "信息")
-    logging.addLevelName(logging.WARNING, "警告") 
+    logging.addLevelName(logging.WARNING, "警告")
     logging.addLevelName(logging.ERROR, "错误")
     logging.addLevelName(logging.CRITICAL, "严重错误")
-    log_dir = 'log'
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    today = datetime.today().strftime('%Y-%m-%d')
-    log_file = os.path.join(log_dir, f'{today}.log')
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s：%(levelname)s，%(message)s', datefmt='%Y-%m-%d %H:%M:%S')
-    file_handler.setFormatter(file_formatter)
-    logging.getLogger('').addHandler(file_handler)
-    return logger
\ No newline at end of file
+    if _listener is not None:
+        return logger
+    formatter = RawFormatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setFormatter(formatter)
+    handlers = [console_handler]
+    # 工具进程只输出到标准错误，由主进程统一写入文件，避免重复记录
+    if to_file:
+        log_dir = 'log'
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        file_handler = DailyRotatingFileHandler(log_dir, MAX_BYTES, BACKUP_COUNT)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(PayloadFilter())
+    root = logging.getLogger('')
+    root.setLevel(LOG_LEVEL)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return logger
+
+def forward_log(logger, line: bytes):
+    """把工具进程已格式化的日志行交给本进程的日志队列，统一写入终端和文件"""
+    logger.info(line.decode('utf-8', errors='replace').rstrip('\r\n'), extra={'raw': True})
\ No newline at end of file
@@ -0,0 +1,87 @@
+import sys
+import asyncio
+import logging
+from config.loader import load_config
+from handle.start import READY_MARK
+from handle.logger import forward_log
+
+logger = logging.getLogger('管道服务')
+# 工具进程日志
+worker_logger = logging.getLogger('工具进程')
+
+config = load_config()
+
+# 待命工具进程数量
+POOL_SIZE = max(config.get('transport', {}).get('pool_size', 1), 0)
+# 管道单行数据上限(字节)，大型工具结果为一行JSON
+STREAM_LIMIT = config.get('transport', {}).get('stream_limit', 16 * 1024 * 1024)
+
+# 已完成工具注册、等待接入的进程
+_idle_workers = []
+# 正在预热的任务
+_warming_tasks = set()
+
+async def spawn_worker():
+    """启动工具进程并等待其完成工具注册"""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, '-c', 'from handle.start import start; start()',
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=STREAM_LIMIT
+    )
+    # 注册完成前的日志照常输出，直到出现就绪标志
+    while True:
+        line = await process.stderr.readline()
+        if not line:
+            await process.wait()
+            raise RuntimeError(f"工具进程启动失败，退出码: {process.returncode}")
+        forward_log(worker_logger, line)
+        if READY_MARK.encode('utf-8') in line:
+            return process
+
+async def warm_up_worker():
+    """在后台预热一个待命工具进程"""
+    try:
+        process = await spawn_worker()
+        _idle_workers.append(process)
+        logger.info(f"待命工具进程已就绪，当前待命数量：{len(_idle_workers)}")
+    except Exception as e:
+        logger.error(f"预热工具进程失败: {e}")
+
+def fill_pool():
+    """补充待命工具进程至配置数量"""
+    missing = POOL_SIZE - len(_idle_workers) - len(_warming_tasks)
+    for _ in range(missing):
+        task = asyncio.create_task(warm_up_worker())
+        _warming_tasks.add(task)
+        task.add_done_callback(_warming_tasks.discard)
+
+async def acquire_worker():
+    """取出一个已就绪的工具进程，并在后台补充新的待命进程"""
+    while True:
+        while _idle_workers:
+            process = _idle_workers.pop(0)
+            if process.returncode is None:
+                fill_pool()
+                return process
+            logger.warning("待命工具进程已退出，丢弃")
+        if not _warming_tasks:
+            break
+        # 有进程正在预热时等待其就绪，比重新启动更快
+        await asyncio.wait(set(_warming_tasks), return_when=asyncio.FIRST_COMPLETED)
+    process = await spawn_worker()
+    fill_pool()
+    return process
+
+def close_pool():
+    """结束所有待命工具进程"""
+    for task in list(_warming_tasks):
+        task.cancel()
+    while _idle_workers:
+        process = _idle_workers.pop()
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
\ No newline at end of file
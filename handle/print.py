@@ -1,21 +1,19 @@
-import asyncio
-import sys
 import logging
+from handle.logger import forward_log
 
 logger = logging.getLogger('管道服务')
+# 工具进程日志
+worker_logger = logging.getLogger('工具进程')
 
 async def print_stderr(process):
-    """从进程标准错误输出读取数据并打印到终端"""
+    """从进程标准错误输出读取日志并并入本进程的日志"""
     try:
         while True:
-            data = await asyncio.get_event_loop().run_in_executor(
-                None, process.stderr.readline
-            )
+            data = await process.stderr.readline()
             if not data:
                 logger.info("进程标准错误输出输出已结束")
                 break
-            sys.stderr.write(data)
-            sys.stderr.flush()
+            forward_log(worker_logger, data)
     except Exception as e:
         logger.error(f"进程标准错误输出管道错误: {e}")
         raise
\ No newline at end of file
@@ -1,37 +1,70 @@
 import json
 import asyncio
 import logging
+from config.loader import load_config
+from handle.tasks import gather_or_cancel
+from handle.envelope import scan_envelope
+from handle.stats import track_response
 
 logger = logging.getLogger('管道服务')
 
-async def read_data(process, websocket):
-    """从进程stdout读取数据并发送到WebSocket"""
+# 管道队列长度，队列满时暂停读取以产生背压
+QUEUE_SIZE = load_config().get('transport', {}).get('queue_size', 64)
+
+async def read_stdout(process, queue: asyncio.Queue):
+    """从进程stdout按行读取数据放入发送队列"""
+    while True:
+        data = await process.stdout.readline()
+        if not data:
+            logger.info("进程输出已结束")
+            break
+        # 队列已满时在此等待，子进程的stdout管道随之写满而暂停输出
+        await queue.put(data)
+    await queue.put(None)
+
+def log_tools(data: bytes):
+    """解析工具列表响应并输出已注册工具"""
+    try:
+        json_data = json.loads(data)
+    except json.JSONDecodeError:
+        return
+    if 'result' in json_data and 'tools' in json_data['result']:
+        for tool in json_data['result']['tools']:
+            name = tool.get('name', '')
+            description = tool.get('description', '')
+            first_line = description.split('\n')[0]
+            logger.debug(f"{name} - {first_line}")
+        logger.info('已注册工具数量：%d' % len(json_data['result']['tools']))
+
+async def send_websocket(queue: asyncio.Queue, websocket, pending: dict):
+    """从发送队列取出数据并发送到WebSocket"""
     printed = False
+    while True:
+        data = await queue.get()
+        if data is None:
+            break
+        # 只扫描消息开头的信封字段，消息内容原样转发
+        envelope = scan_envelope(data)
+        if envelope['id'] == 1 and not printed:
+            log_tools(data)
+            printed = True
+        # 带 method 的是工具进程发出的请求或通知，不是对端点请求的响应
+        response_id = None if envelope['method'] else envelope['id']
+        method, latency = track_response(pending, response_id, envelope['size'], envelope['error'])
+        if latency is None:
+            logger.info(f"发送响应(大小: {envelope['size']} 字节)...")
+        else:
+            logger.info(f"发送响应(id: {envelope['id']}, 方法: {method}, 大小: {envelope['size']} 字节, 耗时: {latency * 1000:.1f} ms)...")
+        await websocket.send(data.decode('utf-8', errors='replace'))
+
+async def read_data(process, websocket, pending: dict):
+    """从进程stdout读取数据并发送到WebSocket"""
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
     try:
-        while True:
-            data = await asyncio.get_event_loop().run_in_executor(
-                None, process.stdout.readline
-            )
-            if not data:
-                logger.info("进程输出已结束")
-                break
-            if not isinstance(data, str):
-                data = str(data)
-            try:
-                json_data = json.loads(data.strip())
-                if json_data.get('id') == 1 and not printed:
-                    if 'result' in json_data and 'tools' in json_data['result']:
-                        for tool in json_data['result']['tools']:
-                            name = tool.get('name', '')
-                            description = tool.get('description', '')
-                            first_line = description.split('\n')[0]
-                            logger.debug(f"{name} - {first_line}")
-                        logger.info('已注册工具数量：%d' % len(json_data['result']['tools']))
-                    printed = True
-            except json.JSONDecodeError:
-                pass
-            logger.info("发送响应...")
-            await websocket.send(data)
+        await gather_or_cancel(
+            read_stdout(process, queue),
+            send_websocket(queue, websocket, pending)
+        )
     except Exception as e:
         logger.error(f"进程到WebSocket管道错误: {e}")
         raise
\ No newline at end of file
@@ -1,17 +1,32 @@
-from services.register import register
 from mcp.server.fastmcp import FastMCP
 from handle.logger import setup_logging
+from services.invoke import prepare_tools
+from services.lazy import register_lazy_tools, save_manifest
 
-def start():
-    logger = setup_logging()
-    logger.info("启动注册服务...")
+# 工具注册完成标志，工具进程池据此判断进程已就绪
+READY_MARK = "服务注册完成，准备接收请求"
+
+def create_mcp() -> FastMCP:
+    """创建MCP服务器并注册所有工具"""
     # 创建MCP服务器
     mcp = FastMCP("管道服务")
-    # 注册服务
-    register(mcp)
+    # 优先按工具清单注册，工具模块在首次调用时才导入
+    if not register_lazy_tools(mcp):
+        # 清单不存在或已过期时导入所有工具模块进行注册，并重新生成清单
+        from services.register import register
+        register(mcp)
+        save_manifest(mcp)
+        # 调整工具调用方式
+        prepare_tools(mcp)
     # 添加初始化完成标志
     mcp._initialized = True
-    logger.info("服务注册完成，准备接收请求")
+    return mcp
+
+def start():
+    logger = setup_logging(to_file=False)
+    logger.info("启动注册服务...")
+    mcp = create_mcp()
+    logger.info(READY_MARK)
     # 确保服务注册完成后再启动服务器
     try:
         mcp.run(transport="stdio")
@@ -0,0 +1,90 @@
+import time
+from bisect import bisect_left
+
+# 耗时分布的分桶上限(毫秒)，超过最后一个上限的计入最后一个桶
+LATENCY_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+# 管道消息统计
+_stats = {
+    'requests': 0,  # 收到的消息数量
+    'responses': 0,  # 发送的消息数量
+    'bytes_in': 0,  # 收到的字节数
+    'bytes_out': 0,  # 发送的字节数
+    'answered': 0,  # 匹配到请求的响应数量
+    'errors': 0,  # 出错的响应数量
+    'latency_total': 0.0,  # 请求到响应的总耗时(秒)
+    'latency_max': 0.0  # 请求到响应的最大耗时(秒)
+}
+
+# 按工具统计，tools/call 以工具名区分，其余请求以方法名区分
+_tools = {}
+
+def _tool_stats(name: str) -> dict:
+    """获取单个工具的统计项，不存在时创建"""
+    stats = _tools.get(name)
+    if stats is None:
+        stats = _tools[name] = {
+            'calls': 0,  # 完成的调用数量
+            'errors': 0,  # 出错的调用数量
+            'bytes_in': 0,  # 请求字节数
+            'bytes_out': 0,  # 响应字节数
+            'latency_total': 0.0,  # 总耗时(秒)
+            'latency_max': 0.0,  # 最大耗时(秒)
+            'buckets': [0] * len(LATENCY_BUCKETS)  # 耗时分布
+        }
+    return stats
+
+def track_request(pending: dict, message_id, method, size: int, tool=None):
+    """记录收到的消息，带 id 的请求等待匹配响应"""
+    _stats['requests'] += 1
+    _stats['bytes_in'] += size
+    if message_id is not None and method:
+        pending[message_id] = (method, tool, size, time.perf_counter())
+
+def track_response(pending: dict, message_id, size: int, error: bool = False):
+    """记录发送的消息，返回匹配到的请求方法和耗时(秒)"""
+    _stats['responses'] += 1
+    _stats['bytes_out'] += size
+    if message_id is None or message_id not in pending:
+        return None, None
+    method, tool, request_size, started = pending.pop(message_id)
+    latency = time.perf_counter() - started
+    _stats['answered'] += 1
+    _stats['latency_total'] += latency
+    _stats['latency_max'] = max(_stats['latency_max'], latency)
+    stats = _tool_stats(tool or method)
+    stats['calls'] += 1
+    stats['bytes_in'] += request_size
+    stats['bytes_out'] += size
+    stats['latency_total'] += latency
+    stats['latency_max'] = max(stats['latency_max'], latency)
+    stats['buckets'][bisect_left(LATENCY_BUCKETS, latency * 1000)] += 1
+    if error:
+        _stats['errors'] += 1
+        stats['errors'] += 1
+    return method, latency
+
+def get_stats() -> dict:
+    """获取管道消息统计"""
+    stats = dict(_stats)
+    stats['latency_avg'] = stats['latency_total'] / stats['answered'] if stats['answered'] else 0.0
+    return stats
+
+def get_tool_stats() -> dict:
+    """获取按工具统计的耗时分布、错误数量和消息大小，按平均耗时从高到低排列"""
+    result = {}
+    for name, stats in _tools.items():
+        calls = stats['calls']
+        result[name] = {
+            'calls': calls,
+            'errors': stats['errors'],
+            'latency_avg': stats['latency_total'] / calls if calls else 0.0,
+            'latency_max': stats['latency_max'],
+            'bytes_in_avg': stats['bytes_in'] / calls if calls else 0.0,
+            'bytes_out_avg': stats['bytes_out'] / calls if calls else 0.0,
+            'histogram': {
+                ('+Inf' if bound == float('inf') else f"{bound}ms"): count
+                for bound, count in zip(LATENCY_BUCKETS, stats['buckets'])
+            }
+        }
+    return dict(sorted(result.items(), key=lambda item: item[1]['latency_avg'], reverse=True))
\ No newline at end of file
@@ -0,0 +1,11 @@
+import asyncio
+
+async def gather_or_cancel(*aws):
+    """并发运行多个任务，任意一个出错时取消其余任务并等待其清理完成"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
\ No newline at end of file
@@ -1,23 +1,59 @@
+import json
+import asyncio
 import logging
+from config.loader import load_config
+from handle.tasks import gather_or_cancel
+from handle.stats import track_request
 
 logger = logging.getLogger('管道服务')
 
-async def write_data(websocket, process):
+# 管道队列长度，队列满时暂停接收以产生背压
+QUEUE_SIZE = load_config().get('transport', {}).get('queue_size', 64)
+
+async def receive_websocket(websocket, queue: asyncio.Queue, pending: dict):
+    """从WebSocket接收数据放入写入队列"""
+    while True:
+        message = await websocket.recv()
+        if not isinstance(message, str):
+            if isinstance(message, bytes):
+                message = message.decode('utf-8')
+            else:
+                message = str(message)
+        data = message.encode('utf-8')
+        # 请求消息很小，直接解析以记录 id 和方法，用于匹配响应耗时
+        try:
+            request = json.loads(message)
+        except json.JSONDecodeError:
+            request = None
+        if isinstance(request, dict):
+            params = request.get('params') or {}
+            tool = params.get('name') if request.get('method') == 'tools/call' and isinstance(params, dict) else None
+            track_request(pending, request.get('id'), request.get('method'), len(data), tool)
+            logger.info(f"收到响应(id: {request.get('id')}, 方法: {request.get('method')})...")
+        else:
+            logger.info("收到响应...")
+        # 队列已满时在此等待，WebSocket随之停止读取
+        await queue.put(data)
+
+async def write_stdin(queue: asyncio.Queue, process):
+    """从写入队列取出数据写入进程stdin"""
+    while True:
+        data = await queue.get()
+        process.stdin.write(data + b'\n')
+        # 等待管道缓冲区排空，子进程处理不过来时暂停写入
+        await process.stdin.drain()
+
+async def write_data(websocket, process, pending: dict):
     """从WebSocket读取数据并写入进程stdin"""
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
     try:
-        while True:
-            message = await websocket.recv()
-            logger.info("收到响应...")
-            if not isinstance(message, str):
-                if isinstance(message, bytes):
-                    message = message.decode('utf-8')
-                else:
-                    message = str(message)
-            process.stdin.write(message + '\n')
-            process.stdin.flush()
+        await gather_or_cancel(
+            receive_websocket(websocket, queue, pending),
+            write_stdin(queue, process)
+        )
     except Exception as e:
         logger.error(f"WebSocket到进程管道错误: {e}")
         raise
     finally:
-        if not process.stdin.closed:
+        if not process.stdin.is_closing():
             process.stdin.close()
\ No newline at end of file
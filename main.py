@@ -2,7 +2,7 @@ import sys
 import signal
 import asyncio
 import logging
-from services.server import server
+from services.server import serve
 from config.loader import load_config
 from handle.logger import setup_logging
 from handle.signal import signal_handler
@@ -11,12 +11,15 @@ if __name__ == "__main__":
     logger = setup_logging()
     logger = logging.getLogger('管道代理')
     signal.signal(signal.SIGINT, signal_handler)
-    endpoint_url = load_config()['endpoint']['url']
-    if not endpoint_url.startswith(('wss://', 'ws://')):
+    endpoint_urls = load_config()['endpoint']['url']
+    # 支持单个地址或多个地址的列表
+    if isinstance(endpoint_urls, str):
+        endpoint_urls = [endpoint_urls]
+    if not endpoint_urls or not all(isinstance(url, str) and url.startswith(('wss://', 'ws://')) for url in endpoint_urls):
         logger.error("请设置有效的`MCP_ENDPOINT`，必须以wss://或ws://开头")
         sys.exit(1)
     try:
-        asyncio.run(server(endpoint_url))
+        asyncio.run(serve(endpoint_urls))
     except KeyboardInterrupt:
         logger.info("程序被用户中断")
     except Exception as e:
@@ -0,0 +1,65 @@
+import json
+import anyio
+import asyncio
+import logging
+import functools
+from config.loader import load_config
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+
+logger = logging.getLogger('工具调用')
+
+# 从配置获取每个工具同时执行的调用数量上限，0 表示不限制
+CONCURRENCY = load_config().get('tools', {}).get('concurrency', {}) or {}
+DEFAULT_CONCURRENCY = CONCURRENCY.get('default', 0)
+# 不合并相同调用的工具，有副作用的工具每次调用都要真正执行
+COALESCE_EXCLUDE = set(load_config().get('tools', {}).get('coalesce_exclude', []) or [])
+
+# 正在执行的调用：(工具名, 参数键) -> 执行任务
+_in_flight = {}
+
+def coalesce(name: str, fn):
+    """相同工具、相同参数的调用在执行期间只请求一次，结果分发给所有等待的调用"""
+    @functools.wraps(fn)
+    async def run_coalesced(**kwargs):
+        key = (name, json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str))
+        task = _in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(**kwargs))
+            _in_flight[key] = task
+            task.add_done_callback(lambda _: _in_flight.pop(key, None))
+        else:
+            logger.info(f"{name} 合并到正在执行的相同调用")
+        # 单个调用被取消时不影响其他等待同一结果的调用
+        return await asyncio.shield(task)
+    return run_coalesced
+
+def prepare_tool(tool: Tool):
+    """调整单个工具的调用方式"""
+    if not tool.is_async:
+        # 同步工具放到线程中执行，避免阻塞事件循环
+        # 每个包装函数各自绑定被包装的函数，不能共用同一个变量，否则后面重新赋值时会调用到自己
+        sync_fn = tool.fn
+        @functools.wraps(sync_fn)
+        async def run_in_thread(**kwargs):
+            return await anyio.to_thread.run_sync(functools.partial(sync_fn, **kwargs))
+        tool.fn = run_in_thread
+        tool.is_async = True
+    limit = CONCURRENCY.get(tool.name, DEFAULT_CONCURRENCY)
+    if limit:
+        # 超过上限的调用在此排队，不影响其他工具
+        inner = tool.fn
+        semaphore = anyio.Semaphore(limit)
+        @functools.wraps(inner)
+        async def run_limited(**kwargs):
+            async with semaphore:
+                return await inner(**kwargs)
+        tool.fn = run_limited
+    if tool.name not in COALESCE_EXCLUDE:
+        tool.fn = coalesce(tool.name, tool.fn)
+
+def prepare_tools(mcp: FastMCP):
+    """调整所有已注册工具的调用方式"""
+    for tool in mcp._tool_manager.list_tools():
+        prepare_tool(tool)
+    logger.info("工具调用方式调整完成")
\ No newline at end of file
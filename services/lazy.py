@@ -0,0 +1,169 @@
+import os
+import json
+import anyio
+import hashlib
+import logging
+import importlib
+from importlib import metadata
+from typing import Any
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+from mcp.types import ToolAnnotations
+from config.path import get_config_path
+from services.invoke import prepare_tool
+
+logger = logging.getLogger('延迟加载')
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 工具清单，记录每个工具的说明、参数格式和所在模块
+MANIFEST_FILE = os.path.join(BASE_DIR, 'tmp', 'tool_manifest.json')
+# 影响工具说明和参数格式的文件，任一变化时重新生成清单
+SOURCE_DIRS = ('utils', 'services')
+# 按清单注册时直接构造的工具字段，mcp 内部结构与此不同时改为导入所有工具模块注册
+LAZY_FIELDS = ('fn', 'name', 'title', 'description', 'parameters', 'fn_metadata', 'is_async', 'context_kwarg', 'annotations', 'icons', 'meta')
+
+# 已加载的工具：工具名 -> 真实工具
+_loaded = {}
+# 加载中的工具，避免同一工具重复加载
+_locks = {}
+
+class _Collector:
+    """代替 FastMCP 接收工具注册，只收集工具不启动服务"""
+
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self, name=None, title=None, description=None, annotations=None, icons=None, meta=None, structured_output=None):
+        def decorator(fn):
+            tool = Tool.from_function(
+                fn,
+                name=name,
+                title=title,
+                description=description,
+                annotations=annotations,
+                icons=icons,
+                meta=meta,
+                structured_output=structured_output
+            )
+            self.tools[tool.name] = tool
+            return fn
+        return decorator
+
+async def load_tool(name: str, module: str, registrar: str) -> Tool:
+    """导入工具所在模块并注册，得到可以调用的真实工具"""
+    if name in _loaded:
+        return _loaded[name]
+    lock = _locks.setdefault(name, anyio.Lock())
+    async with lock:
+        if name not in _loaded:
+            logger.info(f"首次调用 {name}，正在加载 {module}...")
+            # 导入可能较慢（例如 pandas），放到线程中执行，避免阻塞其他调用
+            loaded_module = await anyio.to_thread.run_sync(importlib.import_module, module)
+            collector = _Collector()
+            getattr(loaded_module, registrar)(collector)
+            for tool in collector.tools.values():
+                prepare_tool(tool)
+                _loaded.setdefault(tool.name, tool)
+            if name not in _loaded:
+                raise RuntimeError(f"{module}.{registrar} 没有注册工具 {name}")
+    return _loaded[name]
+
+class LazyTool(Tool):
+    """按清单注册的工具，列表中直接使用清单中的说明，首次调用时才导入模块"""
+
+    module: str
+    registrar: str
+    manifest_output_schema: dict[str, Any] | None = None
+
+    @property
+    def output_schema(self) -> dict[str, Any] | None:
+        return self.manifest_output_schema
+
+    async def run(self, arguments, context=None, convert_result=False):
+        tool = await load_tool(self.name, self.module, self.registrar)
+        return await tool.run(arguments, context=context, convert_result=convert_result)
+
+def lazy_supported(mcp: FastMCP) -> bool:
+    """按清单注册依赖 mcp 的内部结构（工具管理器的 _tools 和 Tool 的字段），检查当前版本是否一致"""
+    tools = getattr(getattr(mcp, '_tool_manager', None), '_tools', None)
+    return isinstance(tools, dict) and all(field in Tool.model_fields for field in LAZY_FIELDS)
+
+def get_fingerprint() -> str:
+    """根据工具源码、配置文件和 mcp 版本计算指纹"""
+    digest = hashlib.sha1()
+    for source_dir in SOURCE_DIRS:
+        for root, dirs, files in os.walk(os.path.join(BASE_DIR, source_dir)):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for file in sorted(files):
+                if file.endswith('.py'):
+                    stat = os.stat(os.path.join(root, file))
+                    digest.update(f"{os.path.relpath(os.path.join(root, file), BASE_DIR)}:{stat.st_mtime_ns}:{stat.st_size}".encode('utf-8'))
+    stat = os.stat(get_config_path())
+    digest.update(f"config:{stat.st_mtime_ns}:{stat.st_size}".encode('utf-8'))
+    digest.update(f"mcp:{metadata.version('mcp')}".encode('utf-8'))
+    return digest.hexdigest()
+
+def save_manifest(mcp: FastMCP):
+    """把已注册工具的说明、参数格式和所在模块写入清单"""
+    if not lazy_supported(mcp):
+        return
+    tools = []
+    for tool in mcp._tool_manager.list_tools():
+        fn = getattr(tool.fn, '__wrapped__', tool.fn)
+        tools.append({
+            'name': tool.name,
+            'title': tool.title,
+            'description': tool.description,
+            'parameters': tool.parameters,
+            'output_schema': tool.output_schema,
+            'annotations': tool.annotations.model_dump(mode='json') if tool.annotations else None,
+            'meta': tool.meta,
+            'context_kwarg': tool.context_kwarg,
+            'module': fn.__module__,
+            # 工具定义在注册函数内部，限定名的第一段就是注册函数
+            'registrar': fn.__qualname__.split('.')[0]
+        })
+    os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+    temp_file = MANIFEST_FILE + '.tmp'
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': get_fingerprint(), 'tools': tools}, f, ensure_ascii=False)
+        os.replace(temp_file, MANIFEST_FILE)
+        logger.info(f"工具清单已保存，工具数量：{len(tools)}")
+    except OSError as e:
+        logger.warning(f"工具清单保存失败: {e}")
+
+def register_lazy_tools(mcp: FastMCP) -> bool:
+    """按清单注册所有工具，清单不存在、已过期或 mcp 内部结构不一致时返回 False"""
+    if not lazy_supported(mcp):
+        logger.warning(f"mcp {metadata.version('mcp')} 的内部结构与延迟加载不一致，导入所有工具模块注册")
+        return False
+    try:
+        with open(MANIFEST_FILE, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if manifest.get('fingerprint') != get_fingerprint():
+        logger.info("工具源码或配置已变化，重新生成工具清单")
+        return False
+    tools = {}
+    for item in manifest['tools']:
+        tools[item['name']] = LazyTool.model_construct(
+            fn=None,
+            name=item['name'],
+            title=item['title'],
+            description=item['description'],
+            parameters=item['parameters'],
+            fn_metadata=None,
+            is_async=True,
+            context_kwarg=item['context_kwarg'],
+            annotations=ToolAnnotations(**item['annotations']) if item['annotations'] else None,
+            icons=None,
+            meta=item['meta'],
+            module=item['module'],
+            registrar=item['registrar'],
+            manifest_output_schema=item['output_schema']
+        )
+    mcp._tool_manager._tools.update(tools)
+    logger.info(f"已按清单注册工具，数量：{len(manifest['tools'])}，各工具在首次调用时加载")
+    return True
\ No newline at end of file
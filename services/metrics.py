@@ -0,0 +1,57 @@
+import logging
+import contextlib
+from config.loader import load_config
+from utils.cache import get_cache_stats
+from handle.stats import get_stats, get_tool_stats
+
+logger = logging.getLogger('性能统计')
+
+# 从配置获取统计接口设置
+METRICS_CONFIG = load_config().get('metrics', {}) or {}
+METRICS_ENABLED = METRICS_CONFIG.get('enabled', False)
+METRICS_HOST = METRICS_CONFIG.get('host', '127.0.0.1')
+METRICS_PORT = METRICS_CONFIG.get('port', 8765)
+
+def create_app():
+    """创建统计接口应用"""
+    from fastapi import FastAPI
+    app = FastAPI(title="管道服务统计")
+
+    @app.get("/metrics")
+    async def metrics():
+        """总体统计、按工具统计和结果缓存命中统计"""
+        return {'total': get_stats(), 'tools': get_tool_stats(), 'cache': get_cache_stats()}
+
+    @app.get("/metrics/tools")
+    async def tool_metrics():
+        """按工具统计，按平均耗时从高到低排列"""
+        return get_tool_stats()
+
+    return app
+
+def create_server(config):
+    """创建不接管信号的 uvicorn 服务器，Ctrl-C 由 main.py 统一处理，关闭整个服务而不是只停止统计接口"""
+    import uvicorn
+
+    class MetricsServer(uvicorn.Server):
+        # uvicorn 0.29 起通过 capture_signals 接管信号，之前的版本使用 install_signal_handlers
+        def capture_signals(self):
+            return contextlib.nullcontext()
+
+        def install_signal_handlers(self):
+            pass
+
+    return MetricsServer(config)
+
+async def serve_metrics():
+    """在本地运行统计接口，未启用时直接返回"""
+    if not METRICS_ENABLED:
+        return
+    import uvicorn
+    config = uvicorn.Config(create_app(), host=METRICS_HOST, port=METRICS_PORT, log_level='warning', lifespan='off')
+    logger.info(f"统计接口已启动: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    try:
+        await create_server(config).serve()
+    except (OSError, SystemExit) as e:
+        # 端口被占用等问题只影响统计接口，不影响端点连接
+        logger.error(f"统计接口启动失败: {e}")
\ No newline at end of file
@@ -1,10 +1,15 @@
 import asyncio
 import random
 import logging
+import importlib
 import sys
 from config.loader import load_config
+from handle.host import get_mcp
+from handle.tasks import gather_or_cancel
+from handle.pool import fill_pool, close_pool
 from handle.connect import connect_to_server
-from handle.start import start
+from services.metrics import serve_metrics
+from utils.http_client import close_session
 
 logger = logging.getLogger('管道服务')
 
@@ -13,20 +18,79 @@ config = load_config()
 # 从配置获取重连设置
 INITIAL_BACKOFF = config['reconnection']['initial_backoff']
 MAX_BACKOFF = config['reconnection']['max_backoff']
-reconnect_attempt = config['reconnection']['reconnect_attempt']
-backoff = config['reconnection']['backoff']
+RECONNECT_ATTEMPT = config['reconnection']['reconnect_attempt']
+BACKOFF = config['reconnection']['backoff']
+# 工具宿主运行方式
+TRANSPORT_MODE = config.get('transport', {}).get('mode', 'inprocess')
+# 带后台任务的功能模块及其停止函数，模块被导入过（后台任务启动或工具首次调用）时退出前停止
+BACKGROUND_STOPS = {
+    'utils.bilibili.live.danmu_stream': 'stop_streams',
+    'utils.bilibili.history.store': 'stop_history_sync',
+    'utils.rss.store': 'stop_rss_refresh',
+    'utils.svn.store': 'stop_svn_sync'
+}
 
-async def server(uri):
-    """带重试机制的WebSocket服务器连接"""
-    global reconnect_attempt, backoff
+def get_background_starts() -> list:
+    """按配置列出需要在启动时运行的后台任务：(模块, 启动函数, 参数)
+    只在这里读取配置判断是否启用，未启用的功能不导入模块，避免拖慢启动"""
+    bilibili = config.get('bilibili_api', {})
+    starts = []
+    # 启用弹幕流时提前订阅配置的直播间
+    if (bilibili['live'].get('stream') or {}).get('enabled'):
+        starts.append(('utils.bilibili.live.danmu_stream', 'ensure_stream', (bilibili['live']['roomid'],)))
+    # 启用历史记录同步时在后台补齐本地历史记录
+    if (bilibili['history'].get('store') or {}).get('enabled') and bilibili.get('auth', {}).get('cookie'):
+        starts.append(('utils.bilibili.history.store', 'ensure_history_sync', ()))
+    # 启用文章库刷新时在后台定时拉取 RSS 订阅源
+    if (config.get('rss_store') or {}).get('enabled') and config.get('rss'):
+        starts.append(('utils.rss.store', 'ensure_rss_refresh', ()))
+    # 启用日志库同步时在后台增量同步 SVN 日志
+    svn = config.get('svn') or {}
+    if (svn.get('store') or {}).get('enabled') and svn.get('repo_url'):
+        starts.append(('utils.svn.store', 'ensure_svn_sync', ()))
+    return starts
+
+async def stop_background():
+    """停止已导入的功能模块的后台任务并关闭本地数据库"""
+    for module, stop in BACKGROUND_STOPS.items():
+        if module in sys.modules:
+            await getattr(sys.modules[module], stop)()
+
+async def server(uri, name='端点'):
+    """带重试机制的WebSocket服务器连接，每个端点各自维护重连状态"""
+    reconnect_attempt = RECONNECT_ATTEMPT
+    backoff = BACKOFF
     while True:  # 无限重连
         try:
             if reconnect_attempt > 0:
                 wait_time = backoff * (1 + random.random() * 0.1)
-                logger.info(f"等待 {wait_time:.2f} 秒后进行第 {reconnect_attempt} 次重连尝试...")
+                logger.info(f"{name} 等待 {wait_time:.2f} 秒后进行第 {reconnect_attempt} 次重连尝试...")
                 await asyncio.sleep(wait_time)
-            await connect_to_server(uri)
+            await connect_to_server(uri, name)
         except Exception as e:
             reconnect_attempt += 1
-            logger.warning(f"连接关闭(尝试次数: {reconnect_attempt}): {e}")
-            backoff = min(backoff * 2, MAX_BACKOFF)
\ No newline at end of file
+            logger.warning(f"{name} 连接关闭(尝试次数: {reconnect_attempt}): {e}")
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+async def serve(uris):
+    """为每个端点启动独立的重连循环，所有端点共用同一个工具宿主"""
+    if TRANSPORT_MODE != 'pipe':
+        # 提前注册工具，连接后即可响应请求
+        get_mcp()
+        for module, start, args in get_background_starts():
+            getattr(importlib.import_module(module), start)(*args)
+    else:
+        # 提前预热待命工具进程，连接后直接接入
+        fill_pool()
+    try:
+        await gather_or_cancel(
+            serve_metrics(),
+            *(
+                server(uri, f"端点{index}" if len(uris) > 1 else '端点')
+                for index, uri in enumerate(uris, 1)
+            )
+        )
+    finally:
+        close_pool()
+        await stop_background()
+        await close_session()
\ No newline at end of file
@@ -0,0 +1,155 @@
+import json
+import zlib
+import asyncio
+import pytest
+from utils.bilibili.live import danmu_stream
+from utils.bilibili.live.danmu_protocol import HEADER, pack, unpack, parse_command, parse_danmu
+from utils.bilibili.live.danmu_protocol import PROTO_JSON, PROTO_HEARTBEAT, PROTO_ZLIB
+from utils.bilibili.live.danmu_protocol import OP_AUTH, OP_AUTH_REPLY, OP_HEARTBEAT_REPLY, OP_MESSAGE
+
+ROOMID = 900001
+
+def packet(proto: int, op: int, body: bytes) -> bytes:
+    """按弹幕服务器的格式组装一个数据包"""
+    return HEADER.pack(HEADER.size + len(body), HEADER.size, proto, op, 0) + body
+
+def danmu_command(text: str, uid: int = 10086, nickname: str = '观众') -> bytes:
+    """弹幕服务器推送的 DANMU_MSG 命令（按抓包结果精简）"""
+    return json.dumps({
+        'cmd': 'DANMU_MSG',
+        'info': [
+            [0, 1, 25, 16777215, 1735689600000, 1735689600, 0, 'abcd1234', 0, 0, 0, '', 0],
+            text,
+            [uid, nickname, 0, 0, 0, 10000, 1, ''],
+            [21, '粉丝团', '主播', ROOMID],
+            [12, 0, 6406234, '>50000'],
+            ['', '']
+        ]
+    }, ensure_ascii=False).encode('utf-8')
+
+# 认证回复、人气值和一条普通弹幕在同一帧中
+MULTI_PACKET_FRAME = (
+    packet(PROTO_HEARTBEAT, OP_AUTH_REPLY, b'{"code":0}')
+    + packet(PROTO_HEARTBEAT, OP_HEARTBEAT_REPLY, (1234).to_bytes(4, 'big'))
+    + packet(PROTO_JSON, OP_MESSAGE, danmu_command('第一条'))
+)
+# zlib 压缩的帧：解压后是多个数据包，其中夹着一条非弹幕命令
+ZLIB_FRAME = packet(PROTO_ZLIB, OP_MESSAGE, zlib.compress(
+    packet(PROTO_JSON, OP_MESSAGE, danmu_command('压缩一'))
+    + packet(PROTO_JSON, OP_MESSAGE, b'{"cmd":"INTERACT_WORD","data":{}}')
+    + packet(PROTO_JSON, OP_MESSAGE, danmu_command('压缩二', uid=10087))
+))
+
+@pytest.fixture
+def stream_state(monkeypatch):
+    """每个测试使用独立的弹幕流状态"""
+    for name in ('_buffers', '_cursors', '_last_used', '_tasks'):
+        monkeypatch.setattr(danmu_stream, name, {})
+    monkeypatch.setattr(danmu_stream, '_connected', set())
+    monkeypatch.setattr(danmu_stream, 'STREAM_ENABLED', True)
+
+def test_pack_round_trip():
+    data = pack(OP_AUTH, {'roomid': ROOMID, 'protover': 2})
+    assert unpack(data) == [(OP_AUTH, b'{"roomid":900001,"protover":2}')]
+
+def test_multi_packet_frame(stream_state):
+    assert [op for op, _ in unpack(MULTI_PACKET_FRAME)] == [OP_AUTH_REPLY, OP_HEARTBEAT_REPLY, OP_MESSAGE]
+    assert danmu_stream.feed_frame(ROOMID, MULTI_PACKET_FRAME) == 1
+    assert danmu_stream.is_streaming(ROOMID)
+    danmus, cursor = danmu_stream.get_buffered_danmu(ROOMID)
+    assert cursor == 1
+    assert danmus[0]['text'] == '第一条'
+    assert danmus[0]['medal'] == {'level': 21, 'name': '粉丝团', 'anchor': '主播'}
+    assert danmus[0]['timeline']
+
+def test_zlib_frame(stream_state):
+    packets = unpack(ZLIB_FRAME)
+    assert len(packets) == 3
+    assert [parse_danmu(parse_command(body)) is None for _, body in packets] == [False, True, False]
+    assert danmu_stream.feed_frame(ROOMID, ZLIB_FRAME) == 2
+    danmus, _ = danmu_stream.get_buffered_danmu(ROOMID)
+    assert [(danmu['text'], danmu['uid']) for danmu in danmus] == [('压缩一', 10086), ('压缩二', 10087)]
+
+def test_truncated_frame_keeps_complete_packets():
+    frame = MULTI_PACKET_FRAME + packet(PROTO_JSON, OP_MESSAGE, danmu_command('不完整'))[:HEADER.size + 5]
+    assert [op for op, _ in unpack(frame)][:3] == [OP_AUTH_REPLY, OP_HEARTBEAT_REPLY, OP_MESSAGE]
+    assert parse_command(unpack(frame)[-1][1]) is None
+
+def test_buffer_overflow_drops_oldest(stream_state, monkeypatch):
+    monkeypatch.setattr(danmu_stream, 'BUFFER_SIZE', 4)
+    for _ in range(3):
+        danmu_stream.feed_frame(ROOMID, ZLIB_FRAME)
+    danmus, cursor = danmu_stream.get_buffered_danmu(ROOMID, limit=10)
+    assert cursor == 6
+    assert len(danmus) == 4
+    # 游标落在已丢弃的弹幕上时返回缓冲区中剩下的所有新弹幕
+    danmus, _ = danmu_stream.get_buffered_danmu(ROOMID, since=1)
+    assert len(danmus) == 4
+    danmus, _ = danmu_stream.get_buffered_danmu(ROOMID, since=5)
+    assert [danmu['text'] for danmu in danmus] == ['压缩二']
+    assert danmu_stream.get_buffered_danmu(ROOMID, since=6) == ([], 6)
+
+def run_streams(callback):
+    """在事件循环中执行 callback，订阅任务替换为一直等待的任务，结束时停止所有订阅"""
+    async def main():
+        try:
+            return callback()
+        finally:
+            await danmu_stream.stop_streams()
+    return asyncio.run(main())
+
+@pytest.fixture
+def fake_subscribe(stream_state, monkeypatch):
+    async def subscribe(roomid):
+        await asyncio.Event().wait()
+    monkeypatch.setattr(danmu_stream, '_subscribe', subscribe)
+    monkeypatch.setattr(danmu_stream, 'PINNED_ROOMID', 1)
+    monkeypatch.setattr(danmu_stream, 'MAX_ROOMS', 3)
+
+def test_max_rooms_evicts_least_recently_used(fake_subscribe):
+    def callback():
+        for roomid in (1, 2, 3):
+            danmu_stream.ensure_stream(roomid)
+        danmu_stream.add_danmu(3, {'text': '旧弹幕'})
+        danmu_stream.ensure_stream(2)
+        danmu_stream.ensure_stream(4)
+        rooms = set(danmu_stream._tasks)
+        # 重新订阅后游标继续递增
+        danmu_stream.ensure_stream(3)
+        return rooms, danmu_stream.add_danmu(3, {'text': '新弹幕'}), set(danmu_stream._tasks)
+    rooms, cursor, rooms_after = run_streams(callback)
+    assert rooms == {1, 2, 4}
+    assert cursor == 2
+    assert rooms_after == {1, 3, 4}
+
+def test_room_cap_without_evictable_room_falls_back(fake_subscribe, monkeypatch):
+    monkeypatch.setattr(danmu_stream, 'MAX_ROOMS', 1)
+    rooms = run_streams(lambda: (danmu_stream.ensure_stream(1), danmu_stream.ensure_stream(2), set(danmu_stream._tasks)))
+    assert rooms == (False, False, {1})
+    assert danmu_stream._last_used == {}
+
+def test_idle_rooms_are_stopped(fake_subscribe, monkeypatch):
+    monkeypatch.setattr(danmu_stream, 'IDLE_TIMEOUT', 60)
+    def callback():
+        for roomid in (1, 2, 3):
+            danmu_stream.ensure_stream(roomid)
+            danmu_stream.add_danmu(roomid, {'text': '弹幕'})
+        for roomid in (1, 2):
+            danmu_stream._last_used[roomid] -= 120
+        danmu_stream.ensure_stream(3)
+        return set(danmu_stream._tasks), set(danmu_stream._buffers)
+    assert run_streams(callback) == ({1, 3}, {1, 3})
+
+def test_subscription_exits_when_idle(stream_state, monkeypatch):
+    monkeypatch.setattr(danmu_stream, 'IDLE_TIMEOUT', 60)
+    monkeypatch.setattr(danmu_stream, 'PINNED_ROOMID', 1)
+    async def main():
+        danmu_stream._last_used[2] = 0
+        danmu_stream.add_danmu(2, {'text': '弹幕'})
+        task = asyncio.create_task(danmu_stream._subscribe(2))
+        danmu_stream._tasks[2] = task
+        await asyncio.wait_for(task, 1)
+    asyncio.run(main())
+    assert danmu_stream._tasks == {}
+    assert danmu_stream._buffers == {}
+    assert danmu_stream._cursors == {2: 1}
\ No newline at end of file
@@ -0,0 +1,34 @@
+import json
+from handle.envelope import scan_envelope
+
+def encode(message: dict) -> bytes:
+    return (json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8')
+
+def test_response_id_and_error():
+    envelope = scan_envelope(encode({'jsonrpc': '2.0', 'id': 7, 'result': {'content': [], 'isError': False}}))
+    assert (envelope['id'], envelope['method'], envelope['error']) == (7, None, False)
+    envelope = scan_envelope(encode({'jsonrpc': '2.0', 'id': 'a"b', 'error': {'code': -32601, 'message': '未知方法'}}))
+    assert envelope['id'] == 'a\\"b'
+    assert envelope['error'] is True
+    envelope = scan_envelope(encode({'jsonrpc': '2.0', 'id': 8, 'result': {'content': [{'type': 'text', 'text': 'x' * 1000}], 'isError': True}}))
+    assert envelope['error'] is True
+
+def test_notification_ignores_nested_id():
+    data = encode({'jsonrpc': '2.0', 'method': 'notifications/progress', 'params': {'id': 3, 'progressToken': 1}})
+    envelope = scan_envelope(data)
+    assert (envelope['id'], envelope['method']) == (None, 'notifications/progress')
+    # 顶层 id 排在嵌套对象之后时同样取顶层的值
+    data = encode({'jsonrpc': '2.0', 'params': {'id': 3, 'text': '{"id": 4}'}, 'method': 'ping', 'id': 5})
+    envelope = scan_envelope(data)
+    assert (envelope['id'], envelope['method']) == (5, 'ping')
+
+def test_nested_error_is_not_an_error():
+    data = encode({'jsonrpc': '2.0', 'id': 2, 'result': {'error': {'code': 1}, 'content': [], 'isError': False}})
+    assert scan_envelope(data)['error'] is False
+
+def test_truncated_head_in_notification():
+    # 开头部分在转义较多的长字符串中截断，嵌套的 id 仍不计入
+    text = json.dumps({'id': 9, 'items': ['{"id": 1}'] * 100})
+    data = encode({'jsonrpc': '2.0', 'method': 'notifications/message', 'params': {'data': text, 'id': 9}})
+    envelope = scan_envelope(data)
+    assert (envelope['id'], envelope['method'], envelope['error']) == (None, 'notifications/message', False)
\ No newline at end of file
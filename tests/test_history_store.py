@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from utils.bilibili.history import store
+
+PAGE_SIZE = 3
+
+class FakeHistory:
+    """模拟历史记录接口：按观看时间从新到旧分页，游标为下一页的位置"""
+
+    def __init__(self, count: int):
+        self.items = []
+        self.requests = 0
+        self.add(count)
+
+    def add(self, count: int):
+        start = self.items[0]['view_at'] if self.items else 0
+        new = [
+            {'history': {'business': 'archive', 'oid': view_at, 'bvid': f'BV{view_at}'}, 'title': f'视频{view_at}',
+             'view_at': view_at}
+            for view_at in range(start + count, start, -1)
+        ]
+        self.items = new + self.items
+
+    async def fetch_page(self, max_id: int = 0, view_at: int = 0, business: str = '') -> tuple:
+        self.requests += 1
+        page = self.items[max_id:max_id + PAGE_SIZE]
+        return page, {'max': max_id + len(page), 'view_at': page[-1]['view_at'] if page else 0, 'business': 'archive'}
+
+@pytest.fixture
+def history_db(tmp_path, monkeypatch):
+    """使用临时历史记录库和模拟接口"""
+    monkeypatch.setattr(store, 'DB_FILE', str(tmp_path / 'bilibili_history.db'))
+    monkeypatch.setattr(store, '_conn', None)
+    monkeypatch.setattr(store, '_last_sync', 0)
+    monkeypatch.setitem(store.config['bilibili_api'], 'auth', {'cookie': 'SESSDATA=abc; DedeUserID=1001; bili_jct=x'})
+    api = FakeHistory(10)
+    monkeypatch.setattr(store, '_fetch_page', api.fetch_page)
+    yield api
+    if store._conn is not None:
+        store._conn.close()
+        store._conn = None
+
+def stored_view_at() -> list:
+    return [row['view_at'] for row in store.query_history(('archive',), 0, 10 ** 9)]
+
+def test_complete_only_after_backfill_reaches_the_end(history_db):
+    asyncio.run(store.sync_latest())
+    assert stored_view_at() == [10, 9, 8]
+    assert not store.is_covered(1)
+    asyncio.run(store.sync_older(pages=2))
+    assert not store.is_covered(1)
+    asyncio.run(store.sync_older(pages=5))
+    assert store.is_covered(1)
+    assert stored_view_at() == list(range(10, 0, -1))
+
+def test_empty_account_is_not_marked_complete(history_db):
+    history_db.items = []
+    asyncio.run(store.sync_latest())
+    assert asyncio.run(store.sync_older()) == 0
+    assert not store.is_covered(1)
+    # 之后有了观看记录，仍然能补齐全部记录
+    history_db.add(7)
+    store._last_sync = 0
+    asyncio.run(store.sync_history(since=1))
+    assert stored_view_at() == list(range(7, 0, -1))
+    assert store.is_covered(1)
+
+def test_gap_after_many_new_records_restarts_backfill(history_db, monkeypatch):
+    monkeypatch.setattr(store, 'MAX_HEAD_PAGES', 2)
+    asyncio.run(store.sync_latest())
+    asyncio.run(store.sync_older(pages=10))
+    assert store.is_covered(1)
+    # 新增记录超过同步最新记录时的翻页上限，中间出现缺口
+    history_db.add(20)
+    asyncio.run(store.sync_latest())
+    assert not store.is_covered(1)
+    asyncio.run(store.sync_older(pages=10))
+    assert store.is_covered(1)
+    assert stored_view_at() == list(range(30, 0, -1))
+
+def test_account_change_resets_store(history_db, monkeypatch):
+    asyncio.run(store.sync_latest())
+    asyncio.run(store.sync_older(pages=5))
+    store._conn.close()
+    store._conn = None
+    monkeypatch.setitem(store.config['bilibili_api'], 'auth', {'cookie': 'DedeUserID=2002; SESSDATA=def'})
+    assert store.get_account_mid() == '2002'
+    assert stored_view_at() == []
+    assert not store.is_covered(1)
+
+def test_same_account_keeps_store_after_restart(history_db):
+    asyncio.run(store.sync_latest())
+    store._conn.close()
+    store._conn = None
+    assert stored_view_at() == [10, 9, 8]
\ No newline at end of file
@@ -0,0 +1,29 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from mcp.server.fastmcp import FastMCP
+from utils.bilibili.history import videos, article, live
+
+MODULES = [(videos, 'get_bilibili_history_videos'), (article, 'get_bilibili_history_article'), (live, 'get_bilibili_history_live')]
+
+@pytest.mark.parametrize('module, name', MODULES)
+def test_default_day_is_computed_per_call(module, name, monkeypatch):
+    days = []
+
+    async def sync_history(since):
+        days.append(since)
+        return "离线"
+
+    monkeypatch.setitem(module.config['bilibili_api'], 'auth', {'cookie': 'DedeUserID=1'})
+    monkeypatch.setattr(module, 'sync_history', sync_history)
+    monkeypatch.setattr(module, 'query_history', lambda *args: [])
+    mcp = FastMCP('test')
+    getattr(module, name)(mcp)
+    tool = mcp._tool_manager.get_tool(name)
+    # 参数说明中的默认值不能是注册时的时间
+    assert tool.parameters['properties']['view_at_timestamp']['default'] == 0
+    asyncio.run(tool.run({}))
+    yesterday = int((datetime.now() - timedelta(days=1)).timestamp())
+    asyncio.run(tool.run({'view_at_timestamp': yesterday}))
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    assert days == [int(today.timestamp()), int((today - timedelta(days=1)).timestamp())]
\ No newline at end of file
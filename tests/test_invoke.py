@@ -0,0 +1,166 @@
+import time
+import asyncio
+import threading
+import pytest
+from mcp.server.fastmcp import FastMCP
+from services import invoke
+
+def make_tool(fn, name: str):
+    """注册工具并按 prepare_tool 调整调用方式"""
+    mcp = FastMCP('test')
+    mcp.tool(name=name)(fn)
+    tool = mcp._tool_manager.get_tool(name)
+    invoke.prepare_tool(tool)
+    return tool
+
+def test_limited_sync_tool_returns_real_value(monkeypatch):
+    monkeypatch.setitem(invoke.CONCURRENCY, 'limited_add', 1)
+
+    def limited_add(a: int, b: int) -> int:
+        return a + b
+
+    tool = make_tool(limited_add, 'limited_add')
+    assert asyncio.run(tool.run({'a': 1, 'b': 2})) == 3
+
+def test_limited_sync_tool_runs_in_thread_within_limit(monkeypatch):
+    monkeypatch.setitem(invoke.CONCURRENCY, 'limited_sleep', 2)
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0, 'threads': set()}
+
+    def limited_sleep(index: int) -> int:
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+            state['threads'].add(threading.get_ident())
+        time.sleep(0.05)
+        with lock:
+            state['running'] -= 1
+        return index
+
+    tool = make_tool(limited_sleep, 'limited_sleep')
+
+    async def main():
+        return await asyncio.gather(*(tool.run({'index': index}) for index in range(6)))
+
+    assert asyncio.run(main()) == list(range(6))
+    assert state['peak'] == 2
+    assert threading.get_ident() not in state['threads']
+
+def test_unlimited_sync_tool_returns_real_value(monkeypatch):
+    monkeypatch.setattr(invoke, 'DEFAULT_CONCURRENCY', 0)
+
+    def plain_echo(text: str) -> str:
+        return text
+
+    tool = make_tool(plain_echo, 'plain_echo')
+    assert asyncio.run(tool.run({'text': '你好'})) == '你好'
+
+def test_default_limit_applies_to_sync_tools(monkeypatch):
+    monkeypatch.setattr(invoke, 'DEFAULT_CONCURRENCY', 1)
+
+    def default_echo(text: str) -> str:
+        return text
+
+    tool = make_tool(default_echo, 'default_echo')
+    assert asyncio.run(tool.run({'text': 'ok'})) == 'ok'
+
+class Upstream:
+    """模拟上游接口：记录请求次数，可以在返回前等待或抛出异常"""
+
+    def __init__(self, delay: float = 0.05, error: Exception = None):
+        self.calls = 0
+        self.delay = delay
+        self.error = error
+
+    async def fetch(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {'calls': self.calls, **kwargs}
+
+def test_coalesce_fetches_once_for_concurrent_identical_calls():
+    upstream = Upstream()
+    fetch = invoke.coalesce('coalesce_same', upstream.fetch)
+
+    async def main():
+        return await asyncio.gather(*(fetch(city='北京') for _ in range(20)))
+
+    results = asyncio.run(main())
+    assert upstream.calls == 1
+    assert results == [{'calls': 1, 'city': '北京'}] * 20
+    assert not invoke._in_flight
+
+def test_coalesce_keeps_different_arguments_apart():
+    upstream = Upstream()
+    fetch = invoke.coalesce('coalesce_args', upstream.fetch)
+
+    async def main():
+        return await asyncio.gather(fetch(city='北京'), fetch(city='上海'), fetch(city='北京'))
+
+    results = asyncio.run(main())
+    assert upstream.calls == 2
+    assert results[0] == results[2]
+    assert results[1]['city'] == '上海'
+
+def test_coalesce_does_not_cache_finished_calls():
+    upstream = Upstream(delay=0)
+    fetch = invoke.coalesce('coalesce_sequential', upstream.fetch)
+
+    async def main():
+        await fetch(city='北京')
+        await fetch(city='北京')
+
+    asyncio.run(main())
+    assert upstream.calls == 2
+
+def test_coalesce_error_reaches_every_waiter_and_is_not_kept():
+    upstream = Upstream(error=RuntimeError('上游错误'))
+    fetch = invoke.coalesce('coalesce_error', upstream.fetch)
+
+    async def main():
+        results = await asyncio.gather(*(fetch(city='北京') for _ in range(5)), return_exceptions=True)
+        # 失败的调用结束后不再合并，下一次调用重新请求
+        upstream.error = None
+        return results, await fetch(city='北京')
+
+    results, retry = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert upstream.calls == 2
+    assert retry == {'calls': 2, 'city': '北京'}
+    assert not invoke._in_flight
+
+def test_coalesce_cancelled_leader_does_not_cancel_followers():
+    upstream = Upstream(delay=0.1)
+    fetch = invoke.coalesce('coalesce_cancel', upstream.fetch)
+
+    async def main():
+        leader = asyncio.create_task(fetch(city='北京'))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.create_task(fetch(city='北京')) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(main())
+    assert upstream.calls == 1
+    assert results == [{'calls': 1, 'city': '北京'}] * 3
+
+def test_prepared_sync_tool_is_coalesced(monkeypatch):
+    monkeypatch.setitem(invoke.CONCURRENCY, 'coalesced_sync', 1)
+    calls = []
+
+    def coalesced_sync(city: str) -> str:
+        calls.append(city)
+        time.sleep(0.05)
+        return city
+
+    tool = make_tool(coalesced_sync, 'coalesced_sync')
+
+    async def main():
+        return await asyncio.gather(*(tool.run({'city': '北京'}) for _ in range(5)))
+
+    assert asyncio.run(main()) == ['北京'] * 5
+    assert calls == ['北京']
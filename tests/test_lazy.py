@@ -0,0 +1,39 @@
+import os
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from services import lazy
+from services.lazy import LazyTool, register_lazy_tools, save_manifest
+
+def register_demo(mcp: FastMCP):
+    @mcp.tool(title='演示')
+    async def demo_tool(count: int) -> dict:
+        """演示工具"""
+        return {"success": True, "result": count * 2}
+
+def test_manifest_round_trip(monkeypatch, tmp_path):
+    monkeypatch.setattr(lazy, 'MANIFEST_FILE', str(tmp_path / 'tool_manifest.json'))
+    monkeypatch.setattr(lazy, '_loaded', {})
+    source = FastMCP('test')
+    register_demo(source)
+    save_manifest(source)
+
+    mcp = FastMCP('test')
+    assert register_lazy_tools(mcp)
+    tool = mcp._tool_manager.get_tool('demo_tool')
+    assert isinstance(tool, LazyTool)
+    assert (tool.title, tool.description) == ('演示', '演示工具')
+    assert asyncio.run(tool.run({'count': 3})) == {"success": True, "result": 6}
+
+def test_falls_back_when_mcp_internals_differ(monkeypatch, tmp_path):
+    monkeypatch.setattr(lazy, 'MANIFEST_FILE', str(tmp_path / 'tool_manifest.json'))
+    source = FastMCP('test')
+    register_demo(source)
+    save_manifest(source)
+    monkeypatch.setattr(lazy, 'LAZY_FIELDS', lazy.LAZY_FIELDS + ('removed_field',))
+    mcp = FastMCP('test')
+    assert not register_lazy_tools(mcp)
+    assert mcp._tool_manager.list_tools() == []
+    # 不一致时也不再生成清单
+    os.remove(lazy.MANIFEST_FILE)
+    save_manifest(source)
+    assert not os.path.exists(lazy.MANIFEST_FILE)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from utils.railway import query_china_ticket
+from utils.railway.left_ticket import format_seats, has_ticket, SEATS, TRAIN_NUMBER, START_TIME
+from utils.railway.query_china_dates import summarize_trains
+
+def make_train(train_number: str, start_time: str = '08:00', **seats) -> list:
+    """按 12306 余票结果的字段位置构造一趟列车，未指定的座位为空"""
+    fields = [''] * 40
+    fields[TRAIN_NUMBER] = train_number
+    fields[START_TIME] = start_time
+    for name, value in seats.items():
+        fields[SEATS[name]] = value
+    return fields
+
+def test_high_speed_train_seats():
+    seats = format_seats(make_train('G101', 二等座='Yes', 一等座='No', 硬座='Yes'))
+    assert seats['二等座'] == '很多'
+    assert seats['一等座'] == '-'
+    # 动车组没有硬座，字段里即使有值也不显示
+    assert seats['硬座'] == '-'
+
+def test_d_and_c_trains_use_emu_seats():
+    d_train = make_train('D3101', 一等座='5', 二等座='No')
+    assert format_seats(d_train)['一等座'] == '5'
+    assert has_ticket(d_train)
+    c_train = make_train('C2001', 二等座='Yes')
+    assert format_seats(c_train)['二等座'] == '很多'
+    assert has_ticket(c_train)
+
+def test_sold_out_d_train_has_no_ticket():
+    assert not has_ticket(make_train('D3101', 一等座='No', 二等座='No', 商务座=''))
+
+def test_standing_tickets_count_for_all_train_types():
+    assert has_ticket(make_train('G101', 无座='12'))
+    assert has_ticket(make_train('K1234', 无座='Yes'))
+
+def test_conventional_train_seats():
+    k_train = make_train('K1234', 硬卧='Yes', 二等座='Yes')
+    seats = format_seats(k_train)
+    assert seats['硬卧'] == '很多'
+    assert seats['二等座'] == '-'
+    assert has_ticket(k_train)
+    assert not has_ticket(make_train('Z18', 硬座='No', 软卧=''))
+
+def test_date_summary_counts_d_trains():
+    summary = summarize_trains([
+        make_train('D3101', '07:30', 二等座='3'),
+        make_train('G101', '09:00', 二等座='No'),
+        make_train('K1234', '10:00', 硬座='Yes')
+    ])
+    assert summary['有票'] == 2
+    assert summary['最早有票'] == 'D3101 07:30'
+    assert summary['有票座位'] == {'二等座': 1, '硬座': 1}
+
+def test_only_available_keeps_d_and_c_trains_with_second_class(monkeypatch):
+    trains = [
+        make_train('D3101', '07:30', 二等座='有'),
+        make_train('C2001', '08:00', 二等座='5'),
+        make_train('G101', '09:00', 二等座='无', 一等座='无', 商务座='无'),
+    ]
+
+    async def load_station_index():
+        return {'北京': 'BJP', '天津': 'TJP'}, {}
+
+    async def query_station_pairs(train_date, from_stations, to_stations, codes):
+        return trains
+
+    monkeypatch.setattr(query_china_ticket, 'load_station_index', load_station_index)
+    monkeypatch.setattr(query_china_ticket, 'resolve_stations', lambda name: [name])
+    monkeypatch.setattr(query_china_ticket, 'query_station_pairs', query_station_pairs)
+    mcp = FastMCP('test')
+    query_china_ticket.query_china_train_info(mcp)
+    tool = mcp._tool_manager.get_tool('query_china_train_info')
+    result = asyncio.run(tool.run({'from_station': '北京', 'to_station': '天津', 'only_available': True}))
+    assert [(train['列表'], train['二等座']) for train in result] == [('D3101', '很多'), ('C2001', '5')]
\ No newline at end of file
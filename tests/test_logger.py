@@ -0,0 +1,22 @@
+import logging
+from handle import logger as log_setup
+from handle.logger import PayloadFilter
+
+def make_record(msg, *args, level=logging.INFO):
+    return logging.LogRecord('测试', level, __file__, 1, msg, args, None)
+
+def test_payload_filter_formats_lazy_arguments_once(monkeypatch):
+    monkeypatch.setattr(log_setup, 'MAX_LENGTH', 20)
+    record = make_record('返回数据：%s', {'a': 1})
+    assert PayloadFilter().filter(record)
+    assert (record.msg, record.args) == ("返回数据：{'a': 1}", None)
+
+def test_payload_filter_truncates_and_samples_long_payloads(monkeypatch):
+    monkeypatch.setattr(log_setup, 'MAX_LENGTH', 20)
+    monkeypatch.setattr(log_setup, 'SAMPLE_RATE', 1.0)
+    record = make_record('返回数据：%s', 'x' * 100)
+    assert PayloadFilter().filter(record)
+    assert record.msg.startswith('返回数据：' + 'x' * 15 + '...') and record.args is None
+    monkeypatch.setattr(log_setup, 'SAMPLE_RATE', 0.0)
+    assert not PayloadFilter().filter(make_record('返回数据：%s', 'x' * 100))
+    assert PayloadFilter().filter(make_record('返回数据：%s', 'x' * 100, level=logging.WARNING))
\ No newline at end of file
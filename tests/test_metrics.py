@@ -0,0 +1,17 @@
+import signal
+import uvicorn
+from services.metrics import create_app, create_server
+
+def test_metrics_server_keeps_main_signal_handlers():
+    def handler(sig, frame):
+        pass
+
+    original = signal.signal(signal.SIGINT, handler)
+    try:
+        server = create_server(uvicorn.Config(create_app(), lifespan='off'))
+        with server.capture_signals():
+            assert signal.getsignal(signal.SIGINT) is handler
+        server.install_signal_handlers()
+        assert signal.getsignal(signal.SIGINT) is handler
+    finally:
+        signal.signal(signal.SIGINT, original)
\ No newline at end of file
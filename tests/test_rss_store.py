@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+import threading
+from datetime import datetime
+from utils.rss import store
+
+@pytest.fixture
+def articles_db(tmp_path, monkeypatch):
+    """使用临时文章库"""
+    monkeypatch.setattr(store, 'DB_FILE', str(tmp_path / 'rss_articles.db'))
+    monkeypatch.setattr(store, '_conn', None)
+    yield store
+    if store._conn is not None:
+        store._conn.close()
+        store._conn = None
+
+def article(link: str, title: str, summary: str = '', source: str = '测试', day: int = 1) -> dict:
+    return {'link': link, 'source': source, 'title': title, 'summary': summary, 'published': datetime(2025, 1, day)}
+
+def links(result: list) -> list:
+    return sorted(item['link'] for item in result)
+
+def test_save_articles_dedupes_by_link(articles_db):
+    new = articles_db.save_articles([article('a', '第一篇'), article('b', '第二篇')])
+    assert links(new) == ['a', 'b']
+    new = articles_db.save_articles([article('a', '第一篇（更新）'), article('c', '第三篇', day=3)])
+    assert links(new) == ['c']
+    assert [item['title'] for item in articles_db.query_articles(latest=False)] == ['第一篇（更新）', '第二篇', '第三篇']
+
+def test_single_character_query(articles_db):
+    articles_db.save_articles([
+        article('a', '今天', '一只猫'),
+        article('b', '猫粮推荐'),
+        article('c', '小狗', '<p>狗狗</p>')
+    ])
+    # 字在一段文字的末尾、开头和中间都能找到
+    assert links(articles_db.search_articles('猫')) == ['a', 'b']
+    assert links(articles_db.search_articles('只')) == ['a']
+    assert links(articles_db.search_articles('犬')) == []
+
+def test_phrase_and_mixed_queries(articles_db):
+    articles_db.save_articles([
+        article('a', '大模型推理优化', 'Python 服务部署'),
+        article('b', '模型训练', '推理和优化分开讨论'),
+        article('c', 'GPU 选购', '')
+    ])
+    # 连续文字按子串匹配，不会匹配只是分散包含这些字的文章
+    assert links(articles_db.search_articles('推理优化')) == ['a']
+    assert links(articles_db.search_articles('python 部署')) == ['a']
+    assert links(articles_db.search_articles('gpu')) == ['c']
+    # 没有文章包含完整查询词时返回包含部分二元词的文章
+    assert links(articles_db.search_articles('推理加速')) == ['a', 'b']
+
+def test_search_filters_by_source(articles_db):
+    articles_db.save_articles([article('a', '猫', source='甲'), article('b', '猫', source='乙')])
+    assert links(articles_db.search_articles('猫', source='乙')) == ['b']
+
+def test_title_matches_rank_first(articles_db):
+    articles_db.save_articles([
+        article('summary', '今日见闻', '路上遇到一只橘猫在晒太阳，还有很多别的内容'),
+        article('title', '橘猫', '一些别的内容')
+    ])
+    assert [item['link'] for item in articles_db.search_articles('橘猫')] == ['title', 'summary']
+
+def test_updated_article_is_reindexed(articles_db):
+    articles_db.save_articles([article('a', '旧标题')])
+    articles_db.save_articles([article('a', '新标题')])
+    assert links(articles_db.search_articles('旧标')) == []
+    assert links(articles_db.search_articles('新标')) == ['a']
+
+def test_old_index_is_rebuilt(articles_db):
+    articles_db.save_articles([article('a', '今天', '一只猫')])
+    conn = articles_db.get_connection()
+    # 模拟旧版本只有二元词、没有前缀索引的全文索引
+    with conn:
+        conn.execute("DROP TABLE articles_search")
+        conn.execute("CREATE VIRTUAL TABLE articles_search USING fts5 (title, summary)")
+        conn.execute("INSERT INTO articles_search (rowid, title, summary) SELECT rowid, '今天', '一只 只猫' FROM articles")
+        conn.execute("PRAGMA user_version = 0")
+    conn.close()
+    articles_db._conn = None
+    assert links(articles_db.search_articles('猫')) == ['a']
+    sql = articles_db.get_connection().execute("SELECT sql FROM sqlite_master WHERE name = 'articles_search'").fetchone()[0]
+    assert "prefix = '1'" in sql
+def test_refresh_writes_articles_off_the_event_loop(articles_db, monkeypatch):
+    threads = []
+    save_articles = articles_db.save_articles
+
+    def record_thread(items):
+        threads.append(threading.current_thread())
+        return save_articles(items)
+
+    async def parse_rss_feeds(rss_list):
+        return [article('a', '第一篇')], None
+
+    monkeypatch.setattr(articles_db, 'parse_rss_feeds', parse_rss_feeds)
+    monkeypatch.setattr(articles_db, 'save_articles', record_thread)
+    monkeypatch.setattr(articles_db, '_last_refresh', 0)
+    new_items, error = asyncio.run(articles_db.refresh_articles())
+    assert (links(new_items), error) == (['a'], None)
+    assert threads and threads[0] is not threading.main_thread()
+def test_search_tool_rebuilds_index_off_the_event_loop(articles_db, monkeypatch):
+    from mcp.server.fastmcp import FastMCP
+    from utils.rss import search
+
+    articles_db.save_articles([article('a', '橘猫晒太阳')])
+    # 模拟切词版本变化：下次打开文章库时重建全文索引
+    articles_db._conn.execute("PRAGMA user_version = 0")
+    articles_db._conn.close()
+    articles_db._conn = None
+    threads = []
+    get_connection = articles_db.get_connection
+
+    def record_thread():
+        threads.append(threading.current_thread())
+        return get_connection()
+
+    async def ensure_fresh():
+        return None
+
+    monkeypatch.setattr(articles_db, 'get_connection', record_thread)
+    monkeypatch.setattr(search, 'ensure_fresh', ensure_fresh)
+    mcp = FastMCP('test')
+    search.search_rss_articles(mcp)
+    tool = mcp._tool_manager.get_tool('search_rss_articles')
+    result = asyncio.run(tool.run({'keyword': '橘猫'}))
+    assert [item['link'] for item in result['result']] == ['a']
+    assert threads and all(thread is not threading.main_thread() for thread in threads)
\ No newline at end of file
@@ -0,0 +1,25 @@
+import os
+import sys
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 启动时不应导入的模块：较慢的第三方库和只在功能启用或工具首次调用时才需要的模块
+DEFERRED_MODULES = (
+    'feedparser',
+    'utils.rss.store',
+    'utils.svn.store',
+    'utils.bilibili.history.store',
+    'utils.bilibili.live.danmu_stream'
+)
+
+def loaded_modules(statement: str) -> set:
+    """在新进程中执行导入语句，返回其中已导入的延迟模块"""
+    code = f"import sys\n{statement}\nprint('\\n'.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+def test_server_import_defers_optional_modules():
+    assert loaded_modules('import services.server') == set()
+
+def test_rss_store_import_defers_feedparser():
+    assert 'feedparser' not in loaded_modules('import utils.rss.store')
\ No newline at end of file
@@ -0,0 +1,38 @@
+import asyncio
+import logging
+import pytest
+from utils.railway import get_china_city, station_index
+
+STATIONS = [('bjp', '北京', 'BJP', 'beijing', 'bj', '0', '0357', '北京')]
+
+@pytest.fixture
+def dataset(monkeypatch, tmp_path):
+    for name in ('_index', '_stations', '_cities', '_meta'):
+        monkeypatch.setattr(station_index, name, getattr(station_index, name))
+    monkeypatch.setattr(station_index, 'DATA_FILE', str(tmp_path / 'station_data.bin'))
+    legacy_files = (tmp_path / 'city_data.json', tmp_path / 'station_index.bin')
+    monkeypatch.setattr(station_index, 'LEGACY_FILES', tuple(str(path) for path in legacy_files))
+    return legacy_files
+
+def test_save_removes_legacy_files(dataset):
+    for path in dataset:
+        path.write_text('{}')
+    station_index.save_dataset(STATIONS, {'version': '1'})
+    assert not any(path.exists() for path in dataset)
+    assert station_index.read_dataset()
+    assert station_index.resolve_stations('北京') == ['北京']
+
+def test_refresh_logs_failed_result(dataset, monkeypatch, caplog):
+    station_index.save_dataset(STATIONS, {'version': '1'})
+    checked_at = station_index._meta['checked_at']
+
+    async def get_china_city_data(current=None):
+        return {"success": False, "result": "请求失败: 超时"}
+
+    monkeypatch.setattr(get_china_city, 'get_china_city_data', get_china_city_data)
+    with caplog.at_level(logging.WARNING, logger='中国铁路'):
+        asyncio.run(station_index._refresh())
+    assert '后台更新车站数据失败: 请求失败: 超时' in caplog.text
+    # 继续使用当前数据，检查时间不变
+    assert station_index._meta['checked_at'] == checked_at
+    assert station_index.resolve_stations('北京') == ['北京']
\ No newline at end of file
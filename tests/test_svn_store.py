@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from utils.svn import store
+
+class FakeRepository:
+    """模拟 svn 命令：按版本号生成日志，记录执行过的命令"""
+
+    def __init__(self, uuid: str, head: int, author: str = 'alice'):
+        self.uuid = uuid
+        self.head = head
+        self.author = author
+        self.commands = []
+
+    async def svn(self, *args):
+        self.commands.append(args)
+        if args[0] == 'info':
+            return (
+                f'<?xml version="1.0"?><info><entry kind="dir" path="repo" revision="{self.head}">'
+                f'<repository><root>svn://example/repo</root><uuid>{self.uuid}</uuid></repository>'
+                f'<commit revision="{self.head}"><author>{self.author}</author></commit></entry></info>'
+            )
+        start, end = map(int, args[args.index('-r') + 1].split(':'))
+        entries = ''.join(
+            f'<logentry revision="{revision}"><author>{self.author}</author>'
+            f'<date>2025-01-{revision:02d}T08:00:00.000000Z</date>'
+            f'<paths><path action="M" kind="file">/trunk/src/file{revision}.py</path></paths>'
+            f'<msg>提交 {revision}</msg></logentry>'
+            for revision in range(start, end + 1)
+        )
+        return f'<?xml version="1.0"?><log>{entries}</log>'
+
+@pytest.fixture
+def log_db(tmp_path, monkeypatch):
+    """使用临时日志库和模拟仓库"""
+    monkeypatch.setattr(store, 'DB_FILE', str(tmp_path / 'svn_log.db'))
+    monkeypatch.setattr(store, '_conn', None)
+    monkeypatch.setattr(store, '_last_sync', 0)
+    monkeypatch.setitem(store.config, 'svn', {'repo_url': 'svn://example/repo', 'username': 'u', 'password': 'p'})
+    monkeypatch.setattr(store, 'SYNC_BATCH', 4)
+    repository = FakeRepository('uuid-1', 10)
+    monkeypatch.setattr(store, '_svn', repository.svn)
+    yield repository
+    if store._conn is not None:
+        store._conn.close()
+        store._conn = None
+
+def reopen():
+    """关闭日志库后重新打开，模拟服务重启"""
+    store._conn.close()
+    store._conn = None
+    store._last_sync = 0
+
+def test_sync_is_batched_and_incremental(log_db):
+    assert asyncio.run(store.sync_latest()) == 10
+    logs = [args for args in log_db.commands if args[0] == 'log']
+    assert [args[2] for args in logs] == ['1:4', '5:8', '9:10']
+    log_db.head = 12
+    log_db.commands.clear()
+    assert asyncio.run(store.sync_latest()) == 2
+    assert [args[2] for args in log_db.commands if args[0] == 'log'] == ['11:12']
+    assert [item['revision'] for item in store.query_revisions(1, 100)] == list(range(1, 13))
+
+def test_queries_by_author_date_and_path(log_db):
+    asyncio.run(store.sync_latest())
+    assert store.get_revision()['revision'] == 10
+    assert store.query_changed_paths(3) == [{'path': '/trunk/src/file3.py', 'action': 'M', 'kind': 'file'}]
+    assert [item['revision'] for item in store.search_revisions(author='alice', start='2025-01-03', end='2025-01-05')] == [4, 3]
+    assert [item['revision'] for item in store.search_revisions(path='/trunk/src/file7.py')] == [7]
+    assert store.search_revisions(author='bob') == []
+
+def test_repo_url_change_resets_mirror(log_db, monkeypatch):
+    asyncio.run(store.sync_latest())
+    reopen()
+    monkeypatch.setitem(store.config, 'svn', {'repo_url': 'svn://example/other', 'username': 'u', 'password': 'p'})
+    # 换了仓库地址后不再返回旧仓库的日志，并从第一个版本重新同步
+    assert store.get_synced_revision() == 0
+    assert store.get_revision() is None
+    other = FakeRepository('uuid-2', 3, author='bob')
+    monkeypatch.setattr(store, '_svn', other.svn)
+    assert asyncio.run(store.sync_latest()) == 3
+    assert [item['author'] for item in store.query_revisions(1, 10)] == ['bob'] * 3
+
+def test_same_url_new_repository_resets_mirror(log_db):
+    asyncio.run(store.sync_latest())
+    # 同一地址上的仓库被重建，UUID 变化
+    log_db.uuid = 'uuid-2'
+    log_db.head = 2
+    log_db.author = 'carol'
+    assert asyncio.run(store.sync_latest()) == 2
+    assert [item['author'] for item in store.query_revisions(1, 10)] == ['carol'] * 2
+    assert store.get_synced_revision() == 2
+
+def test_mirror_survives_restart_for_same_repository(log_db):
+    asyncio.run(store.sync_latest())
+    reopen()
+    assert store.get_synced_revision() == 10
+    log_db.commands.clear()
+    assert asyncio.run(store.sync_latest()) == 0
+    assert [args[0] for args in log_db.commands] == ['info']
+
+def test_ensure_log_serves_mirror_when_sync_fails(log_db, monkeypatch):
+    asyncio.run(store.sync_latest())
+
+    async def offline(*args):
+        raise OSError('网络不可用')
+
+    monkeypatch.setattr(store, '_svn', offline)
+    assert asyncio.run(store.ensure_log(force=True)) is None
+    assert store.get_revision(5)['revision'] == 5
\ No newline at end of file
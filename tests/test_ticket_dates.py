@@ -0,0 +1,43 @@
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from utils.railway import query_china_dates, left_ticket
+from utils.railway.query_china_dates import limit_requests
+
+BEIJING = ['北京', '北京南', '北京西', '北京北', '北京朝阳']
+SHANGHAI = ['上海', '上海虹桥', '上海南', '上海西', '上海松江']
+
+def test_limit_keeps_requests_within_cap(monkeypatch):
+    monkeypatch.setattr(query_china_dates, 'MAX_REQUESTS', 30)
+    from_stations, to_stations, dates = limit_requests(BEIJING, SHANGHAI, list(range(7)))
+    # 优先保留排在前面的主要车站
+    assert (from_stations, to_stations, len(dates)) == (BEIJING[:2], SHANGHAI[:2], 7)
+    from_stations, to_stations, dates = limit_requests(BEIJING, SHANGHAI, list(range(15)))
+    assert len(from_stations) * len(to_stations) * len(dates) <= 30
+    assert len(dates) == 15
+    assert limit_requests(['北京'], ['上海'], list(range(3))) == (['北京'], ['上海'], [0, 1, 2])
+
+def test_limit_shortens_dates_when_one_pair_exceeds_cap(monkeypatch):
+    monkeypatch.setattr(query_china_dates, 'MAX_REQUESTS', 10)
+    assert limit_requests(BEIJING, SHANGHAI, list(range(15))) == (['北京'], ['上海'], list(range(10)))
+
+def test_tool_sends_at_most_max_requests(monkeypatch):
+    monkeypatch.setattr(query_china_dates, 'MAX_REQUESTS', 30)
+    codes = {name: f'C{index:02d}' for index, name in enumerate(BEIJING + SHANGHAI)}
+    requests = []
+
+    async def load_station_index():
+        return codes, None
+
+    async def query_left_ticket(train_date, from_station, from_code, to_station, to_code):
+        requests.append((train_date, from_station, to_station))
+        return []
+
+    monkeypatch.setattr(query_china_dates, 'load_station_index', load_station_index)
+    monkeypatch.setattr(query_china_dates, 'resolve_stations', lambda name: BEIJING if name == '北京' else SHANGHAI)
+    monkeypatch.setattr(left_ticket, 'query_left_ticket', query_left_ticket)
+    mcp = FastMCP('test')
+    query_china_dates.query_china_ticket_dates(mcp)
+    tool = mcp._tool_manager.get_tool('query_china_ticket_dates')
+    summary = asyncio.run(tool.run({'from_station': '北京', 'to_station': '上海', 'days': 15}))
+    assert len(summary) == 15
+    assert 0 < len(requests) <= 30
\ No newline at end of file
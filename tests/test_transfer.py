@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from mcp.server.fastmcp import FastMCP
+from utils.railway import left_ticket, query_china_transfer, station_index
+from utils.railway.left_ticket import TRAIN_NUMBER, FROM_STATION, TO_STATION, START_TIME, DURATION, SEATS
+
+# 车站记录中用到的字段：1 站名、2 电报码、7 城市
+STATIONS = [
+    ('', name, code, '', '', '', '', city)
+    for name, code, city in (
+        ('北京', 'BJP', '北京'), ('北京南', 'VNP', '北京'), ('北京西', 'BXP', '北京'),
+        ('郑州', 'ZZF', '郑州'), ('郑州东', 'ZAF', '郑州'),
+        ('武汉', 'WHN', '武汉'), ('广州南', 'IZQ', '广州'), ('广州', 'GZQ', '广州')
+    )
+]
+
+def make_train(train_number: str, from_code: str, to_code: str, start_time: str, duration: str) -> list:
+    fields = [''] * 40
+    fields[TRAIN_NUMBER] = train_number
+    fields[FROM_STATION], fields[TO_STATION] = from_code, to_code
+    fields[START_TIME], fields[DURATION] = start_time, duration
+    fields[SEATS['二等座']] = '有'
+    return fields
+
+@pytest.fixture
+def railway(monkeypatch):
+    """使用测试车站数据，余票查询按区间返回一趟列车并记录请求"""
+    index = station_index.build_index(STATIONS)
+    monkeypatch.setattr(station_index, '_index', index)
+    monkeypatch.setattr(station_index, '_cities', station_index.build_cities(STATIONS))
+    monkeypatch.setattr(query_china_transfer, 'HUBS', ['北京', '郑州', '武汉'])
+    requests = []
+
+    async def load_station_index():
+        return index
+
+    async def query_left_ticket(train_date, from_station, from_code, to_station, to_code):
+        requests.append((from_station, to_station))
+        start = '08:00' if from_station.startswith('北京') else '12:00'
+        return [make_train(f'G{len(requests)}', from_code, to_code, start, '03:00')]
+
+    monkeypatch.setattr(query_china_transfer, 'load_station_index', load_station_index)
+    monkeypatch.setattr(left_ticket, 'query_left_ticket', query_left_ticket)
+    return requests
+
+def query(**args) -> list:
+    mcp = FastMCP('test')
+    query_china_transfer.query_china_transfer_info(mcp)
+    tool = mcp._tool_manager.get_tool('query_china_transfer_info')
+    return asyncio.run(tool.run({'train_date': '2026-10-20', **args}))
+
+def test_city_names_with_suffix_are_resolved(railway):
+    result = query(from_station='北京市', to_station='广州市')
+    assert result[0]['第一程']['出发站'] == '北京'
+    assert result[0]['第二程']['到达站'] == '广州'
+    # 与出发城市相同的枢纽不查询
+    assert ('北京', '北京') not in railway
+    assert {pair for pair in railway} == {('北京', '郑州'), ('郑州', '广州'), ('北京', '武汉'), ('武汉', '广州')}
+
+def test_via_station_accepts_station_name(railway):
+    result = query(from_station='北京', to_station='广州', via_station='郑州东')
+    assert {item['中转站'] for item in result} == {'郑州东'}
+    assert railway == [('北京', '郑州东'), ('郑州东', '广州')]
+
+def test_stations_per_city_limits_leg_requests(railway, monkeypatch):
+    monkeypatch.setattr(query_china_transfer, 'STATIONS_PER_CITY', 2)
+    query(from_station='北京', to_station='广州', via_station='郑州')
+    assert sorted(railway) == sorted([
+        ('北京', '郑州'), ('北京', '郑州东'), ('北京南', '郑州'), ('北京南', '郑州东'),
+        ('郑州', '广州'), ('郑州', '广州南'), ('郑州东', '广州'), ('郑州东', '广州南')
+    ])
+
+def test_unknown_city(railway):
+    assert query(from_station='大理', to_station='广州') == ["错误：未找到出发城市 '大理' 的代码"]
\ No newline at end of file
@@ -0,0 +1,30 @@
+import asyncio
+import threading
+from mcp.server.fastmcp import FastMCP
+from utils import web_content
+
+class FakeResponse:
+    text = '<html><head><script>var a = "<body>";</script></head><body>\n<h1>标题</h1>\n<!-- 注释 -->\n<p>正文 内容</p>\n</body></html>'
+
+    def raise_for_status(self):
+        pass
+
+def test_page_is_parsed_off_the_event_loop(monkeypatch):
+    threads = []
+    extract_text = web_content.extract_text
+
+    def record_thread(response):
+        threads.append(threading.current_thread())
+        return extract_text(response)
+
+    async def http_get(url, **kwargs):
+        return FakeResponse()
+
+    monkeypatch.setattr(web_content, 'http_get', http_get)
+    monkeypatch.setattr(web_content, 'extract_text', record_thread)
+    mcp = FastMCP('test')
+    web_content.get_web_content(mcp)
+    tool = mcp._tool_manager.get_tool('get_web_content')
+    result = asyncio.run(tool.run({'url': 'https://example.com/'}))
+    assert result == {'success': True, 'result': '标题\n正文 内容'}
+    assert threads and threads[0] is not threading.main_thread()
\ No newline at end of file
@@ -1,14 +1,16 @@
 import logging
-import requests
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('B站追番查询')
 
 def get_bilibili_chasing_fan(mcp: FastMCP):
     """查询追番信息"""
     @mcp.tool()
-    def get_bilibili_chasing_fan(sort_by: str = "") -> dict:
+    @cached
+    async def get_bilibili_chasing_fan(sort_by: str = "") -> dict:
         """用于查询B站追番信息
             该工具返回的是视频ID，不是视频链接。
             番视频的拼接地址：https://www.bilibili.com/bangumi/play/ss
@@ -35,7 +37,7 @@ def get_bilibili_chasing_fan(mcp: FastMCP):
         }
         try:
             logger.info("开始查询B站追番信息...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await http_get(url, params=params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data["code"] == 0:
@@ -66,11 +68,11 @@ def get_bilibili_chasing_fan(mcp: FastMCP):
                 else:
                     import random
                     result = [random.choice(result)] if result else []
-                logger.info(f"成功获取B站追番信息: {result}")
+                logger.info("成功获取B站追番信息: %s", result)
                 return {"success": True, "result": result}
             else:
                 logger.error(f"获取失败状态码：{data['code']}")
                 return {"success": False, "result": f"获取追番信息失败，状态码: {data['code']}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
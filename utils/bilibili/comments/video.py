@@ -1,16 +1,16 @@
 import re
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
-from utils.bilibili.wbi_signed import get_wbi_signed
+from utils.http_client import HTTP_ERRORS
+from utils.bilibili.wbi_signed import wbi_get
 
 logger = logging.getLogger('B站视频评论')
 
 def get_bilibili_video_comments(mcp: FastMCP):
     """获取视频评论"""
     @mcp.tool()
-    def get_bilibili_video_comments(aid: int, next_offset: str = '', mode: int = 3) -> dict:
+    async def get_bilibili_video_comments(aid: int, next_offset: str = '', mode: int = 3) -> dict:
         """用于获取B站视频评论信息，调用该工具即可获取该视频的评论信息。
         当查询B站视频评论时，立刻调用该工具。
         需要询问用什么排序模式。
@@ -52,7 +52,6 @@ def get_bilibili_video_comments(mcp: FastMCP):
             logger.error(f"视频aid必须是数字，当前值: {aid}")
             return {"success": False, "result": "视频aid必须是数字"}
         config = load_config()
-        signed = get_wbi_signed()
         url = "https://api.bilibili.com/x/v2/reply/wbi/main"
         params = {
             "oid": aid,
@@ -60,9 +59,7 @@ def get_bilibili_video_comments(mcp: FastMCP):
             "mode": mode,
             "pagination_str": "{\"offset\":\"" + (next_offset if next_offset else "") + "\"}",
             "plat": 1,
-            "web_location": 1315875, # 表示评论区
-            "w_rid": signed['w_rid'],
-            "wts": signed['wts']
+            "web_location": 1315875 # 表示评论区
         }
         if not next_offset:
             params["seek_rpid"] = ""
@@ -71,7 +68,7 @@ def get_bilibili_video_comments(mcp: FastMCP):
         }
         try:
             logger.info(f"开始获取视频 {aid} 的评论信息...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await wbi_get(url, params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data["code"] == 0:
@@ -101,11 +98,11 @@ def get_bilibili_video_comments(mcp: FastMCP):
                     } for reply in data["data"].get("replies", [])]
                 }
                 logger.info(f"成功获取视频 {aid} 的评论信息")
-                logger.info(f"获取到的评论信息: {result}")
+                logger.info("获取到的评论信息: %s", result)
                 return {"success": True, "result": result}
             else:
                 logger.error(f"获取失败状态码：{data['code']}")
                 return {"success": False, "result": f"获取评论失败，状态码: {data['code']}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
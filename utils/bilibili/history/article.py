@@ -1,20 +1,24 @@
 import logging
-import requests
 from datetime import datetime
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.bilibili.history.store import sync_history, query_history, is_covered
 
 logger = logging.getLogger('获取B站历史专栏')
 
 config = load_config()
 
+# 历史记录中属于专栏的业务类型
+BUSINESSES = ('article', 'article-list')
+
 def get_bilibili_history_article(mcp: FastMCP):
     """查询B站历史专栏"""
     @mcp.tool()
-    def get_bilibili_history_article(view_at_timestamp: int = int(datetime.now().timestamp())) -> dict:
+    async def get_bilibili_history_article(view_at_timestamp: int = 0, author_mid: int = 0) -> dict:
         """用于查询B站历史专栏，调用该工具即可获取历史专栏信息。
         Args:
-            view_at_timestamp (int): 查询专栏的时间戳，默认为当前时间戳，即查询今天的专栏。
+            view_at_timestamp (int): 查询专栏的时间戳，默认为 0 表示当前时间，即查询今天的专栏。
+            author_mid (int): 只查询该作者的专栏，默认为 0 表示不限制作者。
         Returns:
             dict: 返回包含success和result字段的字典，其中result中的original_result列表里每个元素为包含以下信息的字典：
                 - "oid": 专栏的唯一标识符
@@ -26,56 +30,47 @@ def get_bilibili_history_article(mcp: FastMCP):
         if 'bilibili_api' not in config or 'auth' not in config['bilibili_api'] or 'cookie' not in config['bilibili_api']['auth']:
             logger.error("配置文件中没有找到B站cookie")
             return {"success": False, "result": "配置文件中没有找到B站cookie"}
-        url = "https://api.bilibili.com/x/web-interface/history/cursor"
-        params = {
-            "max": 0,  # 历史记录的最大时间戳，0 表示从最新记录开始查询
-            "view_at": view_at_timestamp,  # 查询专栏的时间戳，默认为当前时间戳，即查询今天的专栏
-            "business": "",  # 业务类型，空字符串表示查询所有业务类型的历史记录
-            "ps": config['bilibili_api']['history']['ps'],  # 获取每页返回的历史记录数量
-            "type": "article",  # 查询的历史记录类型，指定为专栏类型
-            "web_location": str(config['bilibili_api']['recommended']['web_location'])  # 网页位置标识符，用于标识查询的来源位置
-        }
-        headers = {
-            "User-Agent": config['http_headers']['user_agent'],
-            "Cookie": config['bilibili_api']['auth']['cookie']
+        # 默认值在每次调用时取当前时间，工具宿主长期运行时也不会停留在启动的那一天
+        if not view_at_timestamp:
+            view_at_timestamp = int(datetime.now().timestamp())
+        # 先同步最新记录，查询的日期早于本地已同步的范围时再补齐更早的记录
+        day = datetime.fromtimestamp(view_at_timestamp).date()
+        day_start = int(datetime.combine(day, datetime.min.time()).timestamp())
+        logger.info("开始查询B站历史专栏...")
+        error = await sync_history(day_start)
+        rows = query_history(BUSINESSES, day_start, day_start + 86400, author_mid)
+        if not rows:
+            if error:
+                logger.error(f"请求失败: {error}")
+                return {"success": False, "result": f"请求失败: {error}"}
+            logger.error("未获取到历史专栏数据")
+            return {"success": False, "result": "未获取到历史专栏数据"}
+        result = [
+            {
+                "oid": row["oid"],
+                "title": row["title"],
+                "author_mid": row["author_mid"],
+                "badge": row["badge"],
+                "view_at": row["view_at"]
+            }
+            for row in rows
+        ]
+        len_result = len(result)
+        logger.info(f"成功获取B站历史专栏，共获取到 {len_result} 条专栏")
+        # 判断是否查询今天以外的数据
+        today = datetime.now().date()
+        today_timestamp = int(datetime.combine(today, datetime.min.time()).timestamp())
+        if view_at_timestamp < today_timestamp:
+            result = result[-5:]  # 取后 5 条数据
+        else:
+            result = result[:5]  # 取前 5 条数据
+        result = {
+            "success": True,
+            "result": {
+                "original_result": result,
+                # 本地记录还没有同步到当天开始时，实际数量可能更多
+                "result_length": f"一共看了 {'' if is_covered(day_start) else '超过 '}{len_result} 条专栏"
+            }
         }
-        try:
-            logger.info("开始查询B站历史专栏...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("code") == 0 and data.get("data") and data["data"].get("list"):
-                result = []
-                for item in data["data"]["list"]:
-                    article_info = {
-                        "oid": item["history"]["oid"],
-                        "title": item["title"],
-                        "author_mid": item["author_mid"],
-                        "badge": item["badge"],
-                        "view_at": item["view_at"]
-                    }
-                    result.append(article_info)
-                len_result = len(result)
-                logger.info(f"成功获取B站历史专栏，共获取到 {len_result} 条专栏")
-                # 判断是否查询今天以外的数据
-                today = datetime.now().date()
-                today_timestamp = int(datetime.combine(today, datetime.min.time()).timestamp())
-                if view_at_timestamp < today_timestamp:
-                    result = result[-5:]  # 取后 5 条数据
-                else:
-                    result = result[:5]  # 取前 5 条数据
-                result = {
-                    "success": True,
-                    "result": {
-                        "original_result": result,
-                        "result_length": f"一共看了 {'超过 ' if len_result > 20 else ''}{len_result} 条专栏"
-                    }
-                }
-                logger.info(f"返回数据：{result}")
-                return result
-            else:
-                logger.error("未获取到历史专栏数据")
-                return {"success": False, "result": "未获取到历史专栏数据"}
-        except requests.exceptions.RequestException as e:
-            logger.error(f"请求失败: {e}")
-            return {"success": False, "result": f"请求失败: {e}"}
\ No newline at end of file
+        logger.info("返回数据：%s", result)
+        return result
\ No newline at end of file
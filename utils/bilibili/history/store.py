@@ -0,0 +1,269 @@
+import os
+import re
+import time
+import asyncio
+import sqlite3
+import logging
+from config.loader import load_config
+from utils.http_client import http_get, HTTP_ERRORS
+
+logger = logging.getLogger('B站历史记录库')
+
+config = load_config()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# 本地历史记录库
+DB_FILE = os.path.join(BASE_DIR, 'tmp', 'bilibili_history.db')
+HISTORY_URL = "https://api.bilibili.com/x/web-interface/history/cursor"
+# 从配置获取历史记录同步设置
+STORE_CONFIG = config['bilibili_api']['history'].get('store', {}) or {}
+SYNC_ENABLED = STORE_CONFIG.get('enabled', False)
+SYNC_INTERVAL = STORE_CONFIG.get('sync_interval', 300)
+CATCHUP_PAGES = STORE_CONFIG.get('catchup_pages', 5)
+# 同步最新记录时最多翻页数，避免长时间未同步时一次请求过多
+MAX_HEAD_PAGES = 50
+
+COLUMNS = (
+    'business', 'oid', 'bvid', 'title', 'author_name', 'author_mid', 'tag_name',
+    'live_status', 'badge', 'is_finish', 'duration', 'view_at'
+)
+
+_conn = None
+_sync_lock = asyncio.Lock()
+# 上次同步最新记录的时间
+_last_sync = 0
+# 后台同步任务
+_task = None
+
+def get_connection() -> sqlite3.Connection:
+    """打开历史记录库，首次使用时建表和索引"""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+        _conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS history (
+                business TEXT NOT NULL,
+                oid INTEGER NOT NULL,
+                bvid TEXT,
+                title TEXT,
+                author_name TEXT,
+                author_mid INTEGER,
+                tag_name TEXT,
+                live_status INTEGER,
+                badge TEXT,
+                is_finish INTEGER,
+                duration INTEGER,
+                view_at INTEGER NOT NULL,
+                PRIMARY KEY (business, oid)
+            );
+            CREATE INDEX IF NOT EXISTS idx_history_business ON history (business, view_at);
+            CREATE INDEX IF NOT EXISTS idx_history_view_at ON history (view_at);
+            CREATE INDEX IF NOT EXISTS idx_history_author ON history (author_mid, view_at);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                name TEXT PRIMARY KEY,
+                value
+            );
+        """)
+        # 历史记录库只对应一个账号，cookie 换了账号（或旧版本没有记录账号）时清空后重新同步
+        mid = get_account_mid()
+        if _get_state('mid', None) != mid:
+            _reset(mid)
+    return _conn
+
+def get_account_mid() -> str:
+    """从 cookie 的 DedeUserID 中读取当前登录账号的 mid，没有时返回空字符串"""
+    cookie = config['bilibili_api'].get('auth', {}).get('cookie') or ''
+    match = re.search(r'(?:^|;)\s*DedeUserID=(\d+)', cookie)
+    return match.group(1) if match else ''
+
+def _get_state(name: str, default: int = 0) -> int:
+    row = get_connection().execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+    return row['value'] if row else default
+
+def _set_state(**values):
+    conn = get_connection()
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", values.items())
+
+def _reset(mid: str):
+    """清空历史记录库并记录新的账号，之后从最新记录重新同步"""
+    global _last_sync
+    conn = get_connection()
+    if conn.execute("SELECT 1 FROM history LIMIT 1").fetchone():
+        logger.warning(f"B站账号已变为 {mid or '未知账号'}，清空历史记录库后重新同步")
+    with conn:
+        conn.execute("DELETE FROM history")
+        conn.execute("DELETE FROM sync_state")
+    _set_state(mid=mid)
+    _last_sync = 0
+
+def save_items(items: list) -> int:
+    """写入一页历史记录，同一内容再次观看时更新为最新的观看时间"""
+    rows = [
+        (
+            item['history']['business'],
+            item['history']['oid'],
+            item['history'].get('bvid'),
+            item.get('title'),
+            item.get('author_name'),
+            item.get('author_mid'),
+            item.get('tag_name'),
+            item.get('live_status'),
+            item.get('badge'),
+            1 if item.get('is_finish') else 0,
+            item.get('duration'),
+            item['view_at']
+        )
+        for item in items
+    ]
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO history ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            rows
+        )
+    return len(rows)
+
+def query_history(businesses: tuple, start: int, end: int, author_mid: int = 0) -> list:
+    """按业务类型、观看时间和作者查询历史记录，按观看时间从新到旧排列"""
+    sql = f"SELECT * FROM history WHERE business IN ({', '.join('?' * len(businesses))}) AND view_at >= ? AND view_at < ?"
+    params = [*businesses, start, end]
+    if author_mid:
+        sql += " AND author_mid = ?"
+        params.append(author_mid)
+    cursor = get_connection().execute(sql + " ORDER BY view_at DESC", params)
+    return [dict(row) for row in cursor]
+
+def is_covered(timestamp: int) -> bool:
+    """本地记录是否已连续同步到指定时间，complete 只在补齐任务翻到最后一页后设置"""
+    return bool(_get_state('complete')) or (_get_state('covered_from') or float('inf')) <= timestamp
+
+async def _fetch_page(max_id: int = 0, view_at: int = 0, business: str = '') -> tuple:
+    """获取一页历史记录，返回记录列表和下一页游标"""
+    params = {
+        "max": max_id,  # 上一页最后一条记录的ID，0 表示从最新记录开始查询
+        "view_at": view_at,  # 上一页最后一条记录的观看时间
+        "business": business,  # 上一页最后一条记录的业务类型
+        "ps": config['bilibili_api']['history']['ps'],  # 获取每页返回的记录数量
+        "type": "all",  # 一次同步所有业务类型，由查询时再按类型筛选
+        "web_location": str(config['bilibili_api']['recommended']['web_location'])
+    }
+    headers = {
+        "User-Agent": config['http_headers']['user_agent'],
+        "Cookie": config['bilibili_api']['auth']['cookie']
+    }
+    response = await http_get(HISTORY_URL, params=params, headers=headers, timeout=5)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("code") != 0:
+        raise RuntimeError(f"获取历史记录失败: {data.get('message')}")
+    return data["data"].get("list") or [], data["data"].get("cursor") or {}
+
+def _save_cursor(cursor: dict, items: list, restart: bool = False):
+    """记录补齐更早记录时下一页的游标，restart 为 True 时从这一页重新开始补齐"""
+    state = {
+        'cursor_max': cursor.get('max', 0),
+        'cursor_view_at': cursor.get('view_at', 0),
+        'cursor_business': cursor.get('business', ''),
+        'covered_from': min(item['view_at'] for item in items)
+    }
+    if restart:
+        state['complete'] = 0
+    _set_state(**state)
+
+async def sync_latest() -> int:
+    """从最新记录开始翻页，直到遇到已保存的记录为止，返回新增记录数"""
+    global _last_sync
+    newest = get_connection().execute("SELECT MAX(view_at) FROM history").fetchone()[0]
+    cursor = {}
+    count = 0
+    for _ in range(MAX_HEAD_PAGES):
+        items, cursor = await _fetch_page(cursor.get('max', 0), cursor.get('view_at', 0), cursor.get('business', ''))
+        if not items:
+            # 没有记录或已翻到最后一页，不代表更早的记录已补齐
+            break
+        count += save_items(items)
+        if newest is None:
+            # 首次同步只取一页，更早的记录交给补齐任务
+            _save_cursor(cursor, items, restart=True)
+            break
+        if items[-1]['view_at'] <= newest:
+            break
+    else:
+        # 与已保存的记录之间可能有缺口，从这里重新补齐更早的记录（已有的记录会被覆盖写入）
+        logger.warning(f"最新记录超过 {MAX_HEAD_PAGES} 页，从第 {MAX_HEAD_PAGES} 页重新补齐更早的记录")
+        _save_cursor(cursor, items, restart=True)
+    _last_sync = time.monotonic()
+    return count
+
+async def sync_older(pages: int = CATCHUP_PAGES, until: int = 0) -> int:
+    """从上次停下的位置继续补齐更早的记录，补到指定时间或翻满页数为止，返回写入记录数"""
+    count = 0
+    for _ in range(pages):
+        # 首次同步最新记录后才有补齐游标
+        if is_covered(until) or not _get_state('covered_from'):
+            break
+        items, cursor = await _fetch_page(
+            _get_state('cursor_max'), _get_state('cursor_view_at'), _get_state('cursor_business', '')
+        )
+        if not items:
+            _set_state(complete=1)
+            logger.info("历史记录已全部同步到本地")
+            break
+        count += save_items(items)
+        _save_cursor(cursor, items)
+    return count
+
+async def sync_history(since: int = 0) -> str:
+    """查询前同步历史记录：距上次同步超过间隔时先同步最新记录，再按需补齐到 since，失败时返回错误信息"""
+    if not config['bilibili_api'].get('auth', {}).get('cookie'):
+        return "配置文件中没有找到B站cookie"
+    try:
+        async with _sync_lock:
+            if not _last_sync or time.monotonic() - _last_sync > SYNC_INTERVAL:
+                count = await sync_latest()
+                logger.info(f"同步最新历史记录 {count} 条")
+            if since and not is_covered(since):
+                count = await sync_older(CATCHUP_PAGES, since)
+                logger.info(f"补齐更早的历史记录 {count} 条")
+    except (*HTTP_ERRORS, RuntimeError, KeyError) as e:
+        logger.warning(f"同步历史记录失败: {e}")
+        return str(e)
+    return None
+
+async def _sync_loop():
+    """后台定时同步最新记录，并逐步补齐更早的记录"""
+    while True:
+        try:
+            async with _sync_lock:
+                count = await sync_latest()
+                count += await sync_older()
+            if count:
+                logger.info(f"后台同步历史记录 {count} 条")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"后台同步历史记录失败: {e}")
+        await asyncio.sleep(SYNC_INTERVAL)
+
+def ensure_history_sync() -> bool:
+    """启用后台同步且配置了cookie时，确保后台同步任务在运行"""
+    global _task
+    if not SYNC_ENABLED or not config['bilibili_api'].get('auth', {}).get('cookie'):
+        return False
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_sync_loop())
+    return True
+
+async def stop_history_sync():
+    """停止后台同步任务并关闭历史记录库"""
+    global _task, _conn
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+    if _conn is not None:
+        _conn.close()
+        _conn = None
\ No newline at end of file
@@ -1,9 +1,10 @@
 import logging
-import requests
 from datetime import datetime
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
-from utils.bilibili.wbi_signed import get_wbi_signed
+from utils.http_client import HTTP_ERRORS
+from utils.bilibili.wbi_signed import wbi_get
 
 config = load_config()
 logger = logging.getLogger('B站热门视频')
@@ -11,7 +12,8 @@ logger = logging.getLogger('B站热门视频')
 def get_bilibili_popular_videos(mcp: FastMCP):
     """热门视频查询"""
     @mcp.tool()
-    def get_bilibili_popular_videos(pn: int = config['bilibili_api']['hot_videos']['pn']) -> dict:
+    @cached
+    async def get_bilibili_popular_videos(pn: int = config['bilibili_api']['hot_videos']['pn']) -> dict:
         """用于查询B站热门视频信息
             该工具的主要功能是获取B站的热门视频信息，包括aid、标题等。
         Args:
@@ -42,20 +44,17 @@ def get_bilibili_popular_videos(mcp: FastMCP):
         """
         logger.info(f"开始查询B站热门视频信息，页码为{pn}")
         config = load_config()
-        signed = get_wbi_signed()
         url = "https://api.bilibili.com/x/web-interface/popular"
         params = {
             "pn": pn,
-            "ps": config['bilibili_api']['hot_videos']['ps'],
-            "w_rid": signed['w_rid'],
-            "wts": signed['wts']
+            "ps": config['bilibili_api']['hot_videos']['ps']
         }
         headers = {
             "User-Agent": config['http_headers']['user_agent']
         }
         try:
             logger.info("开始查询B站热门视频信息...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await wbi_get(url, params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data["code"] == 0:
@@ -88,12 +87,13 @@ def get_bilibili_popular_videos(mcp: FastMCP):
                         "present": f"当前页码：{pn}"
                     }
                 }
-                log_result_str = str(result).replace('\n', '')
-                logger.info(f"返回数据：{log_result_str}")
+                # 拼接日志内容的开销较大，未输出 INFO 日志时跳过
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("返回数据：%s", str(result).replace('\n', ''))
                 return {"success": True, "list": result}
             else:
                 logger.error(f"获取失败状态码：{data['code']}")
                 return {"success": False, "result": f"获取热门视频信息失败，状态码: {data['code']}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
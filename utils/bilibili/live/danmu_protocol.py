@@ -0,0 +1,75 @@
+import json
+import time
+import zlib
+import struct
+
+# 数据包头：总长度、头部长度、协议版本、操作码、序号
+HEADER = struct.Struct('>IHHII')
+
+# 协议版本
+PROTO_JSON = 0  # 普通 JSON
+PROTO_HEARTBEAT = 1  # 人气值
+PROTO_ZLIB = 2  # zlib 压缩的多个数据包
+
+# 操作码
+OP_HEARTBEAT = 2
+OP_HEARTBEAT_REPLY = 3
+OP_MESSAGE = 5
+OP_AUTH = 7
+OP_AUTH_REPLY = 8
+
+def pack(op: int, body) -> bytes:
+    """打包发送给弹幕服务器的数据包"""
+    if isinstance(body, dict):
+        body = json.dumps(body, separators=(',', ':')).encode('utf-8')
+    elif isinstance(body, str):
+        body = body.encode('utf-8')
+    return HEADER.pack(HEADER.size + len(body), HEADER.size, PROTO_HEARTBEAT, op, 1) + body
+
+def unpack(data: bytes) -> list:
+    """拆分一帧中的所有数据包，压缩的数据包解压后继续拆分，返回 [(操作码, 数据)]"""
+    packets = []
+    offset = 0
+    while offset + HEADER.size <= len(data):
+        total, header_size, proto, op, _ = HEADER.unpack_from(data, offset)
+        if total < header_size:
+            break
+        body = data[offset + header_size:offset + total]
+        if op == OP_MESSAGE and proto == PROTO_ZLIB:
+            packets.extend(unpack(zlib.decompress(body)))
+        else:
+            packets.append((op, body))
+        offset += total
+    return packets
+
+def parse_command(body: bytes):
+    """解析消息数据包中的命令，无法解析时返回 None"""
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+def parse_danmu(command: dict):
+    """从 DANMU_MSG 命令中取出弹幕信息，其他命令返回 None"""
+    if not isinstance(command, dict) or not str(command.get('cmd', '')).startswith('DANMU_MSG'):
+        return None
+    info = command.get('info') or []
+    try:
+        meta, text, user = info[0], info[1], info[2]
+    except (IndexError, TypeError):
+        return None
+    medal = info[3] if len(info) > 3 and info[3] else []
+    title = info[5] if len(info) > 5 and info[5] else []
+    return {
+        'text': text,
+        'dm_type': meta[12] if len(meta) > 12 else 0,
+        'uid': user[0],
+        'nickname': user[1],
+        'uname_color': user[7] if len(user) > 7 else '',
+        'timeline': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta[4] / 1000)) if len(meta) > 4 and meta[4] else '',
+        'isadmin': user[2] if len(user) > 2 else 0,
+        'vip': user[3] if len(user) > 3 else 0,
+        'svip': user[4] if len(user) > 4 else 0,
+        'medal': {'level': medal[0], 'name': medal[1], 'anchor': medal[2]} if len(medal) > 2 else {},
+        'title': title[0] if title else ''
+    }
\ No newline at end of file
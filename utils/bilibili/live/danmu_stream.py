@@ -0,0 +1,197 @@
+import time
+import asyncio
+import logging
+import aiohttp
+from collections import deque
+from config.loader import load_config
+from utils.bilibili.wbi_signed import wbi_get
+from utils.http_client import get_session, http_get
+from utils.bilibili.live.danmu_protocol import pack, unpack, parse_command, parse_danmu
+from utils.bilibili.live.danmu_protocol import OP_AUTH, OP_AUTH_REPLY, OP_HEARTBEAT, OP_MESSAGE
+
+logger = logging.getLogger('B站直播弹幕流')
+
+config = load_config()
+
+# 从配置获取弹幕流设置
+STREAM_CONFIG = config['bilibili_api']['live'].get('stream', {}) or {}
+STREAM_ENABLED = STREAM_CONFIG.get('enabled', False)
+BUFFER_SIZE = STREAM_CONFIG.get('buffer_size', 500)
+# 同时订阅的直播间数量上限，超出时停止最久没有查询的直播间，0 表示不限制
+MAX_ROOMS = STREAM_CONFIG.get('max_rooms', 5)
+# 直播间超过该时间（秒）没有查询时停止订阅并释放缓冲区，0 表示不自动停止
+IDLE_TIMEOUT = STREAM_CONFIG.get('idle_timeout', 600)
+# 配置的直播间在启动时订阅，不会因空闲或数量上限被停止
+PINNED_ROOMID = config['bilibili_api']['live'].get('roomid')
+HEARTBEAT_INTERVAL = 30
+MAX_BACKOFF = 60
+
+# 每个直播间的弹幕缓冲区：直播间ID -> deque[(序号, 弹幕)]，超出容量时丢弃最早的弹幕
+_buffers = {}
+# 每个直播间最新一条弹幕的序号，查询时作为游标返回
+_cursors = {}
+# 已通过认证、正在接收弹幕的直播间
+_connected = set()
+# 后台订阅任务：直播间ID -> 任务
+_tasks = {}
+# 每个直播间最近一次查询的时间
+_last_used = {}
+
+def add_danmu(roomid: int, danmu: dict) -> int:
+    """把弹幕放入直播间缓冲区，返回弹幕序号"""
+    cursor = _cursors.get(roomid, 0) + 1
+    _cursors[roomid] = cursor
+    _buffers.setdefault(roomid, deque(maxlen=BUFFER_SIZE)).append((cursor, danmu))
+    return cursor
+
+def get_buffered_danmu(roomid: int, since: int = 0, limit: int = 10) -> tuple:
+    """读取缓冲区中的弹幕，since 为 0 时返回最后 limit 条，否则返回序号大于 since 的所有弹幕"""
+    buffer = _buffers.get(roomid, ())
+    if since:
+        danmus = [danmu for cursor, danmu in buffer if cursor > since]
+    else:
+        danmus = [danmu for _, danmu in buffer][-limit:]
+    return danmus, _cursors.get(roomid, 0)
+
+def feed_frame(roomid: int, data: bytes) -> int:
+    """处理弹幕服务器发来的一帧数据，返回其中新增的弹幕数量"""
+    count = 0
+    for op, body in unpack(data):
+        if op == OP_AUTH_REPLY:
+            _connected.add(roomid)
+            logger.info(f"直播间 {roomid} 弹幕流认证完成")
+        elif op == OP_MESSAGE:
+            danmu = parse_danmu(parse_command(body))
+            if danmu:
+                add_danmu(roomid, danmu)
+                count += 1
+    return count
+
+def is_streaming(roomid: int) -> bool:
+    """直播间弹幕流是否正在接收"""
+    return roomid in _connected
+
+def _is_idle(roomid: int) -> bool:
+    """直播间是否超过空闲时间没有查询，配置的直播间不会空闲"""
+    if not IDLE_TIMEOUT or roomid == PINNED_ROOMID:
+        return False
+    return time.monotonic() - _last_used.get(roomid, 0) > IDLE_TIMEOUT
+
+def _release(roomid: int):
+    """释放直播间的缓冲区，保留游标，重新订阅后序号继续递增，旧游标仍然有效"""
+    _buffers.pop(roomid, None)
+    _last_used.pop(roomid, None)
+    _connected.discard(roomid)
+
+def _stop_room(roomid: int):
+    """停止直播间的订阅任务并释放缓冲区"""
+    task = _tasks.pop(roomid, None)
+    if task is not None:
+        task.cancel()
+    _release(roomid)
+    logger.info(f"已停止订阅直播间 {roomid} 的弹幕流")
+
+async def _get_danmu_server(roomid: int) -> tuple:
+    """获取真实直播间ID、弹幕服务器地址和认证令牌"""
+    headers = {'Referer': 'https://live.bilibili.com/'}
+    if config['bilibili_api']['auth'].get('cookie'):
+        headers['Cookie'] = config['bilibili_api']['auth']['cookie']
+    response = await http_get('https://api.live.bilibili.com/room/v1/Room/room_init', params={'id': roomid}, headers=headers)
+    response.raise_for_status()
+    room_id = response.json()['data']['room_id']
+    response = await wbi_get(
+        'https://api.live.bilibili.com/xlive/web-room/v1/index/getDanmuInfo',
+        {'id': room_id, 'type': 0, 'web_location': '444.8'},
+        headers=headers
+    )
+    response.raise_for_status()
+    data = response.json()
+    if data.get('code') != 0:
+        raise RuntimeError(f"获取弹幕服务器失败: {data.get('message')}")
+    host = data['data']['host_list'][0]
+    return room_id, data['data']['token'], f"wss://{host['host']}:{host['wss_port']}/sub"
+
+async def _heartbeat(ws):
+    """定时发送心跳，保持连接"""
+    while True:
+        await ws.send_bytes(pack(OP_HEARTBEAT, '[object Object]'))
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+async def _subscribe(roomid: int):
+    """订阅直播间弹幕流，断开后自动重连，空闲超时后停止订阅"""
+    backoff = 1
+    try:
+        while not _is_idle(roomid):
+            try:
+                room_id, token, url = await _get_danmu_server(roomid)
+                logger.info(f"正在连接直播间 {roomid} 的弹幕流...")
+                async with get_session().ws_connect(url, headers={'Origin': 'https://live.bilibili.com'}) as ws:
+                    await ws.send_bytes(pack(OP_AUTH, {
+                        'uid': 0,
+                        'roomid': room_id,
+                        # 使用 zlib 压缩协议，无需额外依赖
+                        'protover': 2,
+                        'platform': 'web',
+                        'type': 2,
+                        'key': token
+                    }))
+                    heartbeat = asyncio.create_task(_heartbeat(ws))
+                    try:
+                        # 服务器每 30 秒回复一次心跳，没有弹幕时也能及时发现空闲
+                        async for message in ws:
+                            if message.type == aiohttp.WSMsgType.BINARY:
+                                feed_frame(roomid, message.data)
+                                backoff = 1
+                            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                            if _is_idle(roomid):
+                                break
+                    finally:
+                        heartbeat.cancel()
+                        _connected.discard(roomid)
+                if _is_idle(roomid):
+                    break
+                logger.warning(f"直播间 {roomid} 弹幕流已断开")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"直播间 {roomid} 弹幕流连接失败: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+        logger.info(f"直播间 {roomid} 超过 {IDLE_TIMEOUT} 秒没有查询，停止订阅弹幕流")
+    finally:
+        # 被新的订阅任务替换时不释放新任务的缓冲区
+        if _tasks.get(roomid) in (None, asyncio.current_task()):
+            _tasks.pop(roomid, None)
+            _release(roomid)
+
+def ensure_stream(roomid: int) -> bool:
+    """启用弹幕流时确保直播间已在后台订阅，返回弹幕流是否可用
+    先停止空闲的直播间，订阅数量达到上限时停止最久没有查询的直播间；都不能停止时不订阅，由调用方改用接口查询"""
+    if not STREAM_ENABLED:
+        return False
+    for other in [other for other in _tasks if other != roomid and _is_idle(other)]:
+        _stop_room(other)
+    _last_used[roomid] = time.monotonic()
+    task = _tasks.get(roomid)
+    if task is None or task.done():
+        if MAX_ROOMS and len(_tasks) >= MAX_ROOMS:
+            others = [other for other in _tasks if other not in (roomid, PINNED_ROOMID)]
+            if not others:
+                _last_used.pop(roomid, None)
+                logger.warning(f"弹幕流订阅已达到 {MAX_ROOMS} 个直播间的上限，直播间 {roomid} 改用接口查询")
+                return False
+            _stop_room(min(others, key=lambda other: _last_used.get(other, 0)))
+        _tasks[roomid] = asyncio.create_task(_subscribe(roomid))
+    return is_streaming(roomid)
+
+async def stop_streams():
+    """停止所有直播间的弹幕流订阅"""
+    tasks = list(_tasks.values())
+    _tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _buffers.clear()
+    _last_used.clear()
+    _connected.clear()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('获取B站主播信息')
 
@@ -10,7 +10,7 @@ config = load_config()
 def get_bilibili_anchor_info(mcp: FastMCP):
     """查询B站主播信息"""
     @mcp.tool()
-    def get_bilibili_anchor_info(uid: int) -> dict:
+    async def get_bilibili_anchor_info(uid: int) -> dict:
         """用于查询B站主播信息，当需要获取主播信息时，立即使用该工具。
         Args:
             uid (int): 目标用户mid
@@ -39,7 +39,7 @@ def get_bilibili_anchor_info(mcp: FastMCP):
         }
         try:
             logger.info(f"开始查询用户 {uid} 的主播信息...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await http_get(url, params=params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data.get("code") == 0 and data.get("data"):
@@ -62,13 +62,13 @@ def get_bilibili_anchor_info(mcp: FastMCP):
                     "room_news": data["data"]["room_news"]
                 }
                 logger.info(f"成功获取用户 {uid} 的主播信息")
-                logger.info(f"返回数据：{result}")
+                logger.info("返回数据：%s", result)
                 return {
                     "success": True,
                     "result": result
                 }
             logger.error("未获取到主播信息数据")
             return {"success": False, "result": "未获取到主播信息数据"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"请求失败: {e}")
             return {"success": False, "result": f"请求失败: {e}"}
\ No newline at end of file
@@ -1,7 +1,8 @@
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
+from utils.bilibili.live.danmu_stream import ensure_stream, get_buffered_danmu
 
 logger = logging.getLogger('获取B站直播弹幕')
 
@@ -10,12 +11,14 @@ config = load_config()
 def get_bilibili_live_danmu(mcp: FastMCP):
     """查询直播弹幕"""
     @mcp.tool()
-    def get_bilibili_live_danmu(roomid: int = config['bilibili_api']['live']['roomid']) -> dict:
+    async def get_bilibili_live_danmu(roomid: int = config['bilibili_api']['live']['roomid'], since: int = 0) -> dict:
         """用于查询B站直播弹幕，当查询直播间弹幕时，立即使用该工具。
         Args:
             roomid (int): 直播间ID，默认为配置中的roomid
+            since (int): 弹幕游标，传入上一次返回的 cursor 时只返回之后的新弹幕，默认为 0 表示返回最后十条
         Returns:
-            dict: 返回包含success和result字段的字典，其中result可能包含最后十条弹幕的详细信息，具体每条弹幕包含如下字段：
+            dict: 返回包含success和result字段的字典，启用弹幕流时还包含 cursor 字段（下一次查询新弹幕时传入 since），
+                其中result可能包含弹幕的详细信息，具体每条弹幕包含如下字段：
                 - text (str): 弹幕文本内容
                 - dm_type (int): 弹幕类型
                 - uid (int): 发送者的用户ID
@@ -28,6 +31,11 @@ def get_bilibili_live_danmu(mcp: FastMCP):
                 - medal (dict): 发送者的粉丝勋章信息
                 - title (str): 发送者的头衔信息
         """
+        # 启用弹幕流且已连接时直接从内存返回
+        if ensure_stream(roomid):
+            danmus, cursor = get_buffered_danmu(roomid, since)
+            logger.info(f"从弹幕流获取直播间 {roomid} 的 {len(danmus)} 条弹幕")
+            return {"success": True, "result": danmus, "cursor": cursor}
         url = "https://api.live.bilibili.com/ajax/msg"
         params = {"roomid": roomid}
         headers = {
@@ -35,7 +43,7 @@ def get_bilibili_live_danmu(mcp: FastMCP):
         }
         try:
             logger.info(f"开始查询直播间 {roomid} 的弹幕...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await http_get(url, params=params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data.get("code") == 0 and data.get("data"):
@@ -58,7 +66,7 @@ def get_bilibili_live_danmu(mcp: FastMCP):
                             "title": danmu["title"]
                         })
                     logger.info(f"成功获取直播间 {roomid} 的弹幕")
-                    logger.info(f"返回数据：{result}")
+                    logger.info("返回数据：%s", result)
                     return {
                         "success": True,
                         "result": result
@@ -68,6 +76,6 @@ def get_bilibili_live_danmu(mcp: FastMCP):
                     return {"success": False, "result": "直播间没有弹幕"}
             logger.error("未获取到弹幕数据")
             return {"success": False, "result": "未获取到弹幕数据"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"请求失败: {e}")
             return {"success": False, "result": f"请求失败: {e}"}
\ No newline at end of file
@@ -1,7 +1,7 @@
-import requests
 import logging
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('获取B站直播间基本信息')
 config = load_config()
@@ -9,7 +9,7 @@ config = load_config()
 def get_room_base_info(mcp: FastMCP):
     """获取B站直播间基本信息的工具函数"""
     @mcp.tool()
-    def get_room_base_info(room_short_ids):
+    async def get_room_base_info(room_short_ids):
         """获取B站直播间基本信息
         Args:
             room_short_ids (list): 直播间短ID列表
@@ -41,7 +41,7 @@ def get_room_base_info(mcp: FastMCP):
         }
         try:
             logger.info(f"开始查询直播间短ID为 {room_short_ids} 的基本信息...")
-            response = requests.get(url, params=params, headers=headers)
+            response = await http_get(url, params=params, headers=headers)
             response.raise_for_status()
             response_data = response.json()
 
@@ -65,7 +65,7 @@ def get_room_base_info(mcp: FastMCP):
                     }
             logger.info(f"成功获取直播间短ID为 {room_short_ids} 的基本信息")
             return {"success": True, "result": result}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"请求异常: {str(e)}")
             return {"success": False, "result": f"请求异常: {str(e)}"}
         except ValueError as e:
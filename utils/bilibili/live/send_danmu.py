@@ -1,8 +1,8 @@
 import time
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_post, HTTP_ERRORS
 
 logger = logging.getLogger('B站发送直播弹幕')
 
@@ -11,7 +11,7 @@ config = load_config()
 def send_bilibili_live_danmu(mcp: FastMCP):
     """发送直播弹幕"""
     @mcp.tool()
-    def send_bilibili_live_danmu(msg: str, roomid: int = config['bilibili_api']['live']['roomid']) -> dict:
+    async def send_bilibili_live_danmu(msg: str, roomid: int = config['bilibili_api']['live']['roomid']) -> dict:
         """发送B站直播弹幕
         Args:
             msg (str): 要发送的弹幕内容，不能为空, 不能超过20个字符
@@ -44,14 +44,12 @@ def send_bilibili_live_danmu(mcp: FastMCP):
             'csrf_token': config['bilibili_api']['auth']['csrf_token'],
             'csrf': config['bilibili_api']['auth']['csrf_token']
         }
-        cookie = {
-            'Cookie': config['bilibili_api']['auth']['cookie']
-        }
         headers = {
-            'User-Agent': config['http_headers']['user_agent']
+            'User-Agent': config['http_headers']['user_agent'],
+            'Cookie': config['bilibili_api']['auth']['cookie']
         }
         logger.info(f"发送弹幕: {msg}")
-        response = requests.post(url, data=data, cookies=cookie, headers=headers)
+        response = await http_post(url, data=data, headers=headers)
         try:
             if response.status_code != 200:
                 logger.error(f"请求失败，HTTP状态码: {response.status_code}")
@@ -70,7 +68,7 @@ def send_bilibili_live_danmu(mcp: FastMCP):
                 error_msg = response_data.get('message', '未知错误')
                 logger.error(f"弹幕发送失败: {error_msg}")
                 return {"success": False, "result": f"弹幕发送失败: {error_msg}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"请求异常: {str(e)}")
             return {"success": False, "result": f"请求异常: {str(e)}"}
         except ValueError as e:
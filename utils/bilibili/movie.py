@@ -1,14 +1,16 @@
 import logging
-import requests
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('电影推荐')
 
 def get_bilibili_movie(mcp: FastMCP):
     """电影查询(分区查询)"""
     @mcp.tool()
-    def get_bilibili_movie(sort_by: str = "") -> dict:
+    @cached
+    async def get_bilibili_movie(sort_by: str = "") -> dict:
         """用于查询B站电影信息
             该工具返回的是视频ID，不是视频链接。
             这些链接除非需要，否则不要将下面这些链接进行返回或者告诉用户。
@@ -37,7 +39,7 @@ def get_bilibili_movie(mcp: FastMCP):
         }
         try:
             logger.info("开始查询B站动态分区信息...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await http_get(url, params=params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data["code"] == 0:
@@ -74,11 +76,11 @@ def get_bilibili_movie(mcp: FastMCP):
                 else:
                     import random
                     result = [random.choice(result)] if result else []
-                logger.info(f"成功获取B站动态分区信息: {result}")
+                logger.info("成功获取B站动态分区信息: %s", result)
                 return {"success": True, "result": result}
             else:
                 logger.error(f"获取失败状态码：{data['code']}")
                 return {"success": False, "result": f"获取动态分区信息失败，状态码: {data['code']}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
@@ -1,10 +1,10 @@
 import os
 import logging
-import requests
 from datetime import datetime
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
-from utils.bilibili.wbi_signed import get_wbi_signed
+from utils.http_client import HTTP_ERRORS
+from utils.bilibili.wbi_signed import wbi_get
 
 config = load_config()
 logger = logging.getLogger('B站视频推荐')
@@ -12,7 +12,7 @@ logger = logging.getLogger('B站视频推荐')
 def get_bilibili_recommended_videos(mcp: FastMCP):
     """推荐视频工具"""
     @mcp.tool()
-    def get_bilibili_recommended_videos(
+    async def get_bilibili_recommended_videos(
             brush: int = config['bilibili_api']['recommended']['fresh'],
             fetch_row: int = config['bilibili_api']['recommended']['fetch_count'],
             sort_by: str = ""
@@ -43,7 +43,6 @@ def get_bilibili_recommended_videos(mcp: FastMCP):
                     3.拼接的视频链接和作者主页链接，不向用户展示，只用于查询视频信息或询问时给予用户。
                     4.时长单位是秒，需要自行转换为分钟或小时。
         """
-        signed = get_wbi_signed()
         fetch_count = max(fetch_row, 4)
         url = "https://api.bilibili.com/x/web-interface/wbi/index/top/feed/rcmd"
         params = {
@@ -61,9 +60,7 @@ def get_bilibili_recommended_videos(mcp: FastMCP):
             "screen": config['bilibili_api']['recommended']['screen'],
             "seo_info": "",
             "last_showlist": config['bilibili_api']['recommended']['last_showlist'],
-            "uniq_id": config['bilibili_api']['recommended']['uniq_id'],
-            "w_rid": signed['w_rid'],
-            "wts": signed['wts']
+            "uniq_id": config['bilibili_api']['recommended']['uniq_id']
         }
         cache_dir = os.path.join(os.getcwd(), 'tmp')
         cache_file = os.path.join(cache_dir, 'bilibili_recommended_videos_cache.tmp')
@@ -82,7 +79,7 @@ def get_bilibili_recommended_videos(mcp: FastMCP):
         }
         try:
             logger.info("开始获取B站推荐视频...")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await wbi_get(url, params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data["code"] == 0:
@@ -156,11 +153,11 @@ def get_bilibili_recommended_videos(mcp: FastMCP):
                     "新鲜度": brush,
                     "返回数量": fetch_count
                 }
-                logger.info(f"获取到的视频信息：{result}")
+                logger.info("获取到的视频信息：%s", result)
                 return {"success": True, "result": result}
             else:
                 logger.error(f"获取失败状态码：{data['code']}")
                 return {"success": False, "result": f"获取推荐失败，状态码: {data['code']}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
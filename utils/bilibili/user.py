@@ -1,14 +1,14 @@
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('B站用户信息')
 
 def query_bilibili_user(mcp: FastMCP):
     """查询用户空间"""
     @mcp.tool()
-    def query_bilibili_user(mid: str) -> dict:
+    async def query_bilibili_user(mid: str) -> dict:
         """用于查询B站用户空间信息的公开信息，不包含私密信息
             video：用户发布的视频数量
             bangumi：追番的数量
@@ -41,10 +41,10 @@ def query_bilibili_user(mcp: FastMCP):
         }
         try:
             logger.info(f"开始查询B站用户 {mid} 信息...")
-            space_response = requests.get(space_url, headers=headers, timeout=5)
+            space_response = await http_get(space_url, headers=headers, timeout=5)
             space_response.raise_for_status()
             space_data = space_response.json()
-            relation_response = requests.get(relation_url, headers=headers, timeout=5)
+            relation_response = await http_get(relation_url, headers=headers, timeout=5)
             relation_response.raise_for_status()
             relation_data = relation_response.json()
             if space_data["code"] == 0 and relation_data["code"] == 0:
@@ -57,12 +57,12 @@ def query_bilibili_user(mcp: FastMCP):
                     }
                 }
                 logger.info(f"成功获取B站用户 {mid}")
-                logger.info(f"返回数据：{result}")
+                logger.info("返回数据：%s", result)
                 return result
             else:
                 error_code = space_data["code"] if space_data["code"] != 0 else relation_data["code"]
                 logger.error(f"获取失败状态码：{error_code}")
                 return {"success": False, "result": f"获取用户信息失败，状态码: {error_code}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
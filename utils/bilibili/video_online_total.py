@@ -1,14 +1,14 @@
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('B站视频在线人数')
 
 def get_bilibili_video_online_total(mcp: FastMCP):
     """查询视频在线人数"""
     @mcp.tool()
-    def get_bilibili_video_online_total(aid: int, cid: int) -> dict:
+    async def get_bilibili_video_online_total(aid: int, cid: int) -> dict:
         """获取B站视频在线人数
         Args:
             aid (int): 视频AV号
@@ -27,7 +27,7 @@ def get_bilibili_video_online_total(mcp: FastMCP):
         }
         try:
             logger.info(f"开始获取视频在线人数，AV号: {aid}, CID号: {cid}")
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = await http_get(url, params=params, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data.get("code") == 0:
@@ -41,7 +41,7 @@ def get_bilibili_video_online_total(mcp: FastMCP):
                 "success": False,
                 "result": f"请求失败，状态码: {data.get('code')}"
             }
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"请求失败: {e}")
             return {
                 "success": False,
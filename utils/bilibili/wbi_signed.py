@@ -1,53 +1,83 @@
 import time
-import json
+import asyncio
 import logging
-import requests
 import urllib.parse
 from hashlib import md5
 from functools import reduce
 from config.loader import load_config
+from utils.http_client import http_get
 
 logger = logging.getLogger('Wbi签名')
 
-def get_wbi_signed():
-    mixinKeyEncTab = [
-        46, 47, 18, 2, 53, 8, 23, 32, 15, 50, 10, 31, 58, 3, 45, 35, 27, 43, 5, 49,
-        33, 9, 42, 19, 29, 28, 14, 39, 12, 38, 41, 13, 37, 48, 7, 16, 24, 55, 40,
-        61, 26, 17, 0, 1, 60, 51, 30, 4, 22, 25, 54, 21, 56, 59, 6, 63, 57, 62, 11,
-        36, 20, 34, 44, 52
-    ]
-    headers = {
-        'User-Agent': load_config()['http_headers']['user_agent'],
-        'Referer': 'https://www.bilibili.com/'
-    }
-    logger.info("开始查询Wbi签名...")
-    resp = requests.get('https://api.bilibili.com/x/web-interface/nav', headers=headers)
-    resp.raise_for_status()
-    json_content = resp.json()
-    img_url = json_content['data']['wbi_img']['img_url']
-    sub_url = json_content['data']['wbi_img']['sub_url']
-    img_key = img_url.rsplit('/', 1)[1].split('.')[0]
-    sub_key = sub_url.rsplit('/', 1)[1].split('.')[0]
-    mixin_key = reduce(lambda s, i: s + (img_key + sub_key)[i], mixinKeyEncTab, '')[:32]
-    params = {
-        'foo': '114',
-        'bar': '514',
-        'baz': 1919810
-    }
-    curr_time = round(time.time())
-    params['wts'] = curr_time
+MIXIN_KEY_ENC_TAB = [
+    46, 47, 18, 2, 53, 8, 23, 32, 15, 50, 10, 31, 58, 3, 45, 35, 27, 43, 5, 49,
+    33, 9, 42, 19, 29, 28, 14, 39, 12, 38, 41, 13, 37, 48, 7, 16, 24, 55, 40,
+    61, 26, 17, 0, 1, 60, 51, 30, 4, 22, 25, 54, 21, 56, 59, 6, 63, 57, 62, 11,
+    36, 20, 34, 44, 52
+]
+# 签名被拒绝时接口返回的错误码
+REJECTED_CODES = (-352, -403)
+
+# 缓存的混合密钥及获取日期，B站每天更换 img_key 和 sub_key
+_mixin_key = None
+_mixin_key_day = None
+_mixin_key_lock = asyncio.Lock()
+
+def get_mixin_key_from(img_key: str, sub_key: str) -> str:
+    """按固定顺序打乱 img_key 和 sub_key 得到混合密钥"""
+    return reduce(lambda s, i: s + (img_key + sub_key)[i], MIXIN_KEY_ENC_TAB, '')[:32]
+
+async def get_mixin_key(refresh: bool = False) -> str:
+    """获取混合密钥，当天已获取过时直接使用缓存"""
+    global _mixin_key, _mixin_key_day
+    stale_key = _mixin_key
+    async with _mixin_key_lock:
+        today = time.strftime('%Y-%m-%d')
+        # 等锁期间其他调用已经刷新过时直接使用新密钥
+        if _mixin_key and _mixin_key_day == today and not (refresh and _mixin_key == stale_key):
+            return _mixin_key
+        headers = {
+            'User-Agent': load_config()['http_headers']['user_agent'],
+            'Referer': 'https://www.bilibili.com/'
+        }
+        logger.info("开始查询Wbi密钥...")
+        resp = await http_get('https://api.bilibili.com/x/web-interface/nav', headers=headers)
+        resp.raise_for_status()
+        json_content = resp.json()
+        img_url = json_content['data']['wbi_img']['img_url']
+        sub_url = json_content['data']['wbi_img']['sub_url']
+        img_key = img_url.rsplit('/', 1)[1].split('.')[0]
+        sub_key = sub_url.rsplit('/', 1)[1].split('.')[0]
+        _mixin_key = get_mixin_key_from(img_key, sub_key)
+        _mixin_key_day = today
+        logger.info("Wbi密钥已更新")
+        return _mixin_key
+
+def sign_params(params: dict, mixin_key: str, wts: int = None) -> dict:
+    """对实际请求参数签名，返回加上 wts 和 w_rid 的参数，请求时必须原样使用"""
+    params = dict(params)
+    params['wts'] = round(time.time()) if wts is None else wts
     params = dict(sorted(params.items()))
     params = {
         k : ''.join(filter(lambda chr: chr not in "!'()*", str(v)))
-        for k, v 
+        for k, v
         in params.items()
     }
     query = urllib.parse.urlencode(params)
-    wbi_sign = md5((query + mixin_key).encode()).hexdigest()
-    params['w_rid'] = wbi_sign
-    result = {
-        'w_rid': params['w_rid'],
-        'wts': params['wts']
-    }
-    logger.info(f"返回数据：{result}")
-    return result
\ No newline at end of file
+    params['w_rid'] = md5((query + mixin_key).encode()).hexdigest()
+    return params
+
+def _rejected(response) -> bool:
+    """判断接口是否因为签名无效拒绝了请求"""
+    try:
+        return response.json().get('code') in REJECTED_CODES
+    except ValueError:
+        return False
+
+async def wbi_get(url: str, params: dict, **kwargs):
+    """签名后发送GET请求，签名被拒绝时刷新密钥重试一次"""
+    response = await http_get(url, params=sign_params(params, await get_mixin_key()), **kwargs)
+    if _rejected(response):
+        logger.warning("Wbi签名被拒绝，刷新密钥后重试")
+        response = await http_get(url, params=sign_params(params, await get_mixin_key(refresh=True)), **kwargs)
+    return response
\ No newline at end of file
@@ -1,15 +1,15 @@
 import logging
-import requests
 from bs4 import BeautifulSoup
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('必应搜索')
 
 def bing_search(mcp: FastMCP):
     """必应搜索"""
     @mcp.tool()
-    def bing_search(search: str, pagination: int = None) -> dict:
+    async def bing_search(search: str, pagination: int = None) -> dict:
         """用于在必应搜索引擎中搜索内容，当需要搜索网页内容时使用该工具。
         Args:
             search (str): 搜索关键词
@@ -37,7 +37,7 @@ def bing_search(mcp: FastMCP):
         }
         try:
             logger.info(f"开始搜索: {search}")
-            response = requests.get(url, headers=headers, timeout=5)
+            response = await http_get(url, headers=headers, timeout=5)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             paragraphs = soup.find_all('li', class_='b_algo')
@@ -53,8 +53,8 @@ def bing_search(mcp: FastMCP):
                     for paragraph in paragraphs
                 ]
             }
-            logger.info(f"成功获取搜索结果: {results}")
+            logger.info("成功获取搜索结果: %s", results)
             return {"success": True, "result": results}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"搜索失败: {e}")
             return {"success": False, "result": f"搜索失败: {e}"}
\ No newline at end of file
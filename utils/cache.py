@@ -0,0 +1,98 @@
+import json
+import time
+import inspect
+import logging
+import functools
+from collections import OrderedDict
+from config.loader import load_config
+
+logger = logging.getLogger('结果缓存')
+
+# 从配置获取缓存设置
+CACHE_CONFIG = load_config().get('cache', {}) or {}
+MAX_ENTRIES = CACHE_CONFIG.get('max_entries', 256)
+TTL = CACHE_CONFIG.get('ttl', {}) or {}
+
+# 各工具的缓存：工具名 -> OrderedDict(参数键 -> (过期时间, 结果))
+_caches = {}
+# 各工具的命中统计：工具名 -> {'hits': 0, 'misses': 0}
+_counters = {}
+
+def _make_key(signature: inspect.Signature, args, kwargs) -> str:
+    """按参数生成缓存键，补全默认值，保证不同传参方式得到同一个键"""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return json.dumps(bound.arguments, sort_keys=True, ensure_ascii=False, default=str)
+
+def _get(name: str, key: str):
+    """读取未过期的缓存结果，命中时移到最近使用的位置"""
+    cache = _caches.get(name)
+    entry = cache.get(key) if cache is not None else None
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return entry
+
+def _put(name: str, key: str, ttl: float, result):
+    """写入缓存结果，超过数量上限时淘汰最久未使用的"""
+    # 失败结果不缓存，下次调用重新请求
+    if isinstance(result, dict) and result.get('success') is False:
+        return
+    cache = _caches.setdefault(name, OrderedDict())
+    cache[key] = (time.monotonic() + ttl, result)
+    cache.move_to_end(key)
+    while len(cache) > MAX_ENTRIES:
+        cache.popitem(last=False)
+
+def cached(fn):
+    """按参数缓存工具结果，缓存时间取自配置 cache.ttl.<工具名>，未配置时不缓存
+    放在 @mcp.tool() 下方使用，保留原函数的签名和文档"""
+    name = fn.__name__
+    ttl = TTL.get(name, 0)
+    if not ttl:
+        return fn
+    signature = inspect.signature(fn)
+    counter = _counters.setdefault(name, {'hits': 0, 'misses': 0})
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = _make_key(signature, args, kwargs)
+            entry = _get(name, key)
+            if entry is not None:
+                counter['hits'] += 1
+                logger.info(f"{name} 命中缓存")
+                return entry[1]
+            counter['misses'] += 1
+            result = await fn(*args, **kwargs)
+            _put(name, key, ttl, result)
+            return result
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = _make_key(signature, args, kwargs)
+            entry = _get(name, key)
+            if entry is not None:
+                counter['hits'] += 1
+                logger.info(f"{name} 命中缓存")
+                return entry[1]
+            counter['misses'] += 1
+            result = fn(*args, **kwargs)
+            _put(name, key, ttl, result)
+            return result
+    return wrapper
+
+def get_cache_stats() -> dict:
+    """获取各工具的缓存命中统计和当前缓存数量"""
+    return {
+        name: {
+            'hits': counter['hits'],
+            'misses': counter['misses'],
+            'entries': len(_caches.get(name, ())),
+            'ttl': TTL.get(name, 0)
+        }
+        for name, counter in _counters.items()
+    }
\ No newline at end of file
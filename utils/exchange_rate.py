@@ -1,14 +1,16 @@
 import logging
-import requests
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('汇率查询')
 
 def get_exchange_rate(mcp: FastMCP):
     """汇率查询"""
     @mcp.tool()
-    def get_exchange_rate(money: float, fromcode: str, tocode: str) -> dict:
+    @cached
+    async def get_exchange_rate(money: float, fromcode: str, tocode: str) -> dict:
         """根据传入的金额、源货币代码和目标货币代码获取汇率信息。
         Args:
             money (float): 要换算的金额。
@@ -32,7 +34,7 @@ def get_exchange_rate(mcp: FastMCP):
             headers = {
                 "User-Agent": load_config()['http_headers']['user_agent']
             }
-            response = requests.get(url, params=params, headers=headers)
+            response = await http_get(url, params=params, headers=headers)
             response.raise_for_status()
             data = response.json()
             if data.get('status') == 0:
@@ -42,13 +44,13 @@ def get_exchange_rate(mcp: FastMCP):
                     "更新时间": data['update_time']
                 }
                 logger.info(f"成功获取 {fromcode} 到 {tocode} 的汇率信息")
-                logger.info(f"汇率信息: {result}")
+                logger.info("汇率信息: %s", result)
                 return {"success": True, "result": result}
             else:
                 error_msg = f"获取汇率失败，错误信息: {data.get('msg', '未知错误')}"
                 logger.error(error_msg)
                 return {"success": False, "result": error_msg}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             error_msg = f"请求出错: {e}"
             logger.error(error_msg)
             return {"success": False, "result": error_msg}
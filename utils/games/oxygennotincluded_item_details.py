@@ -1,15 +1,17 @@
 import logging
-import requests
 from bs4 import BeautifulSoup
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get
 
 logger = logging.getLogger('缺氧物品详情')
 
 def get_oxygennotincluded_item_details(mcp: FastMCP):
     """注册获取缺氧物品详情的工具"""
     @mcp.tool()
-    def get_oxygennotincluded_item_details(keyword: str) -> dict:
+    @cached
+    async def get_oxygennotincluded_item_details(keyword: str) -> dict:
         """根据关键词获取缺氧物品的详细内容。
         当用户询问缺氧游戏中某物品的信息时，立刻使用该工具。
         Args:
@@ -28,7 +30,7 @@ def get_oxygennotincluded_item_details(mcp: FastMCP):
             headers = {
                 "User-Agent": load_config()['http_headers']['user_agent']
             }
-            response = requests.get(url, headers=headers)
+            response = await http_get(url, headers=headers)
             if response.status_code == 404:
                 error_msg = f"获取物品信息失败: 404 Client Error: Not Found for url: {url}"
                 logger.error(error_msg)
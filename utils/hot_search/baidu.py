@@ -1,15 +1,17 @@
 import logging
-import requests
 from datetime import datetime
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('百度热搜')
 
 def get_baidu_hot_search(mcp: FastMCP):
     """百度热搜查询"""
     @mcp.tool()
-    def get_baidu_hot_search(limit: int = 10) -> dict:
+    @cached
+    async def get_baidu_hot_search(limit: int = 10) -> dict:
         """用于查询百度实时热搜信息
             该工具的主要功能是获取百度的实时热搜信息，包括热搜关键词。
             如果需要获取更多的热搜信息，需要询问用户要不要完整的热搜信息。
@@ -25,7 +27,7 @@ def get_baidu_hot_search(mcp: FastMCP):
         }
         try:
             logger.info("开始查询百度热搜信息...")
-            response = requests.get(url, headers=headers, timeout=5)
+            response = await http_get(url, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data.get("success", False):
@@ -36,11 +38,11 @@ def get_baidu_hot_search(mcp: FastMCP):
                     if "query" in item:
                         result.append(item["query"])
                 logger.info(f"成功获取百度热搜信息: {len(result)}条")
-                logger.info(f"返回数据：{result}")
+                logger.info("返回数据：%s", result)
                 return {"success": True, "list": result}
             else:
                 logger.error(f"获取失败，数据中 success 字段为 false")
                 return {"success": False, "result": "获取热搜信息失败"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
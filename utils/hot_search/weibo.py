@@ -1,14 +1,16 @@
 import logging
-import requests
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('微博热搜')
 
 def get_weibo_hot_search(mcp: FastMCP):
     """获取微博实时热搜内容"""
     @mcp.tool()
-    def get_weibo_hot_search(limit: int = 10) -> dict:
+    @cached
+    async def get_weibo_hot_search(limit: int = 10) -> dict:
         """用于获取微博实时热搜内容
         Args:
             limit (int): 返回结果数量，默认为10
@@ -22,7 +24,7 @@ def get_weibo_hot_search(mcp: FastMCP):
         }
         try:
             logger.info("开始查询微博实时热搜内容...")
-            response = requests.get(url, headers=headers, timeout=5)
+            response = await http_get(url, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             result = []
@@ -37,9 +39,9 @@ def get_weibo_hot_search(mcp: FastMCP):
                 if len(result) >= limit:
                     break
             logger.info(f"成功获取 {len(result)} 条微博实时热搜内容")
-            logger.info(f"获取到的热搜内容: {result}")
+            logger.info("获取到的热搜内容: %s", result)
             return {"success": True, "list": result}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             error_msg = f"获取微博热搜失败: {e}"
             logger.error(error_msg)
             return {"success": False, "result": error_msg}
\ No newline at end of file
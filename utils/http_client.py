@@ -0,0 +1,103 @@
+import json
+import asyncio
+import logging
+import aiohttp
+from config.loader import load_config
+
+logger = logging.getLogger('HTTP客户端')
+
+config = load_config()
+
+# 从配置获取HTTP客户端设置，连接数和域名缓存的配置项与 aiohttp.TCPConnector 的参数同名
+HTTP_CONFIG = config.get('http', {}) or {}
+TIMEOUT = HTTP_CONFIG.get('timeout', 10)
+LIMIT = HTTP_CONFIG.get('limit', 100)
+LIMIT_PER_HOST = HTTP_CONFIG.get('limit_per_host', 10)
+TTL_DNS_CACHE = HTTP_CONFIG.get('ttl_dns_cache', 300)
+
+# 请求相关异常，工具统一捕获
+HTTP_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+# 所有工具共用的会话，按主机保持长连接，会话与创建它的事件循环绑定
+_session = None
+_session_loop = None
+
+class HttpResponse:
+    """已读取完毕的响应，保留工具常用的 requests 风格属性"""
+
+    def __init__(self, response: aiohttp.ClientResponse, content: bytes):
+        self.status_code = response.status
+        self.reason = response.reason
+        self.url = str(response.url)
+        self.headers = response.headers
+        self.content = content
+        self.encoding = response.charset
+        self._request_info = response.request_info
+        self._history = response.history
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self, **kwargs):
+        return json.loads(self.text, **kwargs)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise aiohttp.ClientResponseError(
+                self._request_info,
+                self._history,
+                status=self.status_code,
+                message=self.reason or '',
+                headers=self.headers
+            )
+
+def get_session() -> aiohttp.ClientSession:
+    """获取共用的HTTP会话，首次调用或事件循环变化时创建"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(limit=LIMIT, limit_per_host=LIMIT_PER_HOST, ttl_dns_cache=TTL_DNS_CACHE)
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': config['http_headers']['user_agent']},
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+            # 不在工具之间共享服务器下发的 Cookie，每次请求只带调用方传入的 Cookie
+            cookie_jar=aiohttp.DummyCookieJar()
+        )
+        _session_loop = loop
+    return _session
+
+async def close_session():
+    """关闭共用的HTTP会话"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+def _form(values):
+    """与 requests 一致：去掉值为 None 的参数，其余转为字符串"""
+    if not isinstance(values, dict):
+        return values
+    return {key: value if isinstance(value, str) else str(value) for key, value in values.items() if value is not None}
+
+async def http_request(method: str, url: str, timeout=None, verify=True, **kwargs) -> HttpResponse:
+    """通过共用会话发送请求并读取完整响应，未指定超时时使用配置的默认超时"""
+    if timeout is not None:
+        kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+    if not verify:
+        kwargs['ssl'] = False
+    for key in ('params', 'data'):
+        if key in kwargs:
+            kwargs[key] = _form(kwargs[key])
+    async with get_session().request(method, url, **kwargs) as response:
+        content = await response.read()
+        return HttpResponse(response, content)
+
+async def http_get(url: str, **kwargs) -> HttpResponse:
+    """通过共用会话发送GET请求"""
+    return await http_request('GET', url, **kwargs)
+
+async def http_post(url: str, **kwargs) -> HttpResponse:
+    """通过共用会话发送POST请求"""
+    return await http_request('POST', url, **kwargs)
\ No newline at end of file
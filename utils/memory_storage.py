@@ -54,7 +54,7 @@ def read_save_memory_data(mcp: FastMCP):
         try:
             with open(storage_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=4)
-            logger.info(f"成功更新记忆存储文件，存储内容为：{content}")
+            logger.info("成功更新记忆存储文件，存储内容为：%s", content)
             return {"success": True, "result": "记忆存储成功"}
         except Exception as e:
             error_msg = f"更新记忆存储文件失败: {str(e)}"
@@ -1,15 +1,17 @@
 import logging
-import requests
 from bs4 import BeautifulSoup
+from utils.cache import cached
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('今日油价')
 
 def get_oil_price(mcp: FastMCP):
     """今日油价"""
     @mcp.tool()
-    def get_oil_price(province: str) -> dict:
+    @cached
+    async def get_oil_price(province: str) -> dict:
         """根据省份获取今日油价信息，省份名称必须是 “省”，可以获取 “92号汽油”、“95号汽油”、“98号汽油”、“0号柴油” 。
         油价调整周期为每10个工作日一次，调整时间为工作日的24时。
         比如：省份为 “安徽” ，工具会返回 “安徽” 的今日油价信息。
@@ -28,7 +30,7 @@ def get_oil_price(mcp: FastMCP):
             headers = {
                 "User-Agent": load_config()['http_headers']['user_agent']
             }
-            response = requests.get(url, headers=headers)
+            response = await http_get(url, headers=headers)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             table = soup.find('table', class_='table table-bordered table-hover')
@@ -49,11 +51,11 @@ def get_oil_price(mcp: FastMCP):
                         "更新时间": cols[5].text
                     }
                     logger.info(f"成功获取 {province} 的油价信息")
-                    logger.info(f"油价信息: {result}")
+                    logger.info("油价信息: %s", result)
                     return {"success": True, "result": result}
             logger.error(f'未找到 {province} 的油价信息')
             return {"success": False, "result": f"未找到 {province} 的油价信息"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             error_msg = f"请求出错: {e}"
             logger.error(error_msg)
             return {"success": False, "result": error_msg}
@@ -1,14 +1,14 @@
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('QQ查询')
 
 def query_qq_info(mcp: FastMCP):
     """QQ信息查询"""
     @mcp.tool()
-    def query_qq_info(qq_number: int) -> dict:
+    async def query_qq_info(qq_number: int) -> dict:
         """用于查询QQ用户信息，当查询QQ用户信息，查询QQ或者查询QQ用户时，立即使用该工具。
         Args:
             qq_number (int): QQ号码，必须填写
@@ -21,7 +21,7 @@ def query_qq_info(mcp: FastMCP):
         }
         try:
             logger.info(f"开始查询QQ {qq_number} 信息...")
-            response = requests.get(url, headers=headers, timeout=5)
+            response = await http_get(url, headers=headers, timeout=5)
             response.raise_for_status()
             data = response.json()
             if data["code"] == 200:
@@ -41,11 +41,11 @@ def query_qq_info(mcp: FastMCP):
                         "VIP等级": message["vip_level"] if message["vip_level"] else "无"
                     }
                 }
-                logger.info(f"成功获取信息: {result}") 
+                logger.info("成功获取信息: %s", result) 
                 return {"success": True, "result": result}
             else:
                 logger.error(f"获取失败状态码：{data['code']}")
                 return {"success": False, "result": f"获取QQ信息失败，状态码: {data['code']}"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"无法访问链接：{e}")
             return {"success": False, "result": f"无法访问链接：{e}"}
\ No newline at end of file
@@ -1,55 +1,101 @@
-import os
-import json
+import re
 import logging
-import requests
 from config.loader import load_config
+from utils.http_client import http_get, HTTP_ERRORS
+from utils.railway.station_index import save_dataset
 
 config = load_config()
 logger = logging.getLogger('中国铁路')
 
-def get_china_city_data() -> dict:
-    # 获取城市数据
-    url = "https://kyfw.12306.cn/otn/resources/js/framework/station_name.js?station_version=1.9053"
+STATION_URL = "https://kyfw.12306.cn/otn/resources/js/framework/station_name.js"
+# 余票查询页面，页面中引用的 station_name.js 带有当前的车站数据版本号
+INIT_URL = "https://kyfw.12306.cn/otn/leftTicket/init"
+# station_name.js 中每个车站的字段：拼音简码、站名、电报码、拼音、拼音首字母、序号、城市代码、城市名
+FIELDS = ('abbr', 'name', 'code', 'pinyin', 'short', 'index', 'city_code', 'city')
+
+STATION_CONFIG = config['railway']['china'].get('stations', {}) or {}
+DEFAULT_VERSION = str(STATION_CONFIG.get('version', '1.9053'))
+
+def parse_station_names(data: str) -> list:
+    """解析 station_name.js，每个车站返回一个包含全部字段的元组"""
+    # 数据格式为 var station_names ='@bjb|北京北|VAP|beijingbei|bjb|0|0357|北京|||@...';
+    if "'" in data:
+        data = data.split("'")[1]
+    stations = []
+    for item in data.split('@'):
+        fields = item.split('|')
+        if len(fields) < 3 or not fields[2]:
+            continue
+        fields = (fields + [''] * len(FIELDS))[:len(FIELDS)]
+        fields[1] = fields[1].replace(" ", "")
+        stations.append(tuple(fields))
+    return stations
+
+async def get_station_version() -> str:
+    """从余票查询页面获取当前车站数据版本号，获取失败时返回 None"""
+    headers = {
+        'User-Agent': config['http_headers']['user_agent']
+    }
+    try:
+        res = await http_get(INIT_URL, headers=headers, timeout=10)
+        res.raise_for_status()
+    except HTTP_ERRORS as e:
+        logger.warning(f"获取车站数据版本失败: {e}")
+        return None
+    match = re.search(r'station_name\.js\?station_version=([\d.]+)', res.text)
+    return match.group(1) if match else None
+
+async def get_china_city_data(current: dict = None) -> dict:
+    """获取车站数据并保存，current 为本地已有数据的版本信息，未变化时不重新下载"""
+    current = current or {}
     logger.info("正在获取城市数据...")
+    version = await get_station_version() or current.get('version') or DEFAULT_VERSION
     # 设置请求头，从配置文件获取User-Agent
     headers = {
         'User-Agent': config['http_headers']['user_agent']
     }
+    # 版本号没变时带上校验信息，数据未更新时服务器返回 304
+    if version == current.get('version'):
+        if current.get('etag'):
+            headers['If-None-Match'] = current['etag']
+        if current.get('last_modified'):
+            headers['If-Modified-Since'] = current['last_modified']
     # 发送请求，获取返回的数据
     try:
-        res = requests.get(url, headers=headers, timeout=10)
+        res = await http_get(STATION_URL, params={'station_version': version}, headers=headers, timeout=10)
         res.raise_for_status()  # 检查请求是否成功
-        data = str(res.content, encoding="utf8")
-    except requests.exceptions.RequestException as e:
+    except HTTP_ERRORS as e:
         error_msg = f"请求失败: {e}"
         logger.error(error_msg)
         return {
             "success": False,
             "result": error_msg
         }
-    # 格式化返回的数据
-    dict_data = dict()
-    # 根据'|'分隔数据
-    list_data = data.split('|')
-    # 从下标'1'开始, 每间隔5个为字典key
-    result_x = list_data[1:len(list_data):5]
-    # 从下标'2'开始, 每间隔5个为字典value
-    result_y = list_data[2:len(list_data):5]
-    # 循环将数据写入字典
-    for i in range(len(result_x)):
-        dict_data[result_x[i].replace(" ", "")] = result_y[i]
-    # 保存数据
-    json_data = json.dumps(dict_data, indent=1, ensure_ascii=False)
-    # 创建tmp目录
-    cache_dir = os.path.join(os.getcwd(), 'tmp')
-    os.makedirs(cache_dir, exist_ok=True)
-    # 保存文件到tmp目录
-    cache_file = os.path.join(cache_dir, 'city_data.json')
-    # 显式指定编码为utf-8
+    meta = {
+        'version': version,
+        'etag': res.headers.get('ETag', current.get('etag', '')),
+        'last_modified': res.headers.get('Last-Modified', current.get('last_modified', ''))
+    }
+    if res.status_code == 304:
+        save_dataset(None, meta)
+        msg = "城市数据没有更新"
+        logger.info(msg)
+        return {
+            "success": True,
+            "result": msg
+        }
+    stations = parse_station_names(str(res.content, encoding="utf8"))
+    if not stations:
+        error_msg = "城市数据格式不符合预期"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "result": error_msg
+        }
+    # 保存车站数据，替换内存中的索引
     try:
-        with open(cache_file, 'w', encoding='utf-8') as w:
-            w.write(json_data)
-        msg = "城市数据保存完成！"
+        save_dataset(stations, meta)
+        msg = f"城市数据保存完成！版本 {version}，共 {len(stations)} 个车站"
         logger.info(msg)
         return {
             "success": True,
@@ -0,0 +1,153 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from config.loader import load_config
+from utils.http_client import http_get
+
+config = load_config()
+logger = logging.getLogger('中国铁路')
+
+LEFT_TICKET_URL = 'https://kyfw.12306.cn/otn/leftTicket/queryU'
+
+QUERY_CONFIG = config['railway']['china'].get('left_ticket', {}) or {}
+# 同时发往 12306 的余票查询数量上限，按城市查询和中转查询会并发查询多个区间
+CONCURRENCY = QUERY_CONFIG.get('concurrency', 8)
+# 区间查询结果的缓存时间（秒）和数量上限，短时间内重复查询同一区间直接复用
+CACHE_TTL = QUERY_CONFIG.get('cache_ttl', 60)
+CACHE_SIZE = QUERY_CONFIG.get('cache_size', 256)
+
+# 余票结果中各字段的位置
+TRAIN_NUMBER = 3
+FROM_STATION = 6
+TO_STATION = 7
+START_TIME = 8
+ARRIVE_TIME = 9
+DURATION = 10
+# 座位字段：商务座、一等座、二等座、硬座、无座、软卧、硬卧
+SEATS = {'商务座': 32, '一等座': 31, '二等座': 30, '硬座': 29, '无座': 26, '软卧': 23, '硬卧': 28}
+NO_SEAT = 26
+# 动车组列车：高铁、动车和城际，座位为商务座、一等座和二等座（字段 30 之后），其他列车为硬座和卧铺
+EMU_TYPES = ('G', 'D', 'C')
+
+_semaphore = asyncio.Semaphore(CONCURRENCY)
+# 区间查询缓存：(日期, 出发站电报码, 到达站电报码) -> (过期时间, 结果)
+_cache = OrderedDict()
+# 正在查询的区间，同一区间并发查询时只请求一次
+_in_flight = {}
+
+def city_to_unicode(city: str) -> str:
+    """把站名转换为 12306 Cookie 中使用的 %uXXXX 编码"""
+    return ''.join([f'%u{ord(c):04x}' for c in city])
+
+def _build_headers(train_date: str, from_station: str, from_code: str, to_station: str, to_code: str) -> dict:
+    """按配置拼接 12306 余票查询需要的 Cookie"""
+    china = config['railway']['china']
+    cookie_config = china['cookie']
+    guides_status = 'on' if china['guides_status'] else 'off'
+    cursor_status = 'on' if china['cursor_status'] else 'off'
+    cookie = '; '.join([
+        f"_uab_collina={cookie_config['_uab_collina']};JSESSIONID={cookie_config['JSESSIONID']}",
+        f"guidesStatus={guides_status}",
+        f"highContrastMode={china['high_contrast_mode']}",
+        f"cursorStatus={cursor_status}",
+        f"_jc_save_fromDate={train_date}",
+        f"_jc_save_toDate={train_date}",
+        f"_jc_save_wfdc_flag={china['jc_save_wfdc_flag']}",
+        f"route={cookie_config['route']}",
+        f"BIGipServerotn={cookie_config['BIGipServerotn']}",
+        f"BIGipServerportal={cookie_config['BIGipServerportal']}",
+        f"BIGipServerpassport={cookie_config['BIGipServerpassport']}",
+        f"_jc_save_fromStation={city_to_unicode(from_station)}%2C{from_code}",
+        f"_jc_save_toStation={city_to_unicode(to_station)}%2C{to_code}"
+    ])
+    return {
+        'Cookie': cookie,
+        'User-Agent': config['http_headers']['user_agent']
+    }
+
+async def _fetch(train_date: str, from_station: str, from_code: str, to_station: str, to_code: str) -> list:
+    url = f'{LEFT_TICKET_URL}?leftTicketDTO.train_date={train_date}&leftTicketDTO.from_station={from_code}&leftTicketDTO.to_station={to_code}&purpose_codes=ADULT'
+    headers = _build_headers(train_date, from_station, from_code, to_station, to_code)
+    async with _semaphore:
+        response = await http_get(url=url, headers=headers, timeout=15)
+    response.raise_for_status()  # 检查请求是否成功
+    json_data = response.json()
+    # 检查返回数据结构
+    if 'data' not in json_data or 'result' not in json_data['data']:
+        logger.debug(f"响应内容: {response.text[:500]}...")  # 打印部分响应
+        raise ValueError("服务器返回的数据结构不符合预期")
+    return json_data['data']['result']
+
+async def query_left_ticket(train_date: str, from_station: str, from_code: str, to_station: str, to_code: str) -> list:
+    """查询两站之间的余票，返回按字段拆分后的列车列表
+    结果短时间缓存，同一区间同时查询时只请求一次"""
+    key = (train_date, from_code, to_code)
+    entry = _cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        _cache.move_to_end(key)
+        return entry[1]
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(train_date, from_station, from_code, to_station, to_code))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    result = await asyncio.shield(task)
+    logger.debug("服务器返回：%s", result)
+    trains = [row.replace('有', 'Yes').replace('无', 'No').split('|') for row in result]
+    _cache[key] = (time.monotonic() + CACHE_TTL, trains)
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return trains
+
+async def query_station_pairs(train_date: str, from_stations: list, to_stations: list, codes: dict) -> list:
+    """同时查询出发站和到达站的所有组合，按车次去重后按出发时间排序
+    部分组合失败时忽略，全部失败时抛出第一个错误"""
+    pairs = [(a, b) for a in from_stations for b in to_stations if a != b]
+    results = await asyncio.gather(
+        *(query_left_ticket(train_date, a, codes[a], b, codes[b]) for a, b in pairs),
+        return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    trains = {}
+    for (a, b), result in zip(pairs, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"查询 {train_date} {a} 到 {b} 失败: {result}")
+            continue
+        for fields in result:
+            trains.setdefault(fields[TRAIN_NUMBER], fields)
+    if len(pairs) == 1:
+        return list(trains.values())
+    return sorted(trains.values(), key=lambda fields: fields[START_TIME])
+
+def format_seat_info(seat_status):
+    """格式化座位信息"""
+    if seat_status == 'Yes' or seat_status == '有':
+        return '很多'
+    elif seat_status == 'No' or seat_status == '无' or seat_status == '':
+        return '-'
+    return seat_status
+
+def is_emu(train_number: str) -> bool:
+    """是否为动车组列车（G、D、C 开头的车次）"""
+    return train_number[:1] in EMU_TYPES
+
+def format_seats(fields: list) -> dict:
+    """按车型整理各类座位余票，动车组只有商务座、一等座、二等座和无座，普通列车只有硬座、无座和卧铺"""
+    emu = is_emu(fields[TRAIN_NUMBER])
+    return {
+        name: format_seat_info(fields[index]) if index == NO_SEAT or (index >= 30) == emu else '-'
+        for name, index in SEATS.items()
+    }
+
+def has_ticket(fields: list) -> bool:
+    """列车是否还有任意一类座位的余票"""
+    return any(value != '-' for value in format_seats(fields).values())
+
+def parse_duration(duration: str) -> int:
+    """把历时 HH:MM 转换为分钟"""
+    hours, _, minutes = duration.partition(':')
+    return int(hours) * 60 + int(minutes or 0)
\ No newline at end of file
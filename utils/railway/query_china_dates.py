@@ -0,0 +1,124 @@
+import logging
+import asyncio
+from datetime import datetime, timedelta
+from config.loader import load_config
+from mcp.server.fastmcp import FastMCP
+from utils.railway.station_index import load_station_index, resolve_stations
+from utils.railway.left_ticket import query_station_pairs, format_seats, TRAIN_NUMBER, START_TIME
+
+config = load_config()
+logger = logging.getLogger('中国铁路')
+
+# 12306 最多预售 15 天内的车票
+MAX_DAYS = 15
+WEEKDAYS = ('周一', '周二', '周三', '周四', '周五', '周六', '周日')
+DATES_CONFIG = config['railway']['china'].get('dates', {}) or {}
+# 每次调用最多发出的余票查询数量（区间数 × 天数），超出时减少每个城市查询的车站，仍超出时减少天数
+MAX_REQUESTS = DATES_CONFIG.get('max_requests', 30)
+
+def limit_requests(from_stations: list, to_stations: list, dates: list) -> tuple:
+    """按请求数量上限裁剪出发站、到达站和日期，车站按优先顺序从末尾去掉，返回裁剪后的三个列表"""
+    from_stations, to_stations = list(from_stations), list(to_stations)
+    while len(from_stations) * len(to_stations) * len(dates) > MAX_REQUESTS:
+        if len(from_stations) == len(to_stations) == 1:
+            dates = dates[:max(MAX_REQUESTS, 1)]
+            break
+        if len(from_stations) >= len(to_stations):
+            from_stations.pop()
+        else:
+            to_stations.pop()
+    return from_stations, to_stations, dates
+
+def summarize_trains(trains: list) -> dict:
+    """把一天的列车整理为余票概况：列车数、有票列车数、最早有票的车次以及各类座位有票的列车数"""
+    seats = {}
+    available = []
+    for fields in trains:
+        train_seats = [name for name, value in format_seats(fields).items() if value != '-']
+        for name in train_seats:
+            seats[name] = seats.get(name, 0) + 1
+        if train_seats:
+            available.append(fields)
+    earliest = min(available, key=lambda fields: fields[START_TIME], default=None)
+    return {
+        '列车': len(trains),
+        '有票': len(available),
+        '最早有票': f"{earliest[TRAIN_NUMBER]} {earliest[START_TIME]}" if earliest else '-',
+        '有票座位': seats
+    }
+
+def query_china_ticket_dates(mcp: FastMCP):
+    """注册中国铁路多日期余票查询工具"""
+    @mcp.tool()
+    async def query_china_ticket_dates(from_station: str, to_station: str, start_date: str = None, days: int = 7) -> list:
+        """查询中国铁路连续多天的余票概况，用于回答“这周哪天有票”“最近几天哪天还有座位”这类问题。
+        同时查询每一天的余票，每天只返回概况，需要某一天的具体车次时再使用 query_china_train_info 查询。
+        每次调用的余票请求数量（车站组合数 × 天数）有上限，城市有多个车站时天数越多，每个城市查询的主要车站越少。
+        Args:
+            from_station (str): 出发城市或车站名称
+            to_station (str): 到达城市或车站名称
+            start_date (str, optional): 开始日期，格式为'YYYY-MM-DD'。如果未提供，默认为今天。
+            days (int, optional): 连续查询的天数，默认为 7 天，最多 15 天。
+        Returns:
+            list: 每天一个字典，包含以下键值：
+                - '日期': 出行日期
+                - '星期': 星期几
+                - '列车': 当天的列车数量
+                - '有票': 还有余票的列车数量
+                - '最早有票': 最早一趟有票列车的车次和出发时间，'-' 表示全部无票
+                - '有票座位': 各类座位还有余票的列车数量
+                查询失败的日期包含 '错误' 键，如果参数错误，返回包含错误信息的列表。
+        """
+        try:
+            today = datetime.today().date()
+            first_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else today
+        except ValueError as e:
+            msg = f"参数错误: {e}"
+            logger.error(msg)
+            return [msg]
+        # 只查询预售期内的日期
+        first_date = max(first_date, today)
+        last_date = min(first_date + timedelta(days=max(days, 1)), today + timedelta(days=MAX_DAYS))
+        dates = [first_date + timedelta(days=offset) for offset in range((last_date - first_date).days)]
+        if not dates:
+            msg = f"错误：只能查询今天起 {MAX_DAYS} 天内的车票"
+            logger.error(msg)
+            return [msg]
+        logger.info(f"开始查询 {dates[0]} 起 {len(dates)} 天 {from_station} 到 {to_station} 的余票概况...")
+        try:
+            city_json, _ = await load_station_index()
+        except Exception as e:
+            error_msg = f"处理过程中发生错误: {e}"
+            logger.error(error_msg)
+            return [error_msg]
+        from_stations = resolve_stations(from_station)
+        to_stations = resolve_stations(to_station)
+        if not from_stations:
+            msg = f"错误：未找到出发城市 '{from_station}' 的代码"
+            logger.error(msg)
+            return [msg]
+        if not to_stations:
+            msg = f"错误：未找到到达城市 '{to_station}' 的代码"
+            logger.error(msg)
+            return [msg]
+        limited = limit_requests(from_stations, to_stations, dates)
+        if limited != (from_stations, to_stations, dates):
+            from_stations, to_stations, dates = limited
+            logger.info(f"余票请求超过 {MAX_REQUESTS} 个，只查询 {from_stations} 到 {to_stations} 的 {len(dates)} 天")
+        # 所有日期同时查询，请求数量由余票查询的并发上限控制，结果按日期短时间缓存
+        results = await asyncio.gather(
+            *(query_station_pairs(date.isoformat(), from_stations, to_stations, city_json) for date in dates),
+            return_exceptions=True
+        )
+        summary = []
+        for date, trains in zip(dates, results):
+            day = {'日期': date.isoformat(), '星期': WEEKDAYS[date.weekday()]}
+            if isinstance(trains, Exception):
+                # 单日失败不影响其他日期
+                logger.warning(f"查询 {date} 的余票失败: {trains}")
+                day['错误'] = "请求超时" if isinstance(trains, asyncio.TimeoutError) else f"请求异常: {trains}"
+            else:
+                day.update(summarize_trains(trains))
+            summary.append(day)
+        logger.info(f"返回 {len(summary)} 天的余票概况")
+        return summary
\ No newline at end of file
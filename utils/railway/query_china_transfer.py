@@ -0,0 +1,198 @@
+import time
+import logging
+import asyncio
+from datetime import datetime, timedelta
+from config.loader import load_config
+from mcp.server.fastmcp import FastMCP
+from utils.http_client import HTTP_ERRORS
+from utils.railway.station_index import load_station_index, resolve_stations
+from utils.railway.left_ticket import query_station_pairs, format_seats, has_ticket, parse_duration
+from utils.railway.left_ticket import TRAIN_NUMBER, FROM_STATION, TO_STATION, START_TIME, DURATION
+
+config = load_config()
+logger = logging.getLogger('中国铁路')
+
+# 从配置获取中转设置
+TRANSFER_CONFIG = config['railway']['china'].get('transfer', {}) or {}
+HUBS = TRANSFER_CONFIG.get('hubs', []) or []
+MAX_HUBS = TRANSFER_CONFIG.get('max_hubs', 12)
+MIN_MINUTES = TRANSFER_CONFIG.get('min_minutes', 30)
+CROSS_STATION_MINUTES = TRANSFER_CONFIG.get('cross_station_minutes', 90)
+MAX_MINUTES = TRANSFER_CONFIG.get('max_minutes', 240)
+MAX_RESULTS = TRANSFER_CONFIG.get('max_results', 10)
+# 每个城市（出发、到达和枢纽）最多查询的车站数量，每程的请求数为两端车站数的乘积
+STATIONS_PER_CITY = TRANSFER_CONFIG.get('stations_per_city', 1)
+
+def _schedule(fields: list, train_date: datetime) -> tuple:
+    """计算列车在查询区间的出发和到达时间，停运等无法解析的列车返回 None"""
+    try:
+        hour, minute = fields[START_TIME].split(':')
+        depart = train_date + timedelta(hours=int(hour), minutes=int(minute))
+        return depart, depart + timedelta(minutes=parse_duration(fields[DURATION]))
+    except ValueError:
+        return None
+
+def _needs_next_day(trains: list, train_date: datetime) -> bool:
+    """是否有列车到达后的可换乘时间跨过零点，需要再查第二天的第二程"""
+    for fields in trains:
+        schedule = _schedule(fields, train_date)
+        if schedule and (schedule[1] + timedelta(minutes=MAX_MINUTES)).date() > train_date.date():
+            return True
+    return False
+
+def _format_minutes(minutes: int) -> str:
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}小时{minutes}分钟" if hours else f"{minutes}分钟"
+
+def _leg_info(fields: list, depart: datetime, arrive: datetime, station_names: dict) -> dict:
+    """整理一程列车的信息"""
+    return {
+        '车次': fields[TRAIN_NUMBER],
+        '出发站': station_names.get(fields[FROM_STATION], fields[FROM_STATION]),
+        '到达站': station_names.get(fields[TO_STATION], fields[TO_STATION]),
+        '出发时间': depart.strftime('%m-%d %H:%M'),
+        '到达时间': arrive.strftime('%m-%d %H:%M'),
+        '历时': fields[DURATION],
+        **format_seats(fields)
+    }
+
+def join_legs(first_legs: list, second_legs: list, train_date: datetime) -> list:
+    """把第一程和第二程列车按换乘时间拼接，每趟第一程只保留一个最合适的第二程
+    second_legs 为 (日期, 列车列表) 的列表，返回 (是否有票, 总分钟数, 换乘分钟数, 第一程, 第二程) 的列表"""
+    departures = []
+    for date, trains in second_legs:
+        for fields in trains:
+            schedule = _schedule(fields, date)
+            if schedule:
+                departures.append((fields, *schedule))
+    routes = []
+    for first in first_legs:
+        schedule = _schedule(first, train_date)
+        if not schedule:
+            continue
+        depart, arrive = schedule
+        best = None
+        for second, second_depart, second_arrive in departures:
+            if second[TRAIN_NUMBER] == first[TRAIN_NUMBER]:
+                continue
+            # 同站换乘和同城换站需要的时间不同
+            min_minutes = MIN_MINUTES if second[FROM_STATION] == first[TO_STATION] else CROSS_STATION_MINUTES
+            wait = (second_depart - arrive).total_seconds() // 60
+            if not min_minutes <= wait <= MAX_MINUTES:
+                continue
+            # 优先有票，其次尽早到达
+            candidate = (not has_ticket(second), second_arrive)
+            if best is None or candidate < best[0]:
+                best = (candidate, second, second_depart, second_arrive, int(wait))
+        if best is None:
+            continue
+        _, second, second_depart, second_arrive, wait = best
+        available = has_ticket(first) and has_ticket(second)
+        total = int((second_arrive - depart).total_seconds() // 60)
+        routes.append((available, total, wait, (first, depart, arrive), (second, second_depart, second_arrive)))
+    return routes
+
+def query_china_transfer_info(mcp: FastMCP):
+    """注册中国铁路中转查询工具"""
+    @mcp.tool()
+    async def query_china_transfer_info(from_station: str, to_station: str, train_date: str = None, via_station: str = None) -> list:
+        """查询中国铁路中转换乘方案，两个城市之间没有直达列车或直达无票时，查询途中换乘一次的列车组合。
+        会在多个枢纽城市同时查询两程余票，按换乘时间拼接后，优先返回有票且总耗时最短的方案。
+        Args:
+            from_station (str): 出发城市或车站名称
+            to_station (str): 到达城市或车站名称
+            train_date (str, optional): 出行日期，格式为'YYYY-MM-DD'。如果未提供，默认为今天。
+            via_station (str, optional): 指定的换乘城市或车站名称，未提供时自动在常用枢纽城市中查找。
+        Returns:
+            list: 换乘方案列表，每个方案包含以下键值：
+                - '中转站': 换乘车站，同城换站时为两个车站
+                - '总耗时': 从第一程出发到第二程到达的总时间
+                - '换乘等待': 两程之间的等待时间
+                - '是否有票': 两程是否都有余票
+                - '第一程' / '第二程': 车次、出发站、到达站、出发时间、到达时间、历时以及各类座位的余票情况，'-' 表示无余票
+                如果查询失败，返回包含错误信息的列表。
+        """
+        try:
+            # 如果未提供出行日期，则默认为今天
+            if train_date is None:
+                train_date = datetime.today().strftime('%Y-%m-%d')
+            logger.info(f"开始查询 {train_date} {from_station} 到 {to_station} 的中转方案...")
+            city_json, station_names = await load_station_index()
+            # 城市名解析为主要车站，和单站查询、多日期查询使用同样的规则
+            stations = {}
+            for name, label in ((from_station, '出发'), (to_station, '到达'), (via_station, '换乘')):
+                if name:
+                    stations[name] = resolve_stations(name)[:STATIONS_PER_CITY]
+                    if not stations[name]:
+                        msg = f"错误：未找到{label}城市 '{name}' 的代码"
+                        logger.error(msg)
+                        return [msg]
+            from_stations, to_stations = stations[from_station], stations[to_station]
+            if via_station:
+                hubs = [stations[via_station]]
+            else:
+                # 跳过与出发、到达城市相同的枢纽
+                endpoints = set(from_stations + to_stations)
+                hubs = [resolve_stations(hub)[:STATIONS_PER_CITY] for hub in HUBS]
+                hubs = [hub for hub in hubs if hub and not endpoints.intersection(hub)][:MAX_HUBS]
+            first_date = datetime.strptime(train_date, '%Y-%m-%d')
+            next_date = (first_date + timedelta(days=1)).strftime('%Y-%m-%d')
+            start = time.perf_counter()
+
+            async def query_leg(date: str, leg_from: list, leg_to: list) -> list:
+                """查询一程两端车站组合的余票，单程失败不影响其他枢纽"""
+                try:
+                    return await query_station_pairs(date, leg_from, leg_to, city_json)
+                except (*HTTP_ERRORS, ValueError) as e:
+                    logger.warning(f"查询 {date} {leg_from} 到 {leg_to} 失败: {e}")
+                    return []
+
+            # 所有枢纽的两程同时查询
+            legs = await asyncio.gather(*(
+                query_leg(train_date, *pair)
+                for hub in hubs
+                for pair in ((from_stations, hub), (hub, to_stations))
+            ))
+            first_legs, second_legs = legs[0::2], legs[1::2]
+            # 第一程跨过零点到达的枢纽，再补查第二天的第二程
+            late_hubs = [index for index, trains in enumerate(first_legs) if _needs_next_day(trains, first_date)]
+            next_legs = await asyncio.gather(*(query_leg(next_date, hubs[index], to_stations) for index in late_hubs))
+            next_legs = dict(zip(late_hubs, next_legs))
+            routes = []
+            for index in range(len(hubs)):
+                seconds = [(first_date, second_legs[index])]
+                if index in next_legs:
+                    seconds.append((first_date + timedelta(days=1), next_legs[index]))
+                routes.extend(join_legs(first_legs[index], seconds, first_date))
+            logger.info(f"查询了 {len(hubs)} 个枢纽共 {len(legs) + len(next_legs)} 个区间，找到 {len(routes)} 个方案，耗时 {time.perf_counter() - start:.2f} 秒")
+            if not routes:
+                msg = f"未查询到 {from_station} 到 {to_station} 换乘一次的列车方案，可以指定其他换乘城市再试"
+                logger.info(msg)
+                return [msg]
+            # 有票的方案优先，其次按总耗时排序
+            routes.sort(key=lambda route: (not route[0], route[1]))
+            result = []
+            for available, total, wait, first, second in routes[:MAX_RESULTS]:
+                first_info = _leg_info(*first, station_names)
+                second_info = _leg_info(*second, station_names)
+                transfer = first_info['到达站']
+                if second_info['出发站'] != transfer:
+                    transfer = f"{transfer}→{second_info['出发站']}"
+                result.append({
+                    '中转站': transfer,
+                    '总耗时': _format_minutes(total),
+                    '换乘等待': _format_minutes(wait),
+                    '是否有票': '有' if available else '无',
+                    '第一程': first_info,
+                    '第二程': second_info
+                })
+            logger.info(f"返回 {len(result)} 个中转方案")
+            return result
+        except ValueError as e:
+            error_msg = f"参数错误: {e}"
+            logger.error(error_msg)
+            return [error_msg]
+        except Exception as e:
+            error_msg = f"处理过程中发生错误: {e}"
+            logger.error(error_msg)
+            return [error_msg]
\ No newline at end of file
@@ -0,0 +1,145 @@
+import os
+import time
+import asyncio
+import marshal
+import logging
+from config.loader import load_config
+
+config = load_config()
+logger = logging.getLogger('中国铁路')
+
+# 车站数据文件，以 marshal 格式保存全部车站字段和版本信息，加载比 JSON 更快
+DATA_FILE = os.path.join(os.getcwd(), 'tmp', 'station_data.bin')
+# 旧版本的车站数据文件，只有站名和电报码，无法迁移，保存新数据后删除
+LEGACY_FILES = (
+    os.path.join(os.getcwd(), 'tmp', 'city_data.json'),
+    os.path.join(os.getcwd(), 'tmp', 'station_index.bin')
+)
+
+STATION_CONFIG = config['railway']['china'].get('stations', {}) or {}
+# 车站数据检查更新的间隔
+REFRESH_INTERVAL = STATION_CONFIG.get('refresh_interval', 86400)
+# 按城市查询时每个城市最多使用的车站数量
+MAX_CITY_STATIONS = STATION_CONFIG.get('max_city_stations', 5)
+# 后台检查失败后再次尝试的间隔
+RETRY_INTERVAL = 300
+
+# 内存中的车站索引：(站名 -> 电报码, 电报码 -> 站名)
+_index = None
+# 全部车站记录，字段见 get_china_city.FIELDS
+_stations = []
+# 城市名 -> 该城市的站名列表
+_cities = {}
+# 车站数据的版本号、ETag、Last-Modified 以及上次检查更新的时间
+_meta = {}
+# 后台更新任务及上次尝试时间
+_refresh_task = None
+_last_attempt = 0
+# 首次下载车站数据时加锁，并发查询只下载一次
+_download_lock = asyncio.Lock()
+
+def build_index(stations: list) -> tuple:
+    """根据车站记录生成双向索引，同名车站或同一电报码对应多个站名时保留第一个"""
+    names, codes = {}, {}
+    for station in stations:
+        names.setdefault(station[1], station[2])
+        codes.setdefault(station[2], station[1])
+    return names, codes
+
+def build_cities(stations: list) -> dict:
+    """按城市分组车站，与城市同名的车站排在最前，其次是以城市名开头的较短站名，如北京南、北京西"""
+    cities = {}
+    for station in stations:
+        if station[7]:
+            cities.setdefault(station[7], []).append(station[1])
+    for city, names in cities.items():
+        names.sort(key=lambda name: (name != city, not name.startswith(city), len(name)))
+    return cities
+
+def save_dataset(stations: list, meta: dict):
+    """保存车站数据并替换内存中的索引，stations 为 None 时只更新版本信息
+    先写临时文件再替换，查询时不会读到写了一半的文件"""
+    global _index, _stations, _cities, _meta
+    if stations is None:
+        stations = _stations
+    meta = {**meta, 'checked_at': int(time.time())}
+    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
+    temp_file = DATA_FILE + '.tmp'
+    with open(temp_file, 'wb') as f:
+        f.write(marshal.dumps({'meta': meta, 'stations': stations}))
+    os.replace(temp_file, DATA_FILE)
+    _index, _stations, _cities, _meta = build_index(stations), stations, build_cities(stations), meta
+    for legacy_file in LEGACY_FILES:
+        try:
+            os.remove(legacy_file)
+            logger.info(f"已删除旧版本的车站数据文件: {legacy_file}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"删除旧版本的车站数据文件失败: {e}")
+
+def read_dataset() -> bool:
+    """从文件加载车站数据，文件不存在或损坏时返回 False"""
+    global _index, _stations, _cities, _meta
+    try:
+        with open(DATA_FILE, 'rb') as f:
+            data = marshal.loads(f.read())
+        stations, meta = data['stations'], data['meta']
+    except FileNotFoundError:
+        return False
+    except (EOFError, ValueError, TypeError, KeyError) as e:
+        logger.warning(f"车站数据文件损坏，将重新获取: {e}")
+        return False
+    _index, _stations, _cities, _meta = build_index(stations), stations, build_cities(stations), meta
+    return True
+
+def get_stations() -> list:
+    """已加载的全部车站记录"""
+    return _stations
+
+def resolve_stations(name: str) -> list:
+    """把城市名或站名解析为要查询的站名列表，城市名返回该城市的主要车站，未找到时返回空列表"""
+    city = name.removesuffix('市')
+    if city in _cities:
+        return _cities[city][:MAX_CITY_STATIONS]
+    if _index and name in _index[0]:
+        return [name]
+    return []
+
+async def _refresh():
+    from utils.railway.get_china_city import get_china_city_data
+    try:
+        result = await get_china_city_data(dict(_meta))
+    except Exception as e:
+        logger.warning(f"后台更新车站数据失败: {e}")
+        return
+    # 失败时继续使用当前数据，检查时间不变，重试间隔过后再次尝试
+    if not result.get("success", False):
+        logger.warning(f"后台更新车站数据失败: {result.get('result', '未知错误')}")
+
+def _schedule_refresh():
+    """车站数据到期时在后台检查更新，查询继续使用当前数据"""
+    global _refresh_task, _last_attempt
+    if time.time() - _meta.get('checked_at', 0) < REFRESH_INTERVAL:
+        return
+    if _refresh_task is not None and not _refresh_task.done():
+        return
+    if _last_attempt and time.monotonic() - _last_attempt < RETRY_INTERVAL:
+        return
+    _last_attempt = time.monotonic()
+    _refresh_task = asyncio.create_task(_refresh())
+
+async def load_station_index() -> tuple:
+    """加载车站双向索引，依次使用内存、数据文件，都没有时才等待下载车站数据"""
+    if _index is None:
+        async with _download_lock:
+            if _index is None and not read_dataset():
+                # 延迟导入，避免两个模块互相导入
+                from utils.railway.get_china_city import get_china_city_data
+                result = await get_china_city_data()
+                if not result.get("success", False):
+                    error_msg = f"获取城市数据失败: {result.get('result', '未知错误')}"
+                    logger.error(error_msg)
+                    raise Exception(error_msg)
+    _schedule_refresh()
+    return _index
\ No newline at end of file
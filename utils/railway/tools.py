@@ -1,6 +1,8 @@
 import logging
 from mcp.server.fastmcp import FastMCP
 from utils.railway.query_china_ticket import query_china_train_info
+from utils.railway.query_china_dates import query_china_ticket_dates
+from utils.railway.query_china_transfer import query_china_transfer_info
 
 def register_railway_tools(mcp: FastMCP):
     """集中注册所有铁路相关工具"""
@@ -8,4 +10,8 @@ def register_railway_tools(mcp: FastMCP):
     logger.info("准备注册铁路工具...")
     # 获取中国铁路的信息
     query_china_train_info(mcp)
+    # 查询中国铁路的中转换乘方案
+    query_china_transfer_info(mcp)
+    # 查询中国铁路连续多天的余票概况
+    query_china_ticket_dates(mcp)
     logger.info("注册完成")
\ No newline at end of file
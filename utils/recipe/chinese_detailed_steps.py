@@ -6,7 +6,7 @@ logger = logging.getLogger('中餐详细步骤')
 
 def get_chinese_detailed_steps(mcp: FastMCP):
     @mcp.tool()
-    def get_chinese_detailed_steps(url: str) -> dict:        
+    async def get_chinese_detailed_steps(url: str) -> dict:        
         """根据菜谱链接获取详细的步骤信息。
         当用户询问某中餐菜谱的详细做法步骤时，立刻使用该工具。  
         Args:
@@ -29,7 +29,7 @@ def get_chinese_detailed_steps(mcp: FastMCP):
                 error_msg = f'无效的菜谱链接格式: {url}'                
                 logger.error(error_msg)                
                 return {"success": False, "result": error_msg}            
-            details = get_chinese_recipe_details(url)            
+            details = await get_chinese_recipe_details(url)            
             if details:                
                 logger.info("成功获取的详细步骤信息")                
                 return {                    
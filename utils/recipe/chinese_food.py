@@ -1,8 +1,8 @@
 import logging
-import requests
 from bs4 import BeautifulSoup
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get
 from utils.recipe.chinese_done_count import get_chinese_done_count
 from utils.recipe.chinese_recipe_details import get_chinese_recipe_details
 
@@ -11,7 +11,7 @@ logger = logging.getLogger('中餐菜谱')
 def get_chinese_food(mcp: FastMCP):
     """注册菜谱相关工具"""
     @mcp.tool()
-    def get_chinese_food(keyword: str , is_finished_dish: bool = False, page: int = 1) -> dict:
+    async def get_chinese_food(keyword: str , is_finished_dish: bool = False, page: int = 1) -> dict:
         """根据关键词获取中餐的菜（食）谱以及食材信息。
             只要是关于成品菜（成品菜、家常菜、快手菜等中餐）或者食材（中餐）的一律都调用该工具。
             比如当询问某一个材料（成品菜）或者是某（材料）道菜的可以做什么（菜）或者怎么做（包括做什么需要什么材料）时，立刻使用该工具。
@@ -45,14 +45,14 @@ def get_chinese_food(mcp: FastMCP):
             headers = {
                 "User-Agent": load_config()['http_headers']['user_agent']
             }
-            response = requests.get(url, headers=headers)
+            response = await http_get(url, headers=headers)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             recipe_list = soup.select('div.normal-recipe-list ul.list li div.recipe')
             if is_finished_dish:
                 recipe = max(recipe_list, key=get_chinese_done_count)
                 link = 'https://www.xiachufang.com' + recipe.select_one('a')['href']
-                details = get_chinese_recipe_details(link)
+                details = await get_chinese_recipe_details(link)
                 result = {
                     'description': recipe.select_one('p.name a').get_text(strip=True),
                     'type': '成品菜',
@@ -64,7 +64,7 @@ def get_chinese_food(mcp: FastMCP):
                     'info': recipe.select_one('div.info p.stats').text.replace('\n', '').replace('\xa0', '').replace(' ', '')
                 }
                 logger.info(f"成功获取(中餐)关键词 {keyword} 的成品菜做法")
-                logger.info(f"获取到的(中餐)菜谱: {result}")
+                logger.info("获取到的(中餐)菜谱: %s", result)
                 return {
                     "success": True,
                     "result": result
@@ -83,7 +83,7 @@ def get_chinese_food(mcp: FastMCP):
                         'link': link
                     })
                 logger.info(f"成功获取(中餐)关键词 {keyword} 的 {len(result)} 条食材信息")
-                logger.info(f"获取到的(中餐)菜谱: {result}")
+                logger.info("获取到的(中餐)菜谱: %s", result)
                 return {
                     "success": True,
                     'type': '食材',
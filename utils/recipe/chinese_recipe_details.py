@@ -1,17 +1,17 @@
 import logging
-import requests
 from bs4 import BeautifulSoup
 from config.loader import load_config
+from utils.http_client import http_get
 
 logger = logging.getLogger('中餐详情')
 
-def get_chinese_recipe_details(url: str) -> dict:
+async def get_chinese_recipe_details(url: str) -> dict:
     try:
         headers = {
             "User-Agent": load_config()['http_headers']['user_agent']
         }
         logger.info("开始获取中文菜谱详情...")
-        response = requests.get(url, headers=headers)
+        response = await http_get(url, headers=headers)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         ingredients = []
@@ -33,7 +33,7 @@ def get_chinese_recipe_details(url: str) -> dict:
             'steps': steps,
             'tips': tips
         }
-        logger.info(f"详情: {result}")
+        logger.info("详情: %s", result)
         return result
     except Exception as e:
         logger.error(f"获取菜谱详情失败: {str(e)}")
@@ -1,8 +1,8 @@
 import logging
-import requests
 from bs4 import BeautifulSoup
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get
 from utils.recipe.chinese_done_count import get_chinese_done_count
 from utils.recipe.chinese_recipe_details import get_chinese_recipe_details
 
@@ -10,7 +10,7 @@ logger = logging.getLogger('本周中餐热门菜谱')
 
 def get_chinese_weekly_popular_recipes(mcp: FastMCP):
     @mcp.tool()
-    def get_chinese_weekly_popular_recipes(get_most_done: bool = False, page: int = 1) -> dict:
+    async def get_chinese_weekly_popular_recipes(get_most_done: bool = False, page: int = 1) -> dict:
         """获取本周最受欢迎的中餐菜品。
         当用户询问“本周最受欢迎的中餐菜品”，“今天吃什么”或者“推荐中餐菜品”时，立刻使用该工具。
         Args:
@@ -37,14 +37,14 @@ def get_chinese_weekly_popular_recipes(mcp: FastMCP):
                 "User-Agent": load_config()['http_headers']['user_agent']
             }
             logger.info(f"开始获取本周热门菜谱，页码: {page}")
-            response = requests.get(url, headers=headers)
+            response = await http_get(url, headers=headers)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             recipe_list = soup.select('div.normal-recipe-list ul.list li div.recipe')
             if get_most_done:
                 recipe = max(recipe_list, key=get_chinese_done_count)
                 link = 'https://www.xiachufang.com' + recipe.select_one('a')['href']
-                details = get_chinese_recipe_details(link)
+                details = await get_chinese_recipe_details(link)
                 result = {
                     'description': recipe.select_one('p.name a').get_text(strip=True),
                     'type': '成品菜',
@@ -55,7 +55,7 @@ def get_chinese_weekly_popular_recipes(mcp: FastMCP):
                     'tips': details['tips'] if details and details['tips'] else None,
                     'info': recipe.select_one('div.info p.stats').text.replace('\n', '').replace('\xa0', '').replace(' ', '')
                 }
-                logger.info(f"获取到的(中餐)菜谱详细信息: {result}")
+                logger.info("获取到的(中餐)菜谱详细信息: %s", result)
                 return {
                     "success": True,
                     "result": result
@@ -74,7 +74,7 @@ def get_chinese_weekly_popular_recipes(mcp: FastMCP):
                         'link': link
                     })
             logger.info(f"成功获取 {len(result)} 条本周热门菜谱信息")
-            logger.info(f"获取到的(中餐)菜谱信息: {result}")
+            logger.info("获取到的(中餐)菜谱信息: %s", result)
             return {
                 "success": True,
                 "result": result
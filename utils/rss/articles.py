@@ -1,14 +1,15 @@
+import anyio
 import logging
-from config.loader import load_config
+import functools
 from mcp.server.fastmcp import FastMCP
-from utils.rss.parser import parse_rss_feeds
+from utils.rss.store import ensure_fresh, query_articles, get_rss_list
 
 logger = logging.getLogger('RSS解析')
 
 def get_rss_articles(mcp: FastMCP):
     """获取 RSS 文章"""
     @mcp.tool()
-    def get_rss_articles(rss_name=None, get_latest=True) -> dict:
+    async def get_rss_articles(rss_name=None, get_latest=True) -> dict:
         """获取指定 RSS 源的文章，若不指定则获取所有 RSS 源的文章。
         当查询文章或者rss时，立刻使用该工具。
         Args:
@@ -29,42 +30,24 @@ def get_rss_articles(mcp: FastMCP):
         """
         try:
             logger.info(f"开始获取 {'所有' if not rss_name else rss_name} RSS 文章...")
-            config = load_config()
-            # 获取所有 RSS 订阅源
-            all_rss_list = [(item['name'], item['url']) for item in config.get('rss', [])]
-            if rss_name:
-                rss_list = [item for item in all_rss_list if item[0] == rss_name]
-                if not rss_list:
-                    error_msg = f"未找到名为 {rss_name} 的 RSS 源，请检查配置文件。"
-                    logger.error(error_msg)
-                    return {"success": False, "result": error_msg}
-            else:
-                rss_list = all_rss_list
-            # 解析 RSS 订阅源
-            all_items, error = parse_rss_feeds(rss_list)
-            if error:
-                logger.error(error)
-                return {"success": False, "result": error}
-            if not all_items:
-                error_msg = "未获取到文章，请检查 RSS 源配置或网络连接。"
+            # 检查 RSS 源是否存在
+            if rss_name and rss_name not in [name for name, _ in get_rss_list()]:
+                error_msg = f"未找到名为 {rss_name} 的 RSS 源，请检查配置文件。"
+                logger.error(error_msg)
+                return {"success": False, "result": error_msg}
+            # 距离上次刷新超过间隔时先刷新文章库，刷新失败时仍然返回库中已有的文章
+            error = await ensure_fresh()
+            # 按发布时间从文章库读取最新或最早的 10 篇
+            result = await anyio.to_thread.run_sync(functools.partial(query_articles, rss_name, latest=get_latest, limit=10))
+            if not result:
+                error_msg = error or "未获取到文章，请检查 RSS 源配置或网络连接。"
                 logger.error(error_msg)
                 return {"success": False, "result": error_msg}
-            # 按发布时间排序
-            reverse = get_latest
-            sorted_items = sorted(all_items, key=lambda x: x['published'], reverse=reverse)
-            recent_items = sorted_items[:10]
-            # 转换为字典列表输出
-            result = []
-            for item in recent_items:
-                result.append({
-                    'source': item['source'],
-                    'title': item['title'],
-                    'link': item['link'],
-                    'published': item['published'].strftime('%Y-%m-%d %H:%M:%S')
-                })
+            if error:
+                logger.warning(f"刷新 RSS 文章失败，返回文章库中已有的文章: {error}")
             logger.info(f"成功获取 {'所有' if not rss_name else rss_name} RSS 文章")
             logger.info(f"共获取到 {len(result)} 条文章")
-            logger.info(f"获取到的文章: {result}")
+            logger.info("获取到的文章: %s", result)
             return {
                 "success": True,
                 "result": result
@@ -1,36 +1,85 @@
+import asyncio
 import logging
-import feedparser
 from datetime import datetime
 from config.loader import load_config
+from utils.http_client import http_get
 
 logger = logging.getLogger('RSS解析')
 
-def parse_rss_feeds(rss_list):
-    """解析所有 RSS 订阅源，获取文章信息"""
+# 单个订阅源的请求超时时间（秒），慢的订阅源不拖累其他订阅源
+FEED_TIMEOUT = 10
+
+# 各订阅源上次请求得到的 ETag、Last-Modified 和文章：url -> dict
+_feeds = {}
+
+def parse_entries(name: str, feed) -> list:
+    """提取订阅源中的文章，无法解析发布时间的文章跳过"""
+    items = []
+    for entry in feed.entries:
+        try:
+            pub_date = datetime.strptime(entry.published, '%a, %d %b %Y %H:%M:%S %z')
+            pub_date = pub_date.replace(tzinfo=None)  # 移除时区信息
+        except ValueError:
+            try:
+                pub_date = datetime.strptime(entry.published, '%a, %d %b %Y %H:%M:%S %Z')
+            except (ValueError, AttributeError):
+                continue
+        except AttributeError:
+            continue
+        items.append({
+            'source': name,
+            'title': entry.title,
+            'link': entry.link,
+            'summary': entry.get('summary', ''),
+            'published': pub_date
+        })
+    return items
+
+async def fetch_feed(name: str, url: str, headers: dict) -> list:
+    """请求并解析一个订阅源，带上次的校验信息，订阅源没有更新时服务器返回 304，直接使用上次的文章"""
+    state = _feeds.get(url)
+    request_headers = dict(headers)
+    if state:
+        if state['etag']:
+            request_headers['If-None-Match'] = state['etag']
+        if state['last_modified']:
+            request_headers['If-Modified-Since'] = state['last_modified']
+    response = await http_get(url, headers=request_headers, timeout=FEED_TIMEOUT)
+    if response.status_code == 304 and state:
+        logger.info(f"RSS 源 {name} 没有更新")
+        return state['items']
+    response.raise_for_status()
+    # feedparser 导入较慢，第一次真正解析订阅源时才导入
+    import feedparser
+    feed = feedparser.parse(response.content)
+    items = parse_entries(name, feed)
+    _feeds[url] = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'items': items
+    }
+    return items
+
+async def parse_rss_feeds(rss_list):
+    """同时解析所有 RSS 订阅源，获取文章信息
+    单个订阅源失败时跳过该订阅源，全部失败时才返回错误信息"""
     all_items = []
+    errors = []
     config = load_config()
     headers = {'User-Agent': config.get('http_headers', {}).get('user_agent', '')}
-    for name, url in rss_list:
-        try:
-            feed = feedparser.parse(url, request_headers=headers)
-            for entry in feed.entries:
-                try:
-                    pub_date = datetime.strptime(entry.published, '%a, %d %b %Y %H:%M:%S %z')
-                    pub_date = pub_date.replace(tzinfo=None)  # 移除时区信息
-                except ValueError:
-                    try:
-                        pub_date = datetime.strptime(entry.published, '%a, %d %b %Y %H:%M:%S %Z')
-                    except (ValueError, AttributeError):
-                        continue
-                all_items.append({
-                    'source': name,
-                    'title': entry.title,
-                    'link': entry.link,
-                    'published': pub_date
-                })
-        except Exception as e:
+    results = await asyncio.gather(
+        *(fetch_feed(name, url, headers) for name, url in rss_list),
+        return_exceptions=True
+    )
+    for (name, url), result in zip(rss_list, results):
+        if isinstance(result, Exception):
+            error = '请求超时' if isinstance(result, asyncio.TimeoutError) else str(result)
             # 使用日志记录错误信息
-            logger.error(f"请求 {url} 失败，错误信息: {str(e)}，跳过该 RSS 源")
-            # 返回错误状态
-            return [], f"请求 {url} 失败，错误信息: {str(e)}"
+            logger.error(f"请求 {url} 失败，错误信息: {error}，跳过该 RSS 源")
+            errors.append(f"请求 {url} 失败，错误信息: {error}")
+            continue
+        all_items.extend(result)
+    if errors and len(errors) == len(rss_list):
+        # 全部订阅源都失败时返回错误状态
+        return [], '；'.join(errors)
     return all_items, None
\ No newline at end of file
@@ -0,0 +1,75 @@
+import anyio
+import logging
+import functools
+from mcp.server.fastmcp import FastMCP
+from utils.rss.store import ensure_fresh, search_articles, get_rss_list
+
+logger = logging.getLogger('RSS解析')
+
+# 返回的摘要长度
+SUMMARY_CHARS = 100
+# 单次搜索最多返回的文章数量
+MAX_LIMIT = 20
+
+def search_rss_articles(mcp: FastMCP):
+    """搜索 RSS 文章"""
+    @mcp.tool()
+    async def search_rss_articles(keyword: str, rss_name: str = None, limit: int = 10) -> dict:
+        """按关键词搜索已收集的 RSS 文章标题和摘要，按相关度排序返回。
+        当用户想找某个主题、某个关键词相关的文章时使用该工具，只想看最新或最旧的文章时使用 get_rss_articles。
+        Args:
+            keyword (str): 搜索关键词，可以是中文、英文或多个用空格分隔的关键词（例如：'大模型 推理'）。
+            rss_name (str): 只在指定 RSS 源中搜索，可选参数，（例如：'卟言博客'）。
+            limit (int): 返回的文章数量，默认为 10，最多 20。
+        Returns:
+            dict: 包含操作结果的字典，格式为:
+                {
+                    "success": bool,  # 是否成功
+                    "result": list    # 按相关度排序的文章列表，列表中的每个元素是一个字典，包含以下字段：
+                        # 'source': RSS 源名称
+                        # 'title': 文章标题
+                        # 'link': 文章链接（
+                        不需要告诉用户，用户可以根据自己的需要自行询问是否打开这个链接
+                        如果需要请使用 'open_website' 工具来进行打开。）
+                        # 'published': 文章发布时间，格式为 '%Y-%m-%d %H:%M:%S'
+                        # 'summary': 文章摘要的开头部分
+                }
+        """
+        try:
+            logger.info(f"开始在 {'所有' if not rss_name else rss_name} RSS 文章中搜索 {keyword}...")
+            # 检查 RSS 源是否存在
+            if rss_name and rss_name not in [name for name, _ in get_rss_list()]:
+                error_msg = f"未找到名为 {rss_name} 的 RSS 源，请检查配置文件。"
+                logger.error(error_msg)
+                return {"success": False, "result": error_msg}
+            # 距离上次刷新超过间隔时先刷新文章库，新文章会同时加入全文索引
+            error = await ensure_fresh()
+            if error:
+                logger.warning(f"刷新 RSS 文章失败，在文章库中已有的文章中搜索: {error}")
+            # 查询和首次打开文章库时可能进行的全文索引重建都较慢，放到线程中执行，不阻塞事件循环
+            articles = await anyio.to_thread.run_sync(
+                functools.partial(search_articles, keyword, rss_name, limit=min(max(limit, 1), MAX_LIMIT))
+            )
+            if not articles:
+                error_msg = f"没有找到与 {keyword} 相关的文章。"
+                logger.info(error_msg)
+                return {"success": False, "result": error_msg}
+            result = []
+            for article in articles:
+                summary = article['summary']
+                result.append({
+                    'source': article['source'],
+                    'title': article['title'],
+                    'link': article['link'],
+                    'published': article['published'],
+                    'summary': summary[:SUMMARY_CHARS] + '...' if len(summary) > SUMMARY_CHARS else summary
+                })
+            logger.info(f"共搜索到 {len(result)} 篇文章")
+            return {
+                "success": True,
+                "result": result
+            }
+        except Exception as e:
+            error_msg = f"搜索 RSS 文章失败: {str(e)}"
+            logger.error(error_msg)
+            return {"success": False, "result": error_msg}
\ No newline at end of file
@@ -0,0 +1,266 @@
+import os
+import re
+import time
+import anyio
+import asyncio
+import sqlite3
+import logging
+import functools
+import threading
+from config.loader import load_config
+from utils.rss.parser import parse_rss_feeds
+
+logger = logging.getLogger('RSS文章库')
+
+config = load_config()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 本地文章库
+DB_FILE = os.path.join(BASE_DIR, 'tmp', 'rss_articles.db')
+# 从配置获取文章库设置
+STORE_CONFIG = config.get('rss_store', {}) or {}
+REFRESH_ENABLED = STORE_CONFIG.get('enabled', False)
+REFRESH_INTERVAL = STORE_CONFIG.get('refresh_interval', 600)
+# 搜索时标题相对摘要的权重
+TITLE_WEIGHT = 3.0
+# 全文索引的切词版本，切词方式变化时加一，打开文章库时自动重建索引
+INDEX_VERSION = 1
+
+# 连续的中日韩文字，或连续的字母数字
+_TOKEN_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+|[0-9a-z]+')
+
+_conn = None
+# 文章库在工作线程中读写，同一连接上的操作依次进行
+_db_lock = threading.RLock()
+_refresh_lock = asyncio.Lock()
+# 上次刷新全部订阅源的时间
+_last_refresh = 0
+# 后台刷新任务
+_task = None
+
+def _serialized(fn):
+    """读写文章库的函数在工作线程中执行，加锁避免不同线程同时使用同一连接"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _db_lock:
+            return fn(*args, **kwargs)
+    return wrapper
+
+@_serialized
+def get_connection() -> sqlite3.Connection:
+    """打开文章库，首次使用时建表和索引
+    切词版本变化时会重建全文索引，文章较多时耗时较长，只在工作线程中调用"""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+        _conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        # 全文索引的切词方式变化后删除旧索引，下面按新的切词方式重建
+        if _conn.execute("PRAGMA user_version").fetchone()[0] < INDEX_VERSION:
+            with _conn:
+                _conn.execute("DROP TABLE IF EXISTS articles_search")
+                _conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                link TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                summary TEXT NOT NULL DEFAULT '',
+                published TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source, published);
+            -- 标题和摘要的全文索引，rowid 与 articles 一致，内容为切分好的二元词
+            -- 额外建立首字前缀索引，单字查询按前缀匹配时不用逐个合并以该字开头的二元词
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_search USING fts5 (title, summary, prefix = '1');
+        """)
+        # 建立全文索引之前保存的文章补建索引
+        rows = _conn.execute(
+            "SELECT rowid, title, summary FROM articles WHERE rowid NOT IN (SELECT rowid FROM articles_search)"
+        ).fetchall()
+        if rows:
+            with _conn:
+                _index_rows(_conn, rows)
+            logger.info(f"为 {len(rows)} 篇文章补建全文索引")
+    return _conn
+
+def get_rss_list() -> list:
+    """配置中的全部订阅源：[(名称, 地址)]"""
+    return [(item['name'], item['url']) for item in config.get('rss', []) or []]
+
+def _clean(text: str) -> str:
+    """去掉摘要中的 HTML 标签和多余空白"""
+    return ' '.join(re.sub(r'<[^>]+>', ' ', text or '').split())
+
+def tokenize(text: str) -> list:
+    """切分全文索引使用的词，每段连续文字为一个列表
+    中文等连续文字切成相邻两字的二元词，只有一个字时保留单字；英文和数字按整词切分并转为小写"""
+    runs = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if run[0].isascii() or len(run) == 1:
+            runs.append([run])
+        else:
+            runs.append([run[i:i + 2] for i in range(len(run) - 1)])
+    return runs
+
+def _index_text(text: str) -> str:
+    """把文本转换为写入全文索引的二元词序列，同一段文字的二元词相邻，可以按短语匹配
+    中文等连续文字末尾再补上最后一个字，这样每个字都是某个词的开头，单字查询可以按前缀匹配"""
+    tokens = []
+    for run in tokenize(text):
+        tokens.extend(run)
+        if not run[0].isascii() and len(run[-1]) == 2:
+            tokens.append(run[-1][1])
+    return ' '.join(tokens)
+
+def _match_run(run: list) -> str:
+    """把查询中的一段连续文字转换为 FTS5 查询：单个汉字等按前缀匹配，其他按短语匹配"""
+    if len(run) == 1 and len(run[0]) == 1 and not run[0].isascii():
+        return f'"{run[0]}" *'
+    return f'"{" ".join(run)}"'
+
+def _index_rows(conn: sqlite3.Connection, rows: list):
+    """重建指定文章的全文索引，rows 为 (rowid, 标题, 摘要) 的列表"""
+    conn.executemany("DELETE FROM articles_search WHERE rowid = ?", [(row[0],) for row in rows])
+    conn.executemany(
+        "INSERT INTO articles_search (rowid, title, summary) VALUES (?, ?, ?)",
+        [(row[0], _index_text(row[1]), _index_text(row[2])) for row in rows]
+    )
+
+@_serialized
+def save_articles(items: list) -> list:
+    """按链接去重写入文章，已存在的文章更新标题和摘要，同时增量更新全文索引，返回新增的文章"""
+    if not items:
+        return []
+    conn = get_connection()
+    # 同一链接只保留最后一次出现的文章
+    articles = {
+        item['link']: {
+            'link': item['link'],
+            'source': item['source'],
+            'title': item['title'],
+            'summary': _clean(item.get('summary', '')),
+            'published': item['published'].strftime('%Y-%m-%d %H:%M:%S')
+        }
+        for item in items
+    }
+    links = list(articles)
+    existing = {}
+    # SQLite 单条语句的参数数量有限，分批查询
+    for start in range(0, len(links), 500):
+        batch = links[start:start + 500]
+        existing.update((row[0], (row[1], row[2])) for row in conn.execute(
+            f"SELECT link, title, summary FROM articles WHERE link IN ({', '.join('?' * len(batch))})", batch
+        ))
+    # 新文章和标题、摘要有变化的文章需要更新全文索引
+    changed = [
+        article for link, article in articles.items()
+        if existing.get(link) != (article['title'], article['summary'])
+    ]
+    with conn:
+        conn.executemany("""
+            INSERT INTO articles (link, source, title, summary, published) VALUES (:link, :source, :title, :summary, :published)
+            ON CONFLICT (link) DO UPDATE SET title = excluded.title, summary = excluded.summary, published = excluded.published
+        """, articles.values())
+        rows = []
+        for start in range(0, len(changed), 500):
+            batch = [article['link'] for article in changed[start:start + 500]]
+            rows.extend(conn.execute(
+                f"SELECT rowid, title, summary FROM articles WHERE link IN ({', '.join('?' * len(batch))})", batch
+            ))
+        _index_rows(conn, rows)
+    return [article for link, article in articles.items() if link not in existing]
+
+@_serialized
+def query_articles(source: str = None, latest: bool = True, limit: int = 10) -> list:
+    """按发布时间读取最新或最早的文章，走发布时间索引只读取需要的条数"""
+    order = 'DESC' if latest else 'ASC'
+    if source:
+        cursor = get_connection().execute(
+            f"SELECT source, title, link, published FROM articles WHERE source = ? ORDER BY published {order} LIMIT ?",
+            (source, limit)
+        )
+    else:
+        cursor = get_connection().execute(
+            f"SELECT source, title, link, published FROM articles ORDER BY published {order} LIMIT ?", (limit,)
+        )
+    return [dict(row) for row in cursor]
+
+def _search(match: str, source: str, limit: int) -> list:
+    sql = f"""
+        SELECT a.source, a.title, a.link, a.published, a.summary,
+               bm25(articles_search, {TITLE_WEIGHT}, 1.0) AS score
+        FROM articles_search JOIN articles a ON a.rowid = articles_search.rowid
+        WHERE articles_search MATCH ? {'AND a.source = ?' if source else ''}
+        ORDER BY score LIMIT ?
+    """
+    params = (match, source, limit) if source else (match, limit)
+    return [dict(row) for row in get_connection().execute(sql, params)]
+
+@_serialized
+def search_articles(query: str, source: str = None, limit: int = 10) -> list:
+    """按相关度搜索标题和摘要，优先返回包含完整查询词的文章，没有时再返回包含部分二元词的文章"""
+    runs = tokenize(query)
+    if not runs:
+        return []
+    # 每段连续文字按短语匹配，相当于子串匹配
+    result = _search(' AND '.join(_match_run(run) for run in runs), source, limit)
+    if not result:
+        terms = dict.fromkeys(term for run in runs for term in run)
+        result = _search(' OR '.join(_match_run([term]) for term in terms), source, limit)
+    return result
+
+async def refresh_articles() -> tuple:
+    """拉取全部订阅源并写入文章库，返回 (新增文章, 错误信息)，全部订阅源失败时下次查询会重试"""
+    global _last_refresh
+    items, error = await parse_rss_feeds(get_rss_list())
+    # 写入文章和更新全文索引较慢，放到线程中执行，不阻塞事件循环
+    new_items = await anyio.to_thread.run_sync(save_articles, items)
+    if not error:
+        _last_refresh = time.monotonic()
+    if new_items:
+        logger.info(f"新增 {len(new_items)} 篇文章")
+    return new_items, error
+
+async def ensure_fresh() -> str:
+    """距离上次刷新超过间隔时先刷新全部订阅源，失败时返回错误信息"""
+    async with _refresh_lock:
+        if _last_refresh and time.monotonic() - _last_refresh < REFRESH_INTERVAL:
+            return None
+        _, error = await refresh_articles()
+        return error
+
+async def _refresh_loop():
+    """后台定时刷新全部订阅源"""
+    while True:
+        try:
+            error = await ensure_fresh()
+            if error:
+                logger.warning(f"后台刷新 RSS 文章失败: {error}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"后台刷新 RSS 文章失败: {e}")
+        await asyncio.sleep(REFRESH_INTERVAL)
+
+def ensure_rss_refresh() -> bool:
+    """启用后台刷新且配置了订阅源时，确保后台刷新任务在运行"""
+    global _task
+    if not REFRESH_ENABLED or not get_rss_list():
+        return False
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_refresh_loop())
+    return True
+
+async def stop_rss_refresh():
+    """停止后台刷新任务并关闭文章库"""
+    global _task, _conn
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+    # 等待工作线程中正在进行的读写完成后再关闭
+    with _db_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
\ No newline at end of file
@@ -1,6 +1,7 @@
 import logging
 from mcp.server.fastmcp import FastMCP
 from utils.rss.articles import get_rss_articles
+from utils.rss.search import search_rss_articles
 
 def register_rss_tools(mcp: FastMCP):
     """集中注册所有RSS相关工具"""
@@ -8,4 +9,6 @@ def register_rss_tools(mcp: FastMCP):
     logger.info("准备注册...")
     # 获取 RSS 文章
     get_rss_articles(mcp)
+    # 搜索 RSS 文章
+    search_rss_articles(mcp)
     logger.info("注册完成")
\ No newline at end of file
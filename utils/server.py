@@ -73,5 +73,5 @@ def server(mcp: FastMCP):
             'network': network_info
         }
         logger.info("成功获取服务器状态信息")
-        logger.info(f"返回数据：{server_status}")
+        logger.info("返回数据：%s", server_status)
         return {"success": True, "result": server_status}
\ No newline at end of file
@@ -66,7 +66,7 @@ def get_standard_weight_calculator(mcp: FastMCP):
                 bmi_status = "重度肥胖"
             result += f"体重偏差百分比: {weight_diff:.2f}%，BMI: {bmi:.2f}，{bmi_status}，正常 BMI 范围: {norm_bmi_min:.1f}-{norm_bmi_max:.1f}，理想体重范围: {ideal_weight_min:.2f}-{ideal_weight_max:.2f}kg。" 
             logger.info('标准体重计算完成')
-            logger.info(f'标准体重计算结果: {result}')
+            logger.info('标准体重计算结果: %s', result)
             return {"success": True, "result": result}
         except Exception as e:
             error_msg = f"计算标准体重失败: {str(e)}"
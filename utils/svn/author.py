@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from utils.svn.store import ensure_log, search_revisions, query_changed_paths
+from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger('查询提交者SVN日志')
+
+# 每个版本最多返回的修改路径数量
+MAX_PATHS = 10
+# 最多返回的版本数量
+MAX_LIMIT = 100
+
+def query_svn_author_logger(mcp: FastMCP):
+    """查询提交者日志"""
+    @mcp.tool()
+    async def query_svn_author_logger(author: str, days: int = 7, path: str = None, limit: int = 20) -> dict:
+        """查询某个提交者最近一段时间的SVN提交记录，当查询某人最近提交了什么、改了哪些文件时，立刻使用该工具。
+        Args:
+            author: 提交者的SVN用户名 必须填写
+            days: 查询最近多少天的提交，默认为 7 天，即最近一周
+            path: 只查询修改了该路径的提交，可选参数，以 / 开头时按目录匹配（例如：/trunk/src），否则匹配路径中包含该文本的提交
+            limit: 最多返回的提交数量，默认为 20，最多 100
+        注意:
+            该函数会返回一个按版本号从新到旧排列的列表，每个日志是一个字典，包含以下键值对:
+                - revision: 版本号
+                - author: 提交者
+                - date: 提交时间
+                - message: 提交信息
+                - files: 修改的文件数量
+                - paths: 修改的路径，最多列出 10 个
+        """
+        try:
+            logger.info(f"开始查询 {author} 最近 {days} 天的SVN日志")
+            if not author:
+                error_msg = "提交者不能为空"
+                logger.error(error_msg)
+                return {"success": False, "result": error_msg}
+            error = await ensure_log()
+            if error:
+                logger.error(error)
+                return {"success": False, "result": error}
+            # 日志库中的提交时间为 UTC 时间
+            start_date = (datetime.now(timezone.utc) - timedelta(days=max(days, 1))).strftime("%Y-%m-%d")
+            # 按提交者、提交时间索引和修改路径索引查询
+            logs = search_revisions(author=author, path=path, start=start_date, limit=min(max(limit, 1), MAX_LIMIT))
+            if not logs:
+                result = f"{author} 最近 {days} 天没有提交记录"
+                logger.info(result)
+                return {"success": True, "result": result}
+            for log in logs:
+                log['paths'] = [item['path'] for item in query_changed_paths(log['revision'])[:MAX_PATHS]]
+            logger.info(f"成功获取 {len(logs)} 条SVN日志")
+            logger.info("返回数据：%s", logs)
+            return {"success": True, "result": logs}
+        except Exception as e:
+            logger.error(f"获取提交者日志失败: {str(e)}")
+            return {"success": False, "result": str(e)}
\ No newline at end of file
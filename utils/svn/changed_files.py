@@ -1,7 +1,5 @@
 import logging
-import subprocess
-import xml.etree.ElementTree as ET
-from config.loader import load_config
+from utils.svn.store import ensure_log, get_revision, get_synced_revision, query_changed_paths
 from mcp.server.fastmcp import FastMCP
 
 logger = logging.getLogger('查询SVN修改文件')
@@ -9,7 +7,7 @@ logger = logging.getLogger('查询SVN修改文件')
 def query_svn_changed_files(mcp: FastMCP):
     """查询文件日志"""
     @mcp.tool()
-    def query_svn_changed_files(revision: int) -> dict:
+    async def query_svn_changed_files(revision: int) -> dict:
         """查询特定版本中修改的文件列表
         Args:
             revision: 要查询的版本号(必须为正整数)
@@ -20,41 +18,16 @@ def query_svn_changed_files(mcp: FastMCP):
                 error_msg = "版本号必须为正整数"
                 logger.error(error_msg)
                 return {"success": False, "result": error_msg}
-            svn_config = load_config()['svn']
-            repository_url = svn_config['repo_url']
-            username = svn_config['username']
-            password = svn_config['password']
-            cmd = [
-                'svn',
-                'log',
-                repository_url,
-                '-r',
-                str(revision),
-                '--username', username,
-                '--password', password,
-                '--no-auth-cache',
-                '--xml',
-                '-v'
-            ]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            root = ET.fromstring(result.stdout)
-            log_entry = root.find('logentry')
-            paths = log_entry.find('paths')
-            changed_files = []
-            for path in paths.findall('path'):
-                file_info = {
-                    'path': path.text,
-                    'action': path.attrib['action'],  # A:添加, M:修改, D:删除
-                    'kind': path.attrib.get('kind', 'file')  # file/dir
-                }
-                changed_files.append(file_info)
+            # 查询的版本比已同步的版本新时，先同步仓库的最新版本
+            error = await ensure_log(force=revision > get_synced_revision())
+            if error:
+                logger.error(error)
+                return {"success": False, "result": error}
+            if get_revision(revision) is None:
+                error_msg = f"版本 {revision} 不存在"
+                logger.error(error_msg)
+                return {"success": False, "result": error_msg}
+            changed_files = query_changed_paths(revision)
             # 统计不同类型修改的文件数量
             modified_count = 0
             added_count = 0
@@ -80,18 +53,11 @@ def query_svn_changed_files(mcp: FastMCP):
                 "main_directory": main_directory
             }
             logger.info("成功获取版本修改的文件信息")
-            logger.info(f"返回信息: {result}")
+            logger.info("返回信息: %s", result)
             return {
                 "success": True,
                 "result": result
             }
-        except subprocess.CalledProcessError as e:
-            if "No such revision" in e.stderr:
-                error_msg = f"版本 {revision} 不存在"
-                logger.error(error_msg)
-                return {"success": False, "result": error_msg}
-            logger.error(f"SVN命令执行失败: {e.stderr}")
-            return {"success": False, "result": str(e.stderr)}
         except Exception as e:
             logger.error(f"获取修改文件失败: {str(e)}")
             return {"success": False, "result": str(e)}
\ No newline at end of file
@@ -0,0 +1,16 @@
+import asyncio
+import subprocess
+
+async def run_svn(cmd: list) -> subprocess.CompletedProcess:
+    """异步执行SVN命令，等待期间不占用线程，失败时与 subprocess.run(check=True) 一样抛出 CalledProcessError"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    stdout = stdout.decode('utf-8', errors='replace')
+    stderr = stderr.decode('utf-8', errors='replace')
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
\ No newline at end of file
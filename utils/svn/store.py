@@ -0,0 +1,293 @@
+import os
+import time
+import asyncio
+import sqlite3
+import logging
+import subprocess
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from config.loader import load_config
+from utils.svn.command import run_svn
+
+logger = logging.getLogger('SVN日志库')
+
+config = load_config()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 本地 SVN 日志库
+DB_FILE = os.path.join(BASE_DIR, 'tmp', 'svn_log.db')
+# 从配置获取日志库设置
+STORE_CONFIG = config.get('svn', {}).get('store', {}) or {}
+SYNC_ENABLED = STORE_CONFIG.get('enabled', False)
+SYNC_INTERVAL = STORE_CONFIG.get('sync_interval', 60)
+# 每次 svn log 同步的版本数量，首次同步大仓库时分批进行，中断后从已同步的版本继续
+SYNC_BATCH = STORE_CONFIG.get('sync_batch', 1000)
+# 同步失败时可能抛出的异常，svn 未安装时为 OSError
+SYNC_ERRORS = (subprocess.CalledProcessError, ET.ParseError, ValueError, OSError)
+
+_conn = None
+_sync_lock = asyncio.Lock()
+# 上次同步的时间
+_last_sync = 0
+# 后台同步任务
+_task = None
+
+def get_connection() -> sqlite3.Connection:
+    """打开日志库，首次使用时建表和索引"""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+        _conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS revisions (
+                revision INTEGER PRIMARY KEY,
+                author TEXT NOT NULL,
+                date TEXT NOT NULL,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_revisions_date ON revisions (date);
+            CREATE INDEX IF NOT EXISTS idx_revisions_author ON revisions (author, date);
+            CREATE TABLE IF NOT EXISTS changed_paths (
+                revision INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                action TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                PRIMARY KEY (revision, path)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_changed_paths_path ON changed_paths (path, revision);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                name TEXT PRIMARY KEY,
+                value
+            );
+        """)
+        # 日志库只对应一个仓库，仓库地址变化（或旧版本没有记录地址）时清空后重新同步
+        repo_url = config.get('svn', {}).get('repo_url') or ''
+        if _get_state('repo_url', None) != repo_url:
+            _reset(repo_url)
+    return _conn
+
+def _get_state(name: str, default: int = 0) -> int:
+    row = get_connection().execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+    return row['value'] if row else default
+
+def _set_state(**values):
+    conn = get_connection()
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", values.items())
+
+def _reset(repo_url: str, repo_uuid: str = ''):
+    """清空日志库，记录新的仓库地址和 UUID，之后从第一个版本重新同步"""
+    global _last_sync
+    conn = get_connection()
+    if conn.execute("SELECT 1 FROM revisions LIMIT 1").fetchone():
+        logger.warning(f"SVN仓库已变为 {repo_url}，清空日志库后重新同步")
+    with conn:
+        conn.execute("DELETE FROM revisions")
+        conn.execute("DELETE FROM changed_paths")
+        conn.execute("DELETE FROM sync_state")
+    _set_state(repo_url=repo_url, repo_uuid=repo_uuid)
+    _last_sync = 0
+
+def get_synced_revision() -> int:
+    """已同步到的版本号，0 表示还没有同步过"""
+    return _get_state('synced_revision')
+
+def format_date(date: str) -> str:
+    """把 svn 日志中的 UTC 时间转换为中文日期格式"""
+    return datetime.strptime(date, "%Y-%m-%dT%H:%M:%S.%fZ").strftime("%Y年%m月%d日%H:%M:%S")
+
+def parse_log(text: str) -> list:
+    """解析 svn log --xml -v 的输出，返回 (版本号, 提交者, 时间, 提交信息, 修改路径列表) 的列表"""
+    entries = []
+    for entry in ET.fromstring(text).findall('logentry'):
+        paths = [
+            (path.text, path.attrib['action'], path.attrib.get('kind', 'file'))
+            for path in entry.iterfind('paths/path')
+        ]
+        entries.append((
+            int(entry.attrib['revision']),
+            entry.findtext('author') or '',
+            entry.findtext('date') or '',
+            (entry.findtext('msg') or '').strip(),
+            paths
+        ))
+    return entries
+
+def save_entries(entries: list, synced_revision: int):
+    """写入一批日志并记录已同步到的版本，两者在同一个事务中，中断后不会漏掉版本"""
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO revisions (revision, author, date, message) VALUES (?, ?, ?, ?)",
+            [entry[:4] for entry in entries]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO changed_paths (revision, path, action, kind) VALUES (?, ?, ?, ?)",
+            [(entry[0], *path) for entry in entries for path in entry[4]]
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (name, value) VALUES ('synced_revision', ?)", (synced_revision,)
+        )
+
+async def _svn(*args: str) -> str:
+    """对配置的仓库执行 svn 命令，返回标准输出"""
+    svn_config = config['svn']
+    cmd = [
+        'svn',
+        args[0],
+        svn_config['repo_url'],
+        *args[1:],
+        '--username', svn_config['username'],
+        '--password', svn_config['password'],
+        '--no-auth-cache'
+    ]
+    result = await run_svn(cmd)
+    return result.stdout
+
+async def sync_latest() -> int:
+    """从已同步的版本开始增量同步到仓库最新版本，返回新同步的日志条数
+    已提交的版本不会再变化，只需要同步新版本；仓库 UUID 变化（同一地址换了仓库）时先清空日志库"""
+    entry = ET.fromstring(await _svn('info', '--xml')).find('entry')
+    head = int(entry.find('commit').attrib['revision'])
+    repo_uuid = entry.findtext('repository/uuid') or ''
+    stored_uuid = _get_state('repo_uuid', '')
+    if stored_uuid != repo_uuid:
+        if stored_uuid:
+            _reset(config['svn']['repo_url'], repo_uuid)
+        else:
+            _set_state(repo_uuid=repo_uuid)
+    synced = get_synced_revision()
+    count = 0
+    while synced < head:
+        end = min(synced + SYNC_BATCH, head)
+        entries = parse_log(await _svn('log', '-r', f'{synced + 1}:{end}', '--xml', '-v'))
+        save_entries(entries, end)
+        synced = end
+        count += len(entries)
+        logger.info(f"已同步到版本 {synced}/{head}")
+    return count
+
+async def sync_log(force: bool = False) -> str:
+    """距上次同步超过间隔或 force 为 True 时增量同步日志，失败时返回错误信息"""
+    global _last_sync
+    svn_config = config.get('svn', {})
+    if not all([svn_config.get('repo_url'), svn_config.get('username'), svn_config.get('password')]):
+        return "配置文件中缺少必要的SVN信息"
+    try:
+        async with _sync_lock:
+            if force or not _last_sync or time.monotonic() - _last_sync > SYNC_INTERVAL:
+                count = await sync_latest()
+                _last_sync = time.monotonic()
+                if count:
+                    logger.info(f"同步SVN日志 {count} 条")
+    except subprocess.CalledProcessError as e:
+        logger.warning(f"同步SVN日志失败: {e.stderr}")
+        return str(e.stderr)
+    except SYNC_ERRORS as e:
+        logger.warning(f"同步SVN日志失败: {e}")
+        return str(e)
+    return None
+
+async def ensure_log(force: bool = False) -> str:
+    """查询前调用：先尝试同步，同步失败但日志库中已有日志时继续使用已有日志，只有日志库为空时返回错误信息"""
+    error = await sync_log(force)
+    if error and get_synced_revision():
+        logger.warning(f"同步SVN日志失败，使用日志库中已有的日志: {error}")
+        return None
+    return error
+
+def _revision_dict(row: sqlite3.Row) -> dict:
+    return {
+        'revision': row['revision'],
+        'author': row['author'],
+        'date': format_date(row['date']),
+        'message': row['message'].replace('\n', ' ')
+    }
+
+def get_revision(revision: int = None) -> dict:
+    """读取指定版本的日志，未指定时读取最新版本，不存在时返回 None"""
+    if revision is None:
+        row = get_connection().execute("SELECT * FROM revisions ORDER BY revision DESC LIMIT 1").fetchone()
+    else:
+        row = get_connection().execute("SELECT * FROM revisions WHERE revision = ?", (revision,)).fetchone()
+    return _revision_dict(row) if row else None
+
+def query_revisions(start_revision: int, end_revision: int) -> list:
+    """按版本号范围读取日志"""
+    cursor = get_connection().execute(
+        "SELECT * FROM revisions WHERE revision BETWEEN ? AND ? ORDER BY revision", (start_revision, end_revision)
+    )
+    return [_revision_dict(row) for row in cursor]
+
+def query_changed_paths(revision: int) -> list:
+    """读取指定版本修改的路径"""
+    cursor = get_connection().execute(
+        "SELECT path, action, kind FROM changed_paths WHERE revision = ? ORDER BY path", (revision,)
+    )
+    return [dict(row) for row in cursor]
+
+def search_revisions(author: str = None, path: str = None, start: str = None, end: str = None,
+                     limit: int = None, latest_first: bool = True) -> list:
+    """按提交者、修改路径和时间范围查询日志，默认按版本号从新到旧返回，limit 为空时不限制数量
+    start、end 为 UTC 日期 'YYYY-MM-DD'，包含 start 不包含 end；
+    path 以 / 开头时按目录前缀匹配，否则匹配路径中包含该文本的版本"""
+    conditions, params = [], []
+    if author:
+        conditions.append("r.author = ?")
+        params.append(author)
+    if start:
+        conditions.append("r.date >= ?")
+        params.append(start)
+    if end:
+        conditions.append("r.date < ?")
+        params.append(end)
+    if path:
+        if path.startswith('/'):
+            # 按路径索引做前缀范围查询
+            match = "path >= ? AND path < ?"
+            params.extend([path, path + '\U0010ffff'])
+        else:
+            match = "instr(path, ?) > 0"
+            params.append(path)
+        conditions.append(f"r.revision IN (SELECT revision FROM changed_paths WHERE {match})")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    cursor = get_connection().execute(f"""
+        SELECT r.*, (SELECT count(*) FROM changed_paths c WHERE c.revision = r.revision) AS files
+        FROM revisions r {where}
+        ORDER BY r.revision {'DESC' if latest_first else 'ASC'} LIMIT ?
+    """, (*params, limit or -1))
+    return [{**_revision_dict(row), 'files': row['files']} for row in cursor]
+
+async def _sync_loop():
+    """后台定时增量同步日志"""
+    while True:
+        try:
+            error = await sync_log()
+            if error:
+                logger.warning(f"后台同步SVN日志失败: {error}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"后台同步SVN日志失败: {e}")
+        await asyncio.sleep(SYNC_INTERVAL)
+
+def ensure_svn_sync() -> bool:
+    """启用后台同步且配置了仓库地址时，确保后台同步任务在运行"""
+    global _task
+    if not SYNC_ENABLED or not config.get('svn', {}).get('repo_url'):
+        return False
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_sync_loop())
+    return True
+
+async def stop_svn_sync():
+    """停止后台同步任务并关闭日志库"""
+    global _task, _conn
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+    if _conn is not None:
+        _conn.close()
+        _conn = None
\ No newline at end of file
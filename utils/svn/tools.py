@@ -5,6 +5,7 @@ from utils.svn.latest import get_svn_logge_latest
 from utils.svn.date import query_svn_time_logger
 from utils.svn.revision import query_svn_revision
 from utils.svn.changed_files import query_svn_changed_files
+from utils.svn.author import query_svn_author_logger
 
 def register_svn_tools(mcp: FastMCP):
     """集中注册所有SVN相关工具"""
@@ -20,4 +21,6 @@ def register_svn_tools(mcp: FastMCP):
     query_svn_revision(mcp)
     # 查询文件日志
     query_svn_changed_files(mcp)
+    # 查询提交者日志
+    query_svn_author_logger(mcp)
     logger.info("注册完成")
\ No newline at end of file
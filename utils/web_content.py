@@ -1,15 +1,26 @@
 import re
+import anyio
 import logging
-import requests
 from config.loader import load_config
 from mcp.server.fastmcp import FastMCP
+from utils.http_client import http_get, HTTP_ERRORS
 
 logger = logging.getLogger('网页内容')
 
+def extract_text(response) -> str:
+    """去掉脚本、注释和标签，提取网页正文文本，没有正文时返回 None"""
+    content = re.sub(r'<script\b[^>]*>[\s\S]*?</script>', '', response.text)
+    content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
+    body_match = re.search(r'<body[^>]*>(.*?)</body>', content, re.DOTALL)
+    if not body_match:
+        return None
+    clean_text = re.sub(r'<[^>]+>', '', body_match.group(1))
+    return '\n'.join(line.strip() for line in clean_text.split('\n') if line.strip())
+
 def get_web_content(mcp: FastMCP):
     """网页内容查询"""
     @mcp.tool()
-    def get_web_content(url: str) -> dict:
+    async def get_web_content(url: str) -> dict:
         """用于获取网页内容，当查询网页，获取网页内容或者网站内容信息时，立即使用该工具。
         Args:
             url (str): 网页URL，必须填写，例如：https://www.bilibili.com/
@@ -20,20 +31,19 @@ def get_web_content(mcp: FastMCP):
             headers = {
                 "User-Agent": load_config()['http_headers']['user_agent']
             }
-            response = requests.get(url, headers=headers)
+            response = await http_get(url, headers=headers)
             response.raise_for_status()
-            content = re.sub(r'<script\b[^>]*>[\s\S]*?</script>', '', response.text)
-            content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
-            body_match = re.search(r'<body[^>]*>(.*?)</body>', content, re.DOTALL)
-            if body_match:
-                clean_text = re.sub(r'<[^>]+>', '', body_match.group(1))
-                clean_text = '\n'.join(line.strip() for line in clean_text.split('\n') if line.strip())
+            # 整页的解码和正则清理占用 CPU 较多，放到线程中执行，不阻塞事件循环
+            clean_text = await anyio.to_thread.run_sync(extract_text, response)
+            if clean_text is not None:
                 logger.info(f"成功获取网页内容，长度: {len(clean_text)} 字符")
-                logger.info(f"返回数据：{' '.join(clean_text.split())}")
+                # 拼接日志内容的开销较大，未输出 INFO 日志时跳过
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("返回数据：%s", ' '.join(clean_text.split()))
                 return {"success": True, "result": clean_text}
             logger.error("未能提取正文内容")
             return {"success": False, "result": "未能提取正文内容"}
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             error_message = f"请求出错: {e}"
             logger.error(error_message)
             return {"success": False, "result": error_message}